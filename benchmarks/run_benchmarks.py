@@ -0,0 +1,305 @@
+"""
+Performance benchmarks for the benchmark pipeline itself.
+
+Times the task simulators, NPE/NLE/NRE training, posterior sampling, the metrics and the post-processing
+(consolidate_metrics, LinePlot.run) across input sizes, writes the timings as JSON and flags regressions
+against a stored baseline.
+
+Usage:
+    python -m benchmarks.run_benchmarks                                   # run all, print timings
+    python -m benchmarks.run_benchmarks --filter simulator --quick        # subset, smallest sizes only
+    python -m benchmarks.run_benchmarks --output bench.json --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --baseline benchmarks/baseline.json --threshold 0.25
+
+Exits with status 1 if any case is slower than `threshold` (relative) compared to the baseline.
+"""
+
+import argparse
+import atexit
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import torch
+
+
+# Benchmark registry: name -> (factory, sizes). A factory does all setup for a size and returns the callable to time.
+BENCHMARKS: Dict[str, tuple] = {}
+
+
+def benchmark(name: str, sizes: List[int]):
+    """Register a benchmark factory under `name` for the given input `sizes`."""
+    def register(factory: Callable[[int], Callable[[], object]]):
+        BENCHMARKS[name] = (factory, sizes)
+        return factory
+    return register
+
+
+def _scratch_directory(prefix: str) -> Path:
+    """Create a temporary directory that is removed when the interpreter exits."""
+    directory = Path(tempfile.mkdtemp(prefix=prefix))
+    atexit.register(shutil.rmtree, directory, True)
+    return directory
+
+
+def _misspecified_task():
+    from src.tasks.misspecified_tasks import LikelihoodMisspecifiedTask
+    return LikelihoodMisspecifiedTask(dim=2, tau_m=2.0, lambda_val=0.5)
+
+
+def _training_data(task, size):
+    torch.manual_seed(0)
+    theta = task.get_prior().sample((size,))
+    return theta, task.get_simulator()(theta)
+
+
+# 1) Simulators
+@benchmark("simulator/LikelihoodMisspecifiedTask", sizes=[1_000, 10_000, 100_000])
+def bench_misspecified_simulator(size):
+    task = _misspecified_task()
+    theta = task.get_prior().sample((size,))
+    return lambda: task.simulator(theta)
+
+
+@benchmark("simulator/LinearGaussianTask", sizes=[1_000, 10_000, 100_000])
+def bench_linear_gaussian_simulator(size):
+    from src.tasks.linear_gaussian_task import LinearGaussianTask
+    task = LinearGaussianTask(dim=2)
+    theta = task.get_prior().sample((size,))
+    return lambda: task.simulator(theta)
+
+
+@benchmark("simulator/GroundTruthModel.sample_data", sizes=[100, 1_000, 10_000])
+def bench_ground_truth_sample_data(size):
+    from src.tasks.misspecified_tasks import GroundTruthModel
+    model = GroundTruthModel(dim=2)
+    theta = model.sample_prior(size)
+    return lambda: model.sample_data(theta)
+
+
+# 2) Training
+def _bench_training(method_name, size):
+    from src.inference.Run_Inference import methods
+    task = _misspecified_task()
+    theta, x = _training_data(task, size)
+
+    def train():
+        torch.manual_seed(0)
+        inference = methods[method_name](task.get_prior(), show_progress_bars=False)
+        return inference.append_simulations(theta, x).train(max_num_epochs=20)
+    return train
+
+
+for _method in ["NPE", "NLE", "NRE"]:
+    benchmark(f"training/{_method}", sizes=[100, 1_000])(
+        lambda size, _method=_method: _bench_training(_method, size)
+    )
+
+
+# 3) Posterior sampling
+def _bench_sampling(method_name, size):
+    from src.inference.Run_Inference import methods
+    task = _misspecified_task()
+    theta, x = _training_data(task, 500)
+    inference = methods[method_name](task.get_prior(), show_progress_bars=False)
+    posterior = inference.build_posterior(inference.append_simulations(theta, x).train(max_num_epochs=5))
+    x_o = task.get_observation(0).squeeze(0)
+    return lambda: posterior.sample((size,), x=x_o, show_progress_bars=False)
+
+
+benchmark("sampling/NPE", sizes=[1_000, 10_000])(lambda size: _bench_sampling("NPE", size))
+benchmark("sampling/NLE", sizes=[100])(lambda size: _bench_sampling("NLE", size))
+benchmark("sampling/NRE", sizes=[100])(lambda size: _bench_sampling("NRE", size))
+
+
+# 4) Metrics
+@benchmark("metric/compute_c2st", sizes=[100, 1_000, 10_000])
+def bench_c2st(size):
+    from src.evaluation.metrics.c2st import compute_c2st
+    torch.manual_seed(0)
+    a, b = torch.randn(size, 2).numpy(), (torch.randn(size, 2) + 0.5).numpy()
+    return lambda: compute_c2st(a, b, test_size=0.3, random_state=86, plot=False)
+
+
+@benchmark("metric/compute_ppc", sizes=[100, 1_000, 10_000])
+def bench_ppc(size):
+    from src.evaluation.metrics.ppc import compute_ppc
+    task = _misspecified_task()
+    samples = task.get_prior().sample((size,))
+    x_o = task.get_observation(0)
+    return lambda: compute_ppc(samples, x_o, task.get_simulator())
+
+
+# 5) Post-processing
+def _write_metric_files(directory: Path, num_files: int, num_obs: int = 10):
+    import pandas as pd
+    for i in range(num_files):
+        sims_dir = directory / f"sims_{100 * (i + 1)}"
+        sims_dir.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame({
+            "metric": ["c2st"] * num_obs,
+            "value": [0.5 + 0.01 * j for j in range(num_obs)],
+            "task": ["TaskA"] * num_obs,
+            "method": ["NPE"] * num_obs,
+            "num_simulations": [100 * (i + 1)] * num_obs,
+            "observation_idx": list(range(num_obs)),
+        }).to_csv(sims_dir / "metrics.csv", index=False)
+
+
+@benchmark("postprocess/consolidate_metrics", sizes=[10, 100, 1_000])
+def bench_consolidate(size):
+    from src.utils.consolidate_metrics import consolidate_metrics
+    directory = _scratch_directory("bench_consolidate_")
+    _write_metric_files(directory, size)
+    return lambda: consolidate_metrics(input_dir=directory, output_file=directory / "metrics_all.csv")
+
+
+@benchmark("postprocess/LinePlot.run", sizes=[5, 20])
+def bench_lineplot(size):
+    import matplotlib
+    matplotlib.use("Agg")
+    from src.utils.LinePlot import LinePlot
+    directory = _scratch_directory("bench_lineplot_")
+    _write_metric_files(directory, size)
+    # Without the render cache: every call plots (with it, calls after the warm-up only reuse the image)
+    return lambda: LinePlot(data_sources="sims_*/metrics.csv", base_directory=directory,
+                            save_directory=directory / "plots", filename="bench.png", cache=False).run()
+
+
+@benchmark("postprocess/LinePlot.run_cached", sizes=[5, 20])
+def bench_lineplot_cached(size):
+    import matplotlib
+    matplotlib.use("Agg")
+    from src.utils.LinePlot import LinePlot
+    directory = _scratch_directory("bench_lineplot_cached_")
+    _write_metric_files(directory, size)
+    # The warm-up call renders; the timed calls measure the cache hit (input check and image reuse)
+    return lambda: LinePlot(data_sources="sims_*/metrics.csv", base_directory=directory,
+                            save_directory=directory / "plots", filename="bench.png").run()
+
+
+def time_case(factory: Callable[[int], Callable[[], object]], size: int, repeat: int) -> dict:
+    """
+    Set up one benchmark case and time `repeat` calls of it (after one warm-up call).
+
+    Returns:
+        dict: Timings in seconds ('min', 'median', 'max') and the number of timed calls ('repeat').
+    """
+    fn = factory(size)
+    fn()  # warm-up: imports, caches, lazy initialization
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return {"min": min(timings), "median": statistics.median(timings), "max": max(timings), "repeat": repeat}
+
+
+def run_benchmarks(name_filter: Optional[str] = None, *, repeat: int = 3, quick: bool = False) -> dict:
+    """
+    Run all registered benchmarks whose name contains `name_filter`.
+
+    Args:
+        name_filter (str, optional): Substring a benchmark name must contain to be run.
+        repeat (int): Number of timed calls per case.
+        quick (bool): Only run the smallest size of each benchmark.
+
+    Returns:
+        dict: {"meta": {...}, "results": {"<name>/<size>": {timings}}}
+    """
+    results = {}
+    for name, (factory, sizes) in BENCHMARKS.items():
+        if name_filter and name_filter not in name:
+            continue
+        for size in (sizes[:1] if quick else sizes):
+            case = f"{name}/{size}"
+            results[case] = time_case(factory, size, repeat)
+            print(f"{case:<55} min {results[case]['min'] * 1e3:10.2f} ms   "
+                  f"median {results[case]['median'] * 1e3:10.2f} ms")
+
+    meta = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "platform": platform.platform(),
+        "torch_threads": torch.get_num_threads(),
+    }
+    return {"meta": meta, "results": results}
+
+
+def compare_to_baseline(results: dict, baseline: dict, *, threshold: float = 0.2) -> List[dict]:
+    """
+    Compare the median timings of `results` against `baseline`.
+
+    Args:
+        results (dict): Output of run_benchmarks().
+        baseline (dict): A previously stored output of run_benchmarks().
+        threshold (float): Allowed relative slowdown (0.2 = 20%) before a case counts as a regression.
+
+    Returns:
+        List[dict]: One entry per regressed case with 'case', 'baseline', 'current' (seconds) and 'ratio'.
+    """
+    regressions = []
+    for case, timing in results["results"].items():
+        reference = baseline.get("results", {}).get(case)
+        if reference is None:
+            continue
+        ratio = timing["median"] / reference["median"] if reference["median"] > 0 else float("inf")
+        if ratio > 1 + threshold:
+            regressions.append({
+                "case": case, "baseline": reference["median"], "current": timing["median"], "ratio": ratio
+            })
+    return regressions
+
+
+def parse_args(argv=None):
+    """Parse and return command-line arguments."""
+    p = argparse.ArgumentParser(description="Time the benchmark pipeline and flag performance regressions.")
+    p.add_argument("--filter", type=str, default=None, help="Only run benchmarks whose name contains this string")
+    p.add_argument("--repeat", type=int, default=3, help="Number of timed calls per case")
+    p.add_argument("--quick", action="store_true", help="Only run the smallest size of each benchmark")
+    p.add_argument("--output", type=Path, default=None, help="Write the timings as JSON to this file")
+    p.add_argument("--baseline", type=Path, default=None, help="Baseline JSON to compare against")
+    p.add_argument("--save-baseline", type=Path, default=None, help="Store the timings as new baseline JSON")
+    p.add_argument("--threshold", type=float, default=0.2, help="Allowed relative slowdown (default: 0.2)")
+    p.add_argument("--list", action="store_true", help="List the available benchmarks and exit")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.list:
+        for name, (_, sizes) in BENCHMARKS.items():
+            print(f"{name:<45} sizes: {', '.join(map(str, sizes))}")
+        return 0
+
+    results = run_benchmarks(args.filter, repeat=args.repeat, quick=args.quick)
+
+    for path in [args.output, args.save_baseline]:
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(results, indent=2))
+            print(f"Wrote timings ➜ {path}")
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare_to_baseline(results, baseline, threshold=args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['case']}: {r['baseline'] * 1e3:.2f} ms ➜ {r['current'] * 1e3:.2f} ms "
+                  f"({r['ratio']:.2f}x)")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
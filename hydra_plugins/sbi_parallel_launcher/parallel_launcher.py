@@ -0,0 +1,216 @@
+"""
+Local process-pool launcher for Hydra multiruns of the benchmark.
+
+Unlike Hydra's basic launcher, which runs sweep jobs one after another, this launcher runs them on a pool of
+forked worker processes:
+    - the pool is sized by the available cores and memory (`n_jobs`, `memory_per_job_mb`),
+    - expensive jobs (high `inference.num_simulations`, NLE/NRE) are started first,
+    - the status of each job is logged when it starts and finishes.
+Hydra calls the `on_multirun_end` callbacks (e.g. PostProcessCallback) after `launch` returns, i.e. once all
+jobs have finished.
+
+Usage:
+    python -m src.run hydra/launcher=sbi_parallel
+    python -m src.run hydra/launcher=sbi_parallel hydra.launcher.n_jobs=4 hydra.launcher.memory_per_job_mb=4096
+"""
+
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from hydra.core.config_store import ConfigStore
+from hydra.core.utils import JobReturn, JobStatus, configure_log, filter_overrides, run_job, setup_globals
+from hydra.plugins.launcher import Launcher
+from hydra.types import HydraContext, TaskFunction
+from omegaconf import DictConfig, open_dict
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class ParallelLauncherConf:
+    _target_: str = "hydra_plugins.sbi_parallel_launcher.parallel_launcher.ParallelLauncher"
+    # Number of parallel jobs; null: as many as cores and memory allow
+    n_jobs: Optional[int] = None
+    # Memory reserved per job when sizing the pool
+    memory_per_job_mb: int = 2048
+    # Torch threads per job; null: cores divided by the pool size
+    threads_per_job: Optional[int] = None
+    # Relative cost per simulation of each method, used to start expensive jobs first
+    method_cost: Dict[str, float] = field(default_factory=lambda: {"npe": 1.0, "nle": 4.0, "nre": 3.0})
+
+
+ConfigStore.instance().store(
+    group="hydra/launcher", name="sbi_parallel", node=ParallelLauncherConf, provider="sbi-misspecification-benchmark"
+)
+
+
+def available_memory_mb() -> Optional[float]:
+    """Return the memory available for new processes in MB, or None if it cannot be determined."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def resolve_pool_size(num_jobs: int, n_jobs: Optional[int] = None, memory_per_job_mb: float = 2048) -> int:
+    """
+    Size the worker pool by the number of jobs, the available cores and the available memory.
+
+    Args:
+        num_jobs (int): Number of jobs to launch.
+        n_jobs (int, optional): Pool size requested by the user; overrides the core and memory limits.
+        memory_per_job_mb (float): Memory reserved per job.
+
+    Returns:
+        int: Number of worker processes (at least 1).
+    """
+    if n_jobs:
+        return max(1, min(n_jobs, num_jobs))
+    limits = [num_jobs, os.cpu_count() or 1]
+    memory = available_memory_mb()
+    if memory is not None and memory_per_job_mb > 0:
+        limits.append(int(memory // memory_per_job_mb))
+    return max(1, min(limits))
+
+
+def estimate_job_cost(config: DictConfig, method_cost: Dict[str, float]) -> float:
+    """Estimate the relative cost of a job as num_simulations times the cost factor of its method."""
+    inference = config.get("inference") or {}
+    try:
+        num_simulations = float(inference.get("num_simulations", 0))
+    except (TypeError, ValueError):
+        num_simulations = 0.0
+    method = str(inference.get("method", "")).lower()
+    return num_simulations * method_cost.get(method, 1.0)
+
+
+def schedule(costs: Sequence[float]) -> List[int]:
+    """Return the job indices ordered by decreasing cost; ties keep the sweep order."""
+    return sorted(range(len(costs)), key=lambda i: -costs[i])
+
+
+# State of the current launch, inherited by the forked workers
+_LAUNCH_STATE: dict = {}
+
+
+def _init_worker(num_threads: Optional[int]) -> None:
+    """Limit the torch threads of a worker so that parallel jobs don't oversubscribe the cores."""
+    if num_threads:
+        import torch
+        torch.set_num_threads(num_threads)
+
+
+def _execute_job(position: int) -> Tuple[JobReturn, float]:
+    """Run the sweep job at `position` of the current launch (in a worker process); return it with its duration."""
+    state = _LAUNCH_STATE
+    sweep_config = state["sweep_configs"][position]
+    log.info(f"\t#{sweep_config.hydra.job.num} started (pid {os.getpid()})")
+    start = time.perf_counter()
+    run = run_job(
+        hydra_context=state["hydra_context"],
+        task_function=state["task_function"],
+        config=sweep_config,
+        job_dir_key="hydra.sweep.dir",
+        job_subdir_key="hydra.sweep.subdir",
+    )
+    return run, time.perf_counter() - start
+
+
+class ParallelLauncher(Launcher):
+    def __init__(
+            self,
+            n_jobs: Optional[int] = None,
+            memory_per_job_mb: int = 2048,
+            threads_per_job: Optional[int] = None,
+            method_cost: Optional[Dict[str, float]] = None,
+    ) -> None:
+        super().__init__()
+        self.n_jobs = n_jobs
+        self.memory_per_job_mb = memory_per_job_mb
+        self.threads_per_job = threads_per_job
+        self.method_cost = {str(k).lower(): float(v) for k, v in (method_cost or {}).items()}
+        self.config: Optional[DictConfig] = None
+        self.task_function: Optional[TaskFunction] = None
+        self.hydra_context: Optional[HydraContext] = None
+
+
+    def setup(self, *, hydra_context: HydraContext, task_function: TaskFunction, config: DictConfig) -> None:
+        self.config = config
+        self.hydra_context = hydra_context
+        self.task_function = task_function
+
+
+    def launch(self, job_overrides: Sequence[Sequence[str]], initial_job_idx: int) -> Sequence[JobReturn]:
+        setup_globals()
+        assert self.hydra_context is not None
+        assert self.config is not None
+        assert self.task_function is not None
+
+        configure_log(self.config.hydra.hydra_logging, self.config.hydra.verbose)
+        Path(str(self.config.hydra.sweep.dir)).mkdir(parents=True, exist_ok=True)
+
+        # 1) Compose all sweep configs up front (in sweep order)
+        sweep_configs = []
+        for offset, overrides in enumerate(job_overrides):
+            idx = initial_job_idx + offset
+            sweep_config = self.hydra_context.config_loader.load_sweep_config(self.config, list(overrides))
+            with open_dict(sweep_config):
+                sweep_config.hydra.job.id = idx
+                sweep_config.hydra.job.num = idx
+            sweep_configs.append(sweep_config)
+
+        # 2) Schedule the expensive jobs first
+        order = schedule([estimate_job_cost(c, self.method_cost) for c in sweep_configs])
+        pool_size = resolve_pool_size(len(sweep_configs), self.n_jobs, self.memory_per_job_mb)
+        num_threads = self.threads_per_job or max(1, (os.cpu_count() or 1) // pool_size)
+
+        log.info(f"Launching {len(sweep_configs)} jobs on {pool_size} worker(s) with {num_threads} thread(s) each")
+        for position in order:
+            lst = " ".join(filter_overrides(job_overrides[position]))
+            log.info(f"\t#{sweep_configs[position].hydra.job.num} : {lst}")
+
+        # 3) Run the jobs; fall back to sequential execution where fork is unavailable
+        _LAUNCH_STATE.update(
+            hydra_context=self.hydra_context, task_function=self.task_function, sweep_configs=sweep_configs
+        )
+        runs: List[Optional[JobReturn]] = [None] * len(sweep_configs)
+        try:
+            if pool_size == 1 or "fork" not in multiprocessing.get_all_start_methods():
+                for done, position in enumerate(order, start=1):
+                    runs[position], seconds = _execute_job(position)
+                    self._log_status(runs[position], sweep_configs[position], seconds, done, len(order))
+                    configure_log(self.config.hydra.hydra_logging, self.config.hydra.verbose)
+            else:
+                context = multiprocessing.get_context("fork")
+                with ProcessPoolExecutor(max_workers=pool_size, mp_context=context,
+                                         initializer=_init_worker, initargs=(num_threads,)) as pool:
+                    futures = {pool.submit(_execute_job, position): position for position in order}
+                    for done, future in enumerate(as_completed(futures), start=1):
+                        position = futures[future]
+                        runs[position], seconds = future.result()
+                        self._log_status(runs[position], sweep_configs[position], seconds, done, len(order))
+        finally:
+            _LAUNCH_STATE.clear()
+
+        return runs
+
+
+    @staticmethod
+    def _log_status(run: JobReturn, sweep_config: DictConfig, seconds: float, done: int, total: int) -> None:
+        """Log the outcome and duration of a finished job together with the overall progress."""
+        status = "completed" if run.status == JobStatus.COMPLETED else "FAILED"
+        log.info(f"\t#{sweep_config.hydra.job.num} {status} after {seconds:.1f}s "
+                 f"[{done}/{total} done]")
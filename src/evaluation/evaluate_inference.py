@@ -2,8 +2,10 @@ import torch
 from pathlib import Path
 from src.evaluation.metrics.c2st import compute_c2st
 from src.evaluation.metrics.ppc import compute_ppc
+from src.utils.io_utils import find_samples, load_samples
+from src.utils.memory_tracking import track_stage
 
-def evaluate_inference(task, method_name, metric_name, num_simulations, obs_offset=0):
+def evaluate_inference(task, method_name, metric_name, num_simulations, obs_offset=0, reference_samples=None):
     """
     Evaluate the metric for exactly one observation (used in loop in benchmark_run.py).
 
@@ -13,6 +15,8 @@ def evaluate_inference(task, method_name, metric_name, num_simulations, obs_offs
         metric_name (str): Name of the metric ('c2st', 'ppc', etc).
         num_simulations (int): Simulation count.
         obs_offset (int): Which observation index to evaluate.
+        reference_samples (torch.Tensor, optional): Pre-drawn samples of the reference posterior for this
+            observation (e.g. shared across methods and budgets). Drawn from the task if None.
 
     Returns:
         float: metric score for this observation.
@@ -21,13 +25,13 @@ def evaluate_inference(task, method_name, metric_name, num_simulations, obs_offs
     task_name = task.__class__.__name__
     obs_dir = Path(f"outputs/{task_name}_{method_name}/sims_{num_simulations}/obs_{idx}")
     x_path = obs_dir/"x_obs.pt"
-    post_path = obs_dir/"posterior_samples.pt"
+    post_path = find_samples(obs_dir, "posterior_samples")
 
-    # Load posterior_samples.pt; raise if missing
-    if post_path.exists():  
-        posterior_samples = torch.load(post_path, map_location='cpu', weights_only=True)
+    # Load the posterior samples in any storage format (.npy is memory-mapped); raise if missing
+    if post_path is not None:
+        posterior_samples = load_samples(post_path, mmap=True).float()
     else:
-        raise FileNotFoundError(f"Missing posterior samples at {post_path}.")
+        raise FileNotFoundError(f"Missing posterior samples at {obs_dir / 'posterior_samples.pt'}.")
 
 
     # Load x_obs.pt; raise if missing
@@ -37,21 +41,26 @@ def evaluate_inference(task, method_name, metric_name, num_simulations, obs_offs
         raise FileNotFoundError(f"Missing observations at {x_path}.")
 
 
-    ref_dist = task.get_reference_posterior(observation)
-    reference_samples = ref_dist.sample((posterior_samples.shape[0],)).cpu()
-
     if metric_name == "c2st":
-        score = compute_c2st(
-            posterior_samples.cpu().numpy(),
-            reference_samples.cpu().numpy(),
-            test_size=0.3,
-            random_state=86,
-            plot=True,
-            obs_idx=idx+1
-        )
+        if reference_samples is None:
+            with track_stage("reference_sampling", estimated_bytes=posterior_samples.element_size() * posterior_samples.nelement()):
+                ref_dist = task.get_reference_posterior(observation)
+                reference_samples = ref_dist.sample((posterior_samples.shape[0],))
+        reference_samples = reference_samples[:posterior_samples.shape[0]].cpu()
+
+        with track_stage("c2st"):
+            score = compute_c2st(
+                posterior_samples.cpu().numpy(),
+                reference_samples.cpu().numpy(),
+                test_size=0.3,
+                random_state=86,
+                plot=True,
+                obs_idx=idx+1
+            )
     elif metric_name == "ppc":
         simulator = task.get_simulator()
-        score = compute_ppc(posterior_samples.cpu(), observation.cpu(), simulator)
+        with track_stage("ppc", estimated_bytes=posterior_samples.element_size() * posterior_samples.nelement()):
+            score = compute_ppc(posterior_samples.cpu(), observation.cpu(), simulator)
     else:
         raise ValueError(f"Unknown metric: {metric_name}")
 
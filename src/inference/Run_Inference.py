@@ -4,6 +4,11 @@ from sbi.inference import NPE, NLE, NRE
 import yaml
 from pathlib import Path
 
+from src.utils.artifact_store import ArtifactStore
+from src.utils.io_utils import save_samples_to, storage_options
+from src.utils.memory_tracking import track_stage
+from src.utils.progress import report_progress
+
 
 # List of inference methods
 methods = {
@@ -22,6 +27,8 @@ def run_inference(
     seed=None,
     config=None,
     observations=None,
+    simulations=None,
+    storage=None,
 ):
 
     """
@@ -39,10 +46,48 @@ def run_inference(
             It is **not** used for extracting values such as `task`, `method_name`, or `num_observations`.
             All required arguments must be passed explicitly.
         observations: (optional) Observations passed by benchmark_run.py to loop over.
+        simulations: (optional) Pre-simulated training data as a tuple (theta, x), e.g. shared between the
+            points of a grid run. If given, no new simulations are drawn.
+        storage: (optional) Storage options of the posterior samples ('format': "pt" | "npy", 'dtype':
+            "float32" | "float16" | "bfloat16", 'compress': bool), see src.utils.io_utils.save_samples_to.
+            Defaults to float32 tensors saved with torch.save.
 
     Returns:
         samples: Posterior samples from the last observation.
     """
+    posterior = train_posterior(task, method_name, num_simulations, seed=seed, simulations=simulations)
+
+# for using Run_inference.py independently
+    if observations is None:
+        observations = [task.get_observation(i) for i in range(num_observations)]
+
+    return sample_posterior(
+        posterior,
+        task,
+        method_name,
+        num_simulations,
+        num_posterior_samples,
+        observations[:num_observations],
+        seed=seed,
+        config=config,
+        storage=storage,
+    )
+
+
+def train_posterior(task, method_name, num_simulations, seed=None, simulations=None):
+    """
+    Simulate training data (unless given) and train the posterior of `method_name` on it.
+
+    Args:
+        task: The task object providing prior and simulator.
+        method_name: The inference method to use ("NPE", "NLE", or "NRE").
+        num_simulations: Number of simulations for training.
+        seed: Random seed for reproducibility.
+        simulations: (optional) Pre-simulated training data as a tuple (theta, x).
+
+    Returns:
+        The trained sbi posterior.
+    """
     if method_name not in methods:
         raise ValueError(f"Method {method_name} is not supported. Choose from {list(methods.keys())}.")
 
@@ -54,45 +99,90 @@ def run_inference(
     if seed is not None:
         torch.manual_seed(seed)
 
-    # draw parameters from prior
-    theta = prior.sample((num_simulations,))
+    if simulations is None:
+        # draw parameters from prior
+        theta = prior.sample((num_simulations,))
 
-    # simulate data
-    x = simulator(theta)
+        # simulate data (estimated to be about as large as theta)
+        report_progress("simulation")
+        with track_stage("simulation", estimated_bytes=theta.element_size() * theta.nelement()):
+            x = simulator(theta)
+    else:
+        theta, x = simulations
 
     # create and train inference model
-    inference = method_class(prior)
-    density_estimator = inference.append_simulations(theta, x).train()
+    report_progress("training")
+    with track_stage("training"):
+        inference = method_class(prior)
+        density_estimator = inference.append_simulations(theta, x).train()
 
     # perform inference
-    posterior = inference.build_posterior(density_estimator)
+    return inference.build_posterior(density_estimator)
 
 
-    task_name = task.__class__.__name__  # get task name
+def sample_posterior(
+    posterior,
+    task,
+    method_name,
+    num_simulations,
+    num_posterior_samples,
+    observations,
+    indices=None,
+    seed=None,
+    config=None,
+    storage=None,
+):
+    """
+    Draw posterior samples for each observation and save them (with the observation) to its folder
+    'outputs/<Task>_<Method>/sims_<N>/obs_<idx>'.
 
-# for using Run_inference.py independently
-    if observations is None:
-        observations = [task.get_observation(i) for i in range(num_observations)]
+    Args:
+        posterior: Trained posterior (see train_posterior).
+        task: The task object.
+        method_name: The inference method ("NPE", "NLE", or "NRE").
+        num_simulations: Number of training simulations (part of the output folder).
+        num_posterior_samples: Number of posterior samples per observation.
+        observations: Observations to sample for.
+        indices: (optional) Observation index of each observation (default: 0, 1, ...).
+        seed, config, storage: See run_inference.
 
-    # Loop over observations
-    for idx in range(num_observations):
-        x_obs = observations[idx]
-        # shape handling
-        if x_obs.ndim == 2 and x_obs.shape[0] == 1:
-            x_obs = x_obs.squeeze(0)
-
-        samples = posterior.sample((num_posterior_samples,), x=x_obs)
-
-        # Create a new folder for each observation and save results
-        output_dir = Path("outputs") / f"{task_name}_{method_name}" / f"sims_{num_simulations}" / f"obs_{idx}"
-        output_dir.mkdir(parents=True, exist_ok=True)
-        torch.save(samples, output_dir / "posterior_samples.pt")
-        torch.save(x_obs, output_dir / "x_obs.pt") # saves the observation to be used for evaluation
-
-        # Save config in each observation folder
-        if config is not None:
-            config_path = output_dir / "config_used.yaml"
-            with config_path.open("w") as f:
-                yaml.dump(OmegaConf.to_container(config, resolve=True), f)
+    Returns:
+        samples: Posterior samples from the last observation.
+    """
+    indices = list(range(len(observations))) if indices is None else list(indices)
+    task_name = task.__class__.__name__  # get task name
+    sample_storage = storage_options(storage)
+    parameter_dim = max(task.get_prior().event_shape.numel(), 1)
+    estimated_bytes = num_posterior_samples * parameter_dim * torch.get_default_dtype().itemsize
+
+    # The artifact store deduplicates identical observations/samples across methods and budgets
+    with ArtifactStore() as artifacts:
+        # Loop over observations
+        samples = None
+        report_progress("sampling", completed=indices[0] if indices else 0)
+        for idx, x_obs in zip(indices, observations):
+            # shape handling
+            if x_obs.ndim == 2 and x_obs.shape[0] == 1:
+                x_obs = x_obs.squeeze(0)
+
+            with track_stage("sampling", estimated_bytes=estimated_bytes):
+                samples = posterior.sample((num_posterior_samples,), x=x_obs)
+
+            # Create a new folder for each observation and save results
+            output_dir = Path("outputs") / f"{task_name}_{method_name}" / f"sims_{num_simulations}" / f"obs_{idx}"
+            output_dir.mkdir(parents=True, exist_ok=True)
+            metadata = {"task": task_name, "method": method_name, "num_simulations": num_simulations,
+                        "observation_idx": idx, "seed": seed}
+            samples_path = save_samples_to(samples, output_dir, "posterior_samples", **sample_storage)
+            artifacts.add_file(samples_path, kind="posterior_samples", **metadata)
+            # saves the observation to be used for evaluation (a hard link to the shared copy in the artifact store)
+            artifacts.put_tensor(x_obs, path=output_dir / "x_obs.pt", kind="observation", **metadata)
+
+            # Save config in each observation folder
+            if config is not None:
+                config_path = output_dir / "config_used.yaml"
+                with config_path.open("w") as f:
+                    yaml.dump(OmegaConf.to_container(config, resolve=True), f)
+            report_progress("sampling", completed=idx + 1)
 
     return samples
\ No newline at end of file
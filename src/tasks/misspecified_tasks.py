@@ -1,7 +1,51 @@
+from functools import lru_cache
+
+import numpy as np
 import torch
 import torch.distributions as D
 
 
+# Rows of the common random number streams generated per block (each block has its own seed)
+CRN_BLOCK_SIZE = 4096
+
+
+@lru_cache(maxsize=64)
+def _crn_block(seed: int, block: int, dim: int):
+    """
+    Return the base random numbers of rows [block * CRN_BLOCK_SIZE, (block + 1) * CRN_BLOCK_SIZE) of a stream.
+
+    Returns:
+        Tuple[torch.Tensor, torch.Tensor, torch.Tensor]: uniforms (rows,), Beta(2, 5) samples (rows, dim) and
+        standard normal samples (rows, dim).
+    """
+    # torch's CPU generator only uses 32 bits of its seed; SeedSequence mixes seed and block into them
+    generator = torch.Generator().manual_seed(int(np.random.SeedSequence([int(seed), int(block)]).generate_state(1)[0]))
+    uniform = torch.rand(CRN_BLOCK_SIZE, generator=generator)
+    # Beta(2, 5) = G2 / (G2 + G5) with Gamma(k, 1) variables G_k, each a sum of k standard exponentials
+    exponentials = -torch.log1p(-torch.rand(CRN_BLOCK_SIZE, dim, 7, generator=generator))
+    g2, g5 = exponentials[..., :2].sum(-1), exponentials[..., 2:].sum(-1)
+    beta = g2 / (g2 + g5)
+    normal = torch.randn(CRN_BLOCK_SIZE, dim, generator=generator)
+    return uniform, beta, normal
+
+
+def crn_streams(seed: int, start: int, stop: int, dim: int):
+    """
+    Return the common random numbers of rows [start, stop) of the stream `seed`.
+
+    The numbers of a row only depend on the seed and the row index, so a batch simulated in chunks sees the same
+    numbers as in one call.
+
+    Returns:
+        Tuple[torch.Tensor, torch.Tensor, torch.Tensor]: uniforms (n,), Beta(2, 5) samples (n, dim) and standard
+        normal samples (n, dim).
+    """
+    first, last = start // CRN_BLOCK_SIZE, (max(stop, start + 1) - 1) // CRN_BLOCK_SIZE
+    blocks = [_crn_block(seed, block, dim) for block in range(first, last + 1)]
+    offset = start - first * CRN_BLOCK_SIZE
+    return tuple(torch.cat(parts)[offset:offset + stop - start] for parts in zip(*blocks))
+
+
 class GroundTruthModel:
     """Ground truth model with standard Gaussian prior and identity covariance likelihood."""
 
@@ -70,12 +114,17 @@ class GroundTruthModel:
 class LikelihoodMisspecifiedTask:
     """Task for inference in a Gaussian model with misspecified likelihood."""
 
+    # Parameters that simulate_grid() accepts as tensors, one value per grid point
+    GRID_PARAMETERS = ("tau_m", "lambda_val")
+
 
     def __init__(
         self,
         dim: int,
         tau_m: float,  # Misspecified likelihood variance
         lambda_val: float,  # Mixture weight
+        common_random_numbers: bool = False,
+        crn_seed: int = 0,
     ):
         """Initialize the Gaussian misspecified likelihood task.
 
@@ -83,6 +132,9 @@ class LikelihoodMisspecifiedTask:
             dim (int): Dimensionality of the parameter space
             tau_m (float): Variance factor for the misspecified likelihood
             lambda_val (float): Mixture weight in [0, 1]
+            common_random_numbers (bool): Simulate from pre-drawn base streams shared by all tasks with the same
+                `crn_seed`, so that tasks with different tau_m/lambda_val see the same randomness
+            crn_seed (int): Seed of the common random number streams
         """
         self.dim = int(dim)
 
@@ -90,6 +142,10 @@ class LikelihoodMisspecifiedTask:
         self.tau_m = float(tau_m)
         self.lambda_val = float(lambda_val)
 
+        # common random numbers across parameter sweeps
+        self.common_random_numbers = bool(common_random_numbers)
+        self.crn_seed = int(crn_seed)
+
         # prior parameters
         self.mu_prior = torch.ones(self.dim)
         self.sigma_prior = torch.eye(self.dim)
@@ -150,12 +206,16 @@ class LikelihoodMisspecifiedTask:
         return samples.reshape(10_000, self.dim)
 
 
-    def simulator(self, thetas:torch.Tensor):
+    def simulator(self, thetas:torch.Tensor, offset: int = 0):
         """Simulate observations x given parameters theta under a misspecified likelihood model.
 
+        With `common_random_numbers`, row i of the batch is simulated from row `offset + i` of the base
+        streams: x = beta_i if u_i < lambda_val, else theta_i + sqrt(tau_m) * z_i.
+
         Args:
             thetas: - of shape (batch_size, dim)
                     - containing params (vectors) from which observations are simulated
+            offset: Index of the first row in the common random number streams (ignored otherwise)
 
         Returns:
             torch.Tensor: - of shape (batch_size, dim)
@@ -167,6 +227,9 @@ class LikelihoodMisspecifiedTask:
         # thetas shape: (batch_size, dim)
         batch_size = thetas.shape[0]
 
+        if self.common_random_numbers:
+            return self.simulate_grid(thetas, offset=offset)[0]
+
         # Generate a batch of Bernoulli samples - decide which distribution to use for each sample
         is_beta = torch.bernoulli(torch.tensor(self.lambda_val, dtype=torch.float32).expand(batch_size))
 
@@ -190,6 +253,41 @@ class LikelihoodMisspecifiedTask:
         return result
 
 
+    def simulate_grid(self, thetas: torch.Tensor, tau_m=None, lambda_val=None, offset: int = 0) -> torch.Tensor:
+        """Simulate a batch of parameters for a whole grid of misspecification parameters in one call.
+
+        Grid point g uses tau_m[g] and lambda_val[g]. With `common_random_numbers` all grid points share the base
+        streams (rows `offset` onwards); otherwise every grid point draws its own random numbers.
+
+        Args:
+            thetas: - of shape (batch_size, dim), shared by all grid points, or (grid_size, batch_size, dim)
+            tau_m: Variance factors of shape (grid_size,), or a scalar (default: the task's tau_m)
+            lambda_val: Mixture weights of shape (grid_size,), or a scalar (default: the task's lambda_val)
+            offset: Index of the first row in the common random number streams (ignored otherwise)
+
+        Returns:
+            torch.Tensor: Simulated observations of shape (grid_size, batch_size, dim)
+        """
+        tau_m = torch.as_tensor(self.tau_m if tau_m is None else tau_m, dtype=thetas.dtype).reshape(-1, 1, 1)
+        lambda_val = torch.as_tensor(self.lambda_val if lambda_val is None else lambda_val,
+                                     dtype=torch.float32).reshape(-1, 1)
+        grid_size = max(len(tau_m), len(lambda_val), thetas.shape[0] if thetas.ndim == 3 else 1)
+        batch_size = thetas.shape[-2]
+
+        if self.common_random_numbers:
+            uniform, beta, normal = crn_streams(self.crn_seed, offset, offset + batch_size, self.dim)
+            uniform = uniform.expand(grid_size, -1)
+            beta, normal = beta.expand(grid_size, -1, -1), normal.expand(grid_size, -1, -1)
+        else:
+            uniform = torch.rand(grid_size, batch_size)
+            beta = D.Beta(torch.tensor(2.), torch.tensor(5.)).sample((grid_size, batch_size, self.dim))
+            normal = torch.randn(grid_size, batch_size, self.dim)
+
+        is_beta = (uniform < lambda_val).unsqueeze(-1)
+        normal = thetas + tau_m.sqrt() * normal.to(thetas.dtype)
+        return torch.where(is_beta, beta.to(thetas.dtype), normal)
+
+
     def get_simulator(self):
         """Return simulator function."""
         return self.simulator
@@ -0,0 +1,199 @@
+"""
+Registry of the benchmark tasks.
+
+Tasks are registered by config name (`task.name`) with the import path of their class and metadata that is
+available without importing the task module:
+
+    >>> task_registry.spec("misspecified_likelihood").class_name
+    'LikelihoodMisspecifiedTask'
+    >>> Task = task_registry["misspecified_likelihood"]   # imports src.tasks.misspecified_tasks on first access
+
+Metadata of a task:
+    - class_name: name of the task class (used in output folder names),
+    - params: parameter schema of the constructor ({name: type}), checked by validate(),
+    - sizes: default sizes of a run (num_simulations, num_observations, num_posterior_samples),
+    - description: one-line summary.
+
+Third-party packages add tasks with an entry point of the group 'sbi_benchmark.tasks', whose name is the
+config name and whose value is the task class:
+
+    [project.entry-points."sbi_benchmark.tasks"]
+    my_task = "my_package.tasks:MyTask"
+
+Entry points are only discovered when a task is not registered here or when the registry is listed. Tests and
+scripts can register classes directly: `task_registry["test_task"] = DummyTask` (in tests with
+monkeypatch.setitem, which removes the entry again).
+"""
+
+import importlib
+from collections.abc import MutableMapping
+from importlib.metadata import entry_points
+from typing import Any, Dict, Iterator, Mapping, Optional, Union
+
+
+ENTRY_POINT_GROUP = "sbi_benchmark.tasks"
+
+
+class TaskSpec:
+    """
+    Registry entry of a task: import path and metadata; the class is imported on first use.
+
+    Args:
+        name (str): Config name of the task.
+        target (str | type): Import path 'package.module:Class' (or 'package.module.Class'), or the class itself.
+        params (Mapping[str, type], optional): Parameter schema of the constructor.
+        sizes (Mapping[str, Any], optional): Default sizes of a run.
+        description (str): One-line summary.
+    """
+    def __init__(
+            self,
+            name: str,
+            target: Union[str, type],
+            *,
+            params: Optional[Mapping[str, type]] = None,
+            sizes: Optional[Mapping[str, Any]] = None,
+            description: str = "",
+    ):
+        self.name = name
+        self._cls = None
+        if isinstance(target, type):
+            self._cls = target
+            target = f"{target.__module__}:{target.__qualname__}"
+        self.target = target if ":" in target else ":".join(target.rsplit(".", 1))
+        self.params = dict(params) if params is not None else None
+        self.sizes = dict(sizes or {})
+        self.description = description
+
+
+    def __repr__(self) -> str:
+        return f"TaskSpec({self.name!r}, {self.target!r})"
+
+
+    @property
+    def class_name(self) -> str:
+        """Name of the task class, without importing it."""
+        return self.target.rsplit(":", 1)[1].rsplit(".", 1)[-1]
+
+
+    def load(self) -> type:
+        """
+        Import and return the task class.
+
+        Raises:
+            ImportError: If the module or class cannot be imported.
+        """
+        if self._cls is None:
+            module_name, attribute = self.target.split(":", 1)
+            try:
+                obj = importlib.import_module(module_name)
+                for part in attribute.split("."):
+                    obj = getattr(obj, part)
+            except (ImportError, AttributeError) as e:
+                raise ImportError(f"Cannot import task {self.name!r} from {self.target!r}: {e}") from e
+            self._cls = obj
+        return self._cls
+
+
+    def validate(self, kwargs: Mapping[str, Any]) -> None:
+        """
+        Check task parameters against the parameter schema (no-op without a schema).
+
+        Raises:
+            ValueError: If a parameter is unknown.
+        """
+        if self.params is None:
+            return
+        unknown = sorted(set(kwargs) - set(self.params))
+        if unknown:
+            raise ValueError(f"Unknown parameters for task {self.name!r}: {unknown}. Available: {list(self.params)}")
+
+
+class TaskRegistry(MutableMapping):
+    """
+    Mapping of config names to task classes, resolved lazily from TaskSpec entries.
+
+    `registry[name]` imports and returns the class; `registry[name] = cls_or_path` registers a task without
+    metadata. Use register() to add metadata and spec() / class_name() to read it without importing.
+    """
+    def __init__(self, group: Optional[str] = ENTRY_POINT_GROUP):
+        self._specs: Dict[str, TaskSpec] = {}
+        self._group = group
+        self._discovered = group is None
+
+
+    def register(self, name: str, target: Union[str, type], **metadata: Any) -> TaskSpec:
+        """Register (or replace) task `name`; see TaskSpec for the arguments."""
+        spec = TaskSpec(name, target, **metadata)
+        self._specs[name] = spec
+        return spec
+
+
+    def _discover(self) -> None:
+        """Register the tasks of installed entry points (once; tasks registered here take precedence)."""
+        if self._discovered:
+            return
+        self._discovered = True
+        for entry_point in entry_points(group=self._group):
+            if entry_point.name not in self._specs:
+                self._specs[entry_point.name] = TaskSpec(entry_point.name, entry_point.value)
+
+
+    def spec(self, name: str) -> TaskSpec:
+        """
+        Return the registry entry of task `name`.
+
+        Raises:
+            KeyError: If no such task is registered or installed.
+        """
+        if name not in self._specs:
+            self._discover()
+        if name not in self._specs:
+            raise KeyError(name)
+        return self._specs[name]
+
+
+    def class_name(self, name: str) -> str:
+        """Return the class name of task `name` without importing it."""
+        return self.spec(name).class_name
+
+
+    def __getitem__(self, name: str) -> type:
+        return self.spec(name).load()
+
+
+    def __setitem__(self, name: str, target: Union[str, type]) -> None:
+        self.register(name, target)
+
+
+    def __delitem__(self, name: str) -> None:
+        del self._specs[name]
+
+
+    def __contains__(self, name: object) -> bool:
+        try:
+            self.spec(name)
+        except KeyError:
+            return False
+        return True
+
+
+    def __iter__(self) -> Iterator[str]:
+        self._discover()
+        return iter(list(self._specs))
+
+
+    def __len__(self) -> int:
+        self._discover()
+        return len(self._specs)
+
+
+# Registry of all available tasks
+task_registry = TaskRegistry()
+
+task_registry.register(
+    "misspecified_likelihood",
+    "src.tasks.misspecified_tasks:LikelihoodMisspecifiedTask",
+    params={"dim": int, "tau_m": float, "lambda_val": float, "common_random_numbers": bool, "crn_seed": int},
+    sizes={"num_simulations": [100, 1000], "num_observations": 4, "num_posterior_samples": 100},
+    description="Gaussian model with a misspecified likelihood (variance tau_m, mixture weight lambda_val)",
+)
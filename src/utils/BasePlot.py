@@ -1,12 +1,22 @@
+import multiprocessing
+import os
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Iterable, Optional, Tuple, Union, Set
+from typing import Any, List, Iterable, Mapping, Optional, Sequence, Tuple, Union, Set
 
 import matplotlib.pyplot as plt
 import pandas as pd
 
 from src.utils.file_utils import ensure_directory, unique_path
-from src.utils.csv_utils import gather_csv_files, read_csv_files, ensure_columns
+from src.utils.render_cache import RenderCache, data_signature
+from src.utils.csv_utils import gather_csv_files, read_csv_files, ensure_columns, concat_frames, as_categorical
+
+
+def _render_plot(plot_class: type, kwargs: Mapping[str, Any]) -> Path:
+    """Render one plot spec in a worker process on the non-interactive Agg backend."""
+    plt.switch_backend("Agg")
+    return plot_class(**kwargs).run()
 
 
 class BasePlot(ABC):
@@ -19,9 +29,13 @@ class BasePlot(ABC):
         filename (str, optional): Custom output filename (stem or with extension).
             Defaults to "<ClassName>.png" where ClassName is the name of the subclass.
         **plot_kwargs: Passed to plotting calls in subclass, e.g. {"marker": "o", "linestyle": "--"}.
+        filters (Mapping[str, Any], optional): Row filters applied while loading the data in run(); see load_data().
+        columns (Sequence[str], optional): Columns loaded in run(); see load_data(). Defaults to all columns.
+        cache (bool): Skip rendering in run() if the same plot (parameters and input files) was already rendered and
+            its image still exists; see src.utils.render_cache. Defaults to True.
 
     Attributes:
-        data (pd.DataFrame | None): Set by load_data(); holds the loaded DataFrame.
+        data (pd.DataFrame | None): Set by load_data(); the loaded DataFrame (the same object load_data() returns).
         fig (plt.Figure | None): Set by create(); holds the produced figure.
         axes (list[plt.Axes] | None): Set by create(); holds the flat list of axes.
         save_path (Path | None): Set by save(); holds path where the figure was saved.
@@ -38,6 +52,9 @@ class BasePlot(ABC):
             filename: Optional[str] = None,
 
             plot_kwargs: Optional[dict] = None,
+            filters: Optional[Mapping[str, Any]] = None,
+            columns: Optional[Sequence[str]] = None,
+            cache: bool = True,
     ):
         # Normalization:
         # Normalize data_sources to a list of Path objects
@@ -78,6 +95,15 @@ class BasePlot(ABC):
         # Kwargs for plotting a CSV file (e.g.,{"marker": "o", "linestyle": "--"})
         self.plot_kwargs = plot_kwargs or {}
 
+        # Pushdown of row filters and column projection into the CSV reader (used by load_data)
+        self.filters = dict(filters) if filters else None
+        self.columns = list(columns) if columns is not None else None
+
+        # Render cache (index under <base_directory>/outputs), consulted by run()
+        self.cache = cache
+        self._cache_key: Optional[str] = None
+        self._cache_params: Optional[dict] = None
+
         # Output attributes
         self.data: Optional[pd.DataFrame] = None    # Output of load_data()
         self.fig: Optional[plt.Figure] = None       # Output of plot()
@@ -100,38 +126,168 @@ class BasePlot(ABC):
         Returns:
             Path: The save path to the plotted figure.
         """
+        if self.cache:
+            cached = self._cached_render()
+            if cached is not None:
+                return cached
+
         df = self.load_data()
         fig, axes = self.plot(df)
         save_path = self.save(fig)
+
+        if self._cache_key is not None:
+            self._render_cache().record(self._cache_key, self._cache_params, save_path)
         return save_path
 
 
-    def load_data(self) -> pd.DataFrame:
+    # Attributes that are results rather than parameters of a plot
+    _OUTPUT_ATTRIBUTES = {"data", "fig", "axes", "save_path", "stats", "cache"}
+
+
+    def cache_params(self) -> dict:
+        """Return the parameters that identify this plot in the render cache (class and public attributes)."""
+        params = {k: v for k, v in vars(self).items() if not k.startswith("_") and k not in self._OUTPUT_ATTRIBUTES}
+        params["plot_class"] = f"{type(self).__module__}.{type(self).__qualname__}"
+        params["filename"] = f"{self.stem}.{self.extension}"
+        return params
+
+
+    def _render_cache(self) -> RenderCache:
+        return RenderCache(self.base_directory / "outputs" / ".plot_cache.json", self.base_directory)
+
+
+    def _cached_render(self) -> Optional[Path]:
+        """
+        Compute the cache key from the plot parameters and input files and return the cached image, if any.
+        """
+        self._cache_key = None
+        csv_paths = gather_csv_files(data_sources=self.data_sources, base_directory=self.base_directory)
+        if not csv_paths:
+            return None  # load_data() reports the missing input
+
+        self._cache_params = self.cache_params()
+        self._cache_key = RenderCache.key(self._cache_params, data_signature(csv_paths))
+        cached = self._render_cache().lookup(self._cache_key)
+        if cached is None:
+            return None
+
+        self.save_path = cached.relative_to(self.base_directory)
+        print(f"Plot unchanged; reusing {self.save_path}")
+        return self.save_path
+
+
+    @classmethod
+    def render_batch(
+            cls,
+            specs: Iterable[Mapping[str, Any]],
+            *,
+            max_workers: Optional[int] = None,
+    ) -> List[Optional[Path]]:
+        """
+        Render many plots in parallel on a process pool (headless, Agg backend) and return their save paths.
+
+        Each spec holds the constructor arguments of one plot; the optional key "plot_class" selects the plot class
+        (default: the class render_batch is called on). Every plot is a separate task, so a slow figure only occupies
+        one worker while the others keep rendering.
+
+            >>> LinePlot.render_batch([
+            ...     {"data_sources": "outputs/A_NPE/metrics_all.csv", "save_directory": "outputs/A_NPE/plots"},
+            ...     {"data_sources": "outputs/A_NLE/metrics_all.csv", "save_directory": "outputs/A_NLE/plots"},
+            ... ])
+
+        Args:
+            specs (Iterable[Mapping[str, Any]]): Plot specs (picklable constructor keyword arguments).
+            max_workers (int, optional): Number of worker processes; defaults to min(#specs, cpu_count).
+                With a single worker (or spec), the plots are rendered in this process.
+
+        Returns:
+            List[Optional[Path]]: The save path of each spec (as returned by run()), in spec order;
+                None for plots that failed (the error is reported).
+        """
+        jobs = []
+        for spec in specs:
+            kwargs = dict(spec)
+            jobs.append((kwargs.pop("plot_class", cls), kwargs))
+        if not jobs:
+            return []
+
+        workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+        results: List[Optional[Path]] = [None] * len(jobs)
+
+        def report(position: int, error: Exception) -> None:
+            plot_class, kwargs = jobs[position]
+            print(f"Failed to render {plot_class.__name__} of {kwargs.get('data_sources')!r}: {error}")
+
+        if workers == 1:
+            for position, (plot_class, kwargs) in enumerate(jobs):
+                try:
+                    results[position] = plot_class(**kwargs).run()
+                except Exception as e:
+                    report(position, e)
+            return results
+
+        # Fork where available: workers start without re-importing the plotting stack
+        method = "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method)) as pool:
+            futures = {pool.submit(_render_plot, plot_class, kwargs): position
+                       for position, (plot_class, kwargs) in enumerate(jobs)}
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as e:
+                    report(futures[future], e)
+
+        print(f"Rendered {sum(path is not None for path in results)}/{len(jobs)} plots with {workers} workers.")
+        return results
+
+
+    def load_data(
+            self,
+            *,
+            filters: Optional[Mapping[str, Any]] = None,
+            columns: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
         """
         Load CSV files from self.data_sources as a pd.DataFrame and concatenate them into one combined pd.DataFrame.
 
+        Filters and the column projection are pushed down into the reader: only the needed columns are parsed and
+        files are streamed in chunks of which only the matching rows are kept.
+
+        Args:
+            filters (Mapping[str, Any], optional): Row filters, e.g. {"metric": "c2st", "method": ["NPE", "NLE"],
+                "tau_m": (0.5, 2.0)}: a scalar selects equal values, a list any of its values and a tuple a closed
+                range (None for an open side). Defaults to self.filters.
+            columns (Sequence[str], optional): Columns to load. The base fieldnames among them are validated.
+                Defaults to self.columns (None: all columns).
+
         Returns:
             pd.DataFrame: The combined DataFrame of all successfully read CSV files.
 
         Raises:
             FileNotFoundError: If no CSV files are found for the given data_sources.
-            ValueError: If CSV files are found but all reads fail.
+            ValueError: If CSV files are found but all reads fail, or no rows match the filters.
         """
+        filters = self.filters if filters is None else filters
+        columns = self.columns if columns is None else columns
+
         # Gather all CSV files from the data_sources
         csv_paths = gather_csv_files(data_sources=self.data_sources, base_directory=self.base_directory)
         if not csv_paths:
             raise FileNotFoundError(f"No CSV files found for any of {self.data_sources!r}")
 
         # Read each CSV file into a single DataFrame
-        frames = read_csv_files(csv_paths)
+        frames = read_csv_files(csv_paths, columns=columns, filters=filters)
         if not frames:
             raise ValueError(f"All CSV reads failed for {self.data_sources!r}")
 
-        # Concatenate frames into one combined DataFrame
-        combined = pd.concat(frames, ignore_index=True)
-        self.data = combined  # update self.data attribute for future potential use
+        # Concatenate frames into one combined DataFrame and release the per-file frames
+        num_files = len(frames)
+        combined = concat_frames([df for df in frames if len(df)] or frames[:1])
+        del frames
+        if filters and combined.empty:
+            raise ValueError(f"No rows of {self.data_sources!r} match the filters {dict(filters)!r}")
 
-        # 4) Validate and reorder columns
+        # 4) Validate and reorder columns (without copying the data); label columns are kept categorical
         base_fieldnames = [
             "metric",
             "value",
@@ -141,10 +297,14 @@ class BasePlot(ABC):
             "observation_idx",
         ]
 
+        if columns is not None:
+            base_fieldnames = [column for column in base_fieldnames if column in columns]
         combined = ensure_columns(combined, base_fieldnames)
+        as_categorical(combined, ["metric", "task", "method"])
+        self.data = combined  # the plot object keeps a reference to the returned frame, not a second copy
 
         # Report how many rows/files were loaded
-        print(f"Loaded {len(combined)} rows from {len(frames)} files.")
+        print(f"Loaded {len(combined)} rows from {num_files} files.")
         return combined
 
 
@@ -189,9 +349,14 @@ class BasePlot(ABC):
         save_path = self.save_directory / filename
 
         # If the filename was auto-generated (default),
-        # make it unique by appending a running ID to avoid accidental overwriting
+        # make it unique by appending a running ID to avoid accidental overwriting,
+        # unless the image of an earlier render of the same plot (from older data) is replaced
         if self._filename_is_default:
-            save_path = unique_path(save_path)
+            previous = self._render_cache().previous_path(self._cache_params) if self._cache_key else None
+            if previous is not None and previous.parent == save_path.parent:
+                save_path = previous
+            else:
+                save_path = unique_path(save_path)
 
         # Ensure the save directory (and any missing parents) exists
         ensure_directory(save_path.parent)
@@ -36,6 +36,16 @@ class LinePlot(BasePlot):
                 "<ClassName>.png".
             plot_kwargs (dict, optional):
                 Per‑line style overrides forwarded to ``sns.relplot``.
+            filters (dict, optional):
+                Row filters pushed down into the CSV reader, e.g.
+                ``{"metric": "c2st", "tau_m": (0.5, 2.0)}``; see
+                ``BasePlot.load_data``.
+            columns (list[str], optional):
+                Columns to load (the plot needs task, metric, method, value and
+                ``x``). Defaults to all columns.
+            cache (bool, optional):
+                Reuse the image of an identical earlier render in ``run``. Defaults
+                to True.
             row_order (list[str], optional):
                 Desired facet row order. Accepts either task names (expanded to
                 (task, metric) pairs found in the data) or explicit "task__metric"
@@ -53,6 +63,8 @@ class LinePlot(BasePlot):
         Attributes:
             data (pd.DataFrame | None):
                 Loaded DataFrame (after ``load_data``).
+            stats (pd.DataFrame | None):
+                Aggregated statistics that were plotted (after ``plot``), see ``aggregate``.
             fig (plt.Figure | None):
                 Created figure (after ``create``).
             axes (list[plt.Axes] | None):
@@ -61,6 +73,10 @@ class LinePlot(BasePlot):
                 Path where the figure was saved (after ``save``).
 
         Notes:
+            - The per-observation rows are aggregated once (mean, sd, count per
+              task/metric/method/x, see ``aggregate``) and lines and error bars are
+              drawn from that table, so plotting time does not depend on the
+              number of observations.
             - Rows are faceted by a combined key "task__metric" to support multiple
               metrics per task; if only one metric exists globally, a single super
               y‑label is used instead.
@@ -82,8 +98,10 @@ class LinePlot(BasePlot):
             col_order: Optional[List] = None,
             title: Optional[str] = None,
             log_x: Optional[bool] = True,
-            err_style: Optional[str] = None
-
+            err_style: Optional[str] = None,
+            filters: Optional[dict] = None,
+            columns: Optional[List[str]] = None,
+            cache: bool = True,
     ):
         self.x = x
 
@@ -92,7 +110,10 @@ class LinePlot(BasePlot):
             base_directory=base_directory,
             save_directory=save_directory,
             filename=filename,
-            plot_kwargs=plot_kwargs
+            plot_kwargs=plot_kwargs,
+            filters=filters,
+            columns=columns,
+            cache=cache,
         )
 
         self.row_order = row_order
@@ -100,6 +121,29 @@ class LinePlot(BasePlot):
         self.title = title
         self.log_x = log_x
         self.err_style = err_style
+        self.stats: Optional[pd.DataFrame] = None   # Output of aggregate(), set by plot()
+
+
+    def aggregate(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aggregate the values of each (task, metric, method, x) group in a single groupby.
+
+        Args:
+            df (pd.DataFrame): Per-observation results, typically obtained from `load_data()`.
+
+        Returns:
+            pd.DataFrame: One row per group with the columns task, metric, method, <x>, mean, sd (sample standard
+                deviation, NaN for single observations), count and the facet row key task_metric ("task__metric").
+        """
+        keys = ["task", "metric", "method", self.x]
+        stats = (df.groupby(keys, sort=True, observed=True)["value"]
+                 .agg(["mean", "std", "count"])
+                 .rename(columns={"std": "sd"})
+                 .reset_index())
+        for column in ["task", "metric", "method"]:
+            stats[column] = stats[column].astype(str)     # the table is small; plain strings are simplest to facet
+        stats["task_metric"] = stats["task"] + "__" + stats["metric"]
+        return stats
 
     def _plot(self, df: pd.DataFrame) -> Tuple[plt.Figure, list]:
 
@@ -175,48 +219,62 @@ class LinePlot(BasePlot):
         # 2) Initialize grid and figure geometry
         # 2.1 Create combined row label ("task_metric") and map user-provided row_order if given
         # Ensures correct facet row order when tasks have multiple metrics.
-        df = df.copy()
-        df.sort_values(["task", "metric"], inplace=True)
-        df["task_metric"] = df["task"] + "__" + df["metric"]
+        # The caller's frame is neither copied nor sorted: it is reduced to one row per plotted point right away
+        stats = self.aggregate(df)
+        self.stats = stats
+        num_raw_rows = len(df)
 
-        tm_set = set(df["task_metric"])
-        t_set = set(df["task"])
+        pairs = sorted(set(zip(stats["task"], stats["metric"])))   # rows are ordered by task, then metric
+        pair_of = {f"{task}__{metric}": (task, metric) for task, metric in pairs}
+        tm_set = set(pair_of)
+        t_set = {task for task, _ in pairs}
 
         if not self.row_order:  # None or []
-            row_order = df["task_metric"].drop_duplicates().tolist()
+            row_order = list(pair_of)
         elif all(k in tm_set for k in self.row_order):  # user passed task_metric keys
             row_order = [k for k in self.row_order if k in tm_set]
         elif all(k in t_set for k in self.row_order):  # user passed task names
             row_order = []
             for t in self.row_order:
-                row_order.extend(df.loc[df["task"] == t, "task_metric"].drop_duplicates().tolist())
+                row_order.extend(k for k, (task, _) in pair_of.items() if task == t)
         else:
             raise ValueError("row_order must be a list of 'task' names or 'task_metric' keys.")
 
 
         # 2.2 Create an initial FacetGrid
+        # Lines are drawn from the aggregated means (no estimator); error bars are added from the sd column below
         grid = sns.relplot(
-            data=df,
+            data=stats,
 
             x=self.x,
-            y="value",
+            y="mean",
             row="task_metric",
             col="method",
 
             kind="line",
-            estimator="mean",
-
-            errorbar="sd",
-            err_style=ERR_STYLE,
-            err_kws=ERR_KWS,
+            estimator=None,
+            errorbar=None,
             facet_kws={"sharey": True, "sharex": True},
 
             row_order=row_order,
-            col_order=self.col_order or sorted(df['method'].unique()),
+            col_order=self.col_order or sorted(stats["method"].unique()),
 
             **plot_kwargs,
         )
 
+        # Error bars (mean ± sd) in the color of each facet's line
+        for (task_metric, method), group in stats.groupby(["task_metric", "method"], sort=False):
+            ax = grid.axes_dict.get((task_metric, method))
+            if ax is None:  # facet excluded by row_order/col_order
+                continue
+            group = group[group["sd"].notna()]  # single observations have no spread
+            color = ax.lines[0].get_color() if ax.lines else None
+            x, mean, sd = group[self.x].to_numpy(), group["mean"].to_numpy(), group["sd"].to_numpy()
+            if ERR_STYLE == "bars":
+                ax.errorbar(x, mean, yerr=sd, fmt="none", color=color, **ERR_KWS)
+            else:
+                ax.fill_between(x, mean - sd, mean + sd, color=color, **{"alpha": 0.2, "linewidth": 0, **ERR_KWS})
+
 
         # 2.3 Calculate figure size
         # Grid Dimensions
@@ -256,13 +314,13 @@ class LinePlot(BasePlot):
         # Adjust Label size
         K = 0.6
         supx = self.x
-        metrics = df["metric"].astype(str).unique()
+        metrics = sorted({metric for _, metric in pairs})
 
-        task_len = max(len(df.loc[df["task_metric"] == k, "task"].iloc[0]) for k in grid.row_names)
+        task_len = max(len(pair_of[k][0]) for k in grid.row_names)
         method_len = max(len(str(m)) for m in grid.col_names)
         supx_len = len(supx)
         supy_len = len(metrics[0]) if len(metrics) == 1 else 0
-        ylab_len = 0 if supy_len else max(len(df.loc[df["task_metric"] == k, "metric"].iloc[0]) for k in grid.row_names)
+        ylab_len = 0 if supy_len else max(len(pair_of[k][1]) for k in grid.row_names)
 
         cands = [
             72 * grid_width / (TASK_LABEL_pt * task_len * K),
@@ -283,8 +341,8 @@ class LinePlot(BasePlot):
         # 3.1 Axes Limits and Scales
         # Calculate x-axis limits
         # Ensure consistent visual padding to the left and right of the data range, regardless of x-axis scale
-        x_min = df[self.x].min()
-        x_max = df[self.x].max()
+        x_min = stats[self.x].min()
+        x_max = stats[self.x].max()
 
         if self.log_x:
             xlim = (x_min * 0.5, x_max * 2)
@@ -387,7 +445,7 @@ class LinePlot(BasePlot):
 
 
             # Add task name label
-            task_name = df.loc[df["task_metric"] == grid.row_names[i], "task"].iloc[0]
+            task_name = pair_of[grid.row_names[i]][0]
 
             grid.fig.text(
                 horizontal_grid_center, task_label_pos[i],
@@ -444,9 +502,9 @@ class LinePlot(BasePlot):
 
 
         # Add a super y-axis label if applicable
-        unique_metrics = df["metric"].unique()
+        unique_metrics = metrics
 
-        if len(unique_metrics) == 1 and len(df["metric"]) != 1:
+        if len(unique_metrics) == 1 and num_raw_rows != 1:
             # Only one metric; add a single super y-label
             for ax in grid.axes.flat:
                 ax.set_ylabel(None)
@@ -464,7 +522,7 @@ class LinePlot(BasePlot):
         else:
             # Multiple metrics; add row-specific y-labels on the leftmost column
             for i, row_axes in enumerate(grid.axes):
-                metric_name = df.loc[df["task_metric"] == grid.row_names[i], "metric"].iloc[0]
+                metric_name = pair_of[grid.row_names[i]][1]
                 row_axes[0].set_ylabel(metric_name)
 
 
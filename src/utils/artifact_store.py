@@ -0,0 +1,340 @@
+"""
+Content-addressed store for tensor artifacts (observations, posterior and reference samples).
+
+Every artifact is stored once under its content hash:
+
+    outputs/.artifacts/
+    ├── objects/<ab>/<sha256>.<ext>
+    └── index.sqlite
+
+The index maps references to objects together with their metadata (kind, task, method, num_simulations,
+observation_idx, seed, ...). A reference is either a file in the output tree (e.g.
+outputs/<Task>_<Method>/sims_<N>/obs_<i>/x_obs.pt), which becomes a hard link to the object, so identical
+observations of different methods and budgets share their disk space, or a logical name (e.g.
+"reference_samples/<task>/seed_<seed>") for artifacts that only live in the store.
+
+Usage:
+    >>> store = ArtifactStore()
+    >>> store.put_tensor(x_obs, path=obs_dir / "x_obs.pt", kind="observation", task="...", observation_idx=0)
+    >>> store.lookup(kind="observation", task="...")
+    >>> store.gc()   # drop index entries of deleted files and remove unreferenced objects
+
+    python -m src.utils.artifact_store --root outputs/.artifacts --gc [--dry-run]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import torch
+
+from src.utils.file_utils import apply_target_mode, ensure_directory
+from src.utils.run_manifest import file_checksum
+
+
+DEFAULT_ROOT = Path("outputs") / ".artifacts"
+
+# Indexed metadata columns; further metadata is kept as JSON
+METADATA_COLUMNS = {
+    "kind": "TEXT",
+    "task": "TEXT",
+    "method": "TEXT",
+    "num_simulations": "INTEGER",
+    "observation_idx": "INTEGER",
+    "seed": "INTEGER",
+}
+
+
+def tensor_digest(tensor: torch.Tensor) -> str:
+    """
+    Compute the SHA-256 of a tensor's content (dtype, shape and values).
+
+    Args:
+        tensor (torch.Tensor): The tensor to hash.
+
+    Returns:
+        str: The hex digest.
+    """
+    tensor = tensor.detach().cpu().contiguous()
+    digest = hashlib.sha256(f"{tensor.dtype}|{tuple(tensor.shape)}|".encode())
+    raw = tensor.view(torch.int16) if tensor.dtype == torch.bfloat16 else tensor
+    digest.update(raw.numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    """Atomically make `target` a hard link to `source` (a copy where hard links are unsupported)."""
+    ensure_directory(target.parent)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.link")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(source, tmp)
+    except OSError:  # e.g. different file systems
+        shutil.copy2(source, tmp)
+    os.replace(tmp, target)
+
+
+class ArtifactStore:
+    """
+    Content-addressed artifact store with a SQLite lookup index.
+
+    Args:
+        root (str | Path): Store directory (default: outputs/.artifacts); created if missing.
+        timeout (float): Seconds to wait for the index lock held by concurrent writers.
+
+    Attributes:
+        root (Path): Store directory.
+        objects (Path): Directory of the stored objects.
+    """
+    TABLE = "artifacts"
+
+    def __init__(self, root: Union[str, Path] = DEFAULT_ROOT, *, timeout: float = 60.0):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        ensure_directory(self.objects)
+        self._connection = sqlite3.connect(self.root / "index.sqlite", timeout=timeout)
+        self._create_schema()
+
+
+    def __enter__(self) -> "ArtifactStore":
+        return self
+
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+    def close(self) -> None:
+        """Close the index connection."""
+        self._connection.close()
+
+
+    def _create_schema(self) -> None:
+        """Create the index table and its indexes if they don't exist yet."""
+        columns = ", ".join(f"{name} {sql_type}" for name, sql_type in METADATA_COLUMNS.items())
+        with self._connection:
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.TABLE} (ref TEXT PRIMARY KEY, digest TEXT NOT NULL, "
+                f"suffix TEXT NOT NULL, {columns}, metadata TEXT, created REAL)"
+            )
+            self._connection.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.TABLE}_digest ON {self.TABLE} (digest)")
+            self._connection.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{self.TABLE}_lookup ON {self.TABLE} (kind, task, method, num_simulations)"
+            )
+
+
+    def object_path(self, digest: str, suffix: str = ".pt") -> Path:
+        """Return the location of the object `digest`."""
+        return self.objects / digest[:2] / f"{digest}{suffix}"
+
+
+    def _register(self, ref: str, digest: str, suffix: str, metadata: Dict[str, Any]) -> None:
+        """Insert or replace the index entry of reference `ref`."""
+        indexed = {name: metadata.pop(name, None) for name in METADATA_COLUMNS}
+        names = ["ref", "digest", "suffix", *indexed, "metadata", "created"]
+        values = [ref, digest, suffix, *indexed.values(), json.dumps(metadata, default=str), time.time()]
+        with self._connection:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO {self.TABLE} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+                values,
+            )
+
+
+    @staticmethod
+    def _reference(path: Optional[Union[str, Path]], name: Optional[str]) -> str:
+        """Return the index key of a file reference or logical name."""
+        if (path is None) == (name is None):
+            raise ValueError("Pass exactly one of `path` or `name`.")
+        return str(Path(path).resolve()) if path is not None else f"name:{name}"
+
+
+    def put_tensor(
+            self,
+            tensor: torch.Tensor,
+            *,
+            path: Optional[Union[str, Path]] = None,
+            name: Optional[str] = None,
+            **metadata: Any,
+    ) -> str:
+        """
+        Store a tensor (once per content) and reference it by a file `path` or a logical `name`.
+
+        With `path`, the file is (re)placed atomically as a hard link to the stored object.
+
+        Args:
+            tensor (torch.Tensor): The artifact.
+            path (str | Path, optional): File in the output tree that should hold the tensor.
+            name (str, optional): Logical name for artifacts without a file in the output tree.
+            **metadata: Lookup metadata, e.g. kind="observation", task=..., observation_idx=0.
+
+        Returns:
+            str: The content digest.
+        """
+        ref = self._reference(path, name)
+        tensor = tensor.detach().cpu()
+        digest = tensor_digest(tensor)
+        target = self.object_path(digest)
+
+        if not target.exists():
+            ensure_directory(target.parent)
+            fd, tmp_name = tempfile.mkstemp(prefix=f".{digest}.", suffix=".tmp", dir=target.parent)
+            with os.fdopen(fd, "wb") as f:
+                torch.save(tensor.clone(), f)  # clone: don't serialize the storage of a larger base tensor
+            apply_target_mode(tmp_name, target)
+            os.replace(tmp_name, target)
+
+        if path is not None:
+            _link_or_copy(target, Path(path))
+        self._register(ref, digest, target.suffix, metadata)
+        return digest
+
+
+    def add_file(self, path: Union[str, Path], **metadata: Any) -> str:
+        """
+        Move an existing file into the store (keyed by its file checksum) and replace it with a hard link.
+
+        A file with the same content that is already stored is reused, so the duplicate's disk space is freed.
+
+        Args:
+            path (str | Path): File in the output tree, e.g. obs_0/posterior_samples.npy.
+            **metadata: Lookup metadata.
+
+        Returns:
+            str: The content digest.
+        """
+        path = Path(path)
+        suffix = "".join(path.suffixes[-2:]) if path.name.endswith((".bf16.npy", ".bf16.npz")) else path.suffix
+        digest = file_checksum(path)
+        target = self.object_path(digest, suffix)
+        if not target.exists():
+            ensure_directory(target.parent)
+            _link_or_copy(path, target)
+        _link_or_copy(target, path)
+        self._register(self._reference(path, None), digest, suffix, metadata)
+        return digest
+
+
+    def lookup(self, **filters: Any) -> List[dict]:
+        """
+        Return the index entries matching all given metadata filters (None means no filter), newest first.
+
+        Args:
+            **filters: Filters on the indexed columns (kind, task, method, num_simulations, observation_idx,
+                seed), 'digest' or 'ref'.
+
+        Returns:
+            List[dict]: Entries with 'ref', 'digest', 'object' (path of the stored object), the indexed columns and
+                'metadata'.
+
+        Raises:
+            ValueError: If a filter refers to an unknown column.
+        """
+        allowed = {"ref", "digest", *METADATA_COLUMNS}
+        unknown = [name for name in filters if name not in allowed]
+        if unknown:
+            raise ValueError(f"Unknown artifact columns: {unknown}")
+
+        clauses = [(name, value) for name, value in filters.items() if value is not None]
+        where = (" WHERE " + " AND ".join(f"{name} = ?" for name, _ in clauses)) if clauses else ""
+        cursor = self._connection.execute(
+            f"SELECT * FROM {self.TABLE}{where} ORDER BY created DESC", [value for _, value in clauses]
+        )
+        names = [description[0] for description in cursor.description]
+        entries = []
+        for row in cursor:
+            entry = dict(zip(names, row))
+            entry["metadata"] = json.loads(entry["metadata"] or "{}")
+            entry["object"] = self.object_path(entry["digest"], entry.pop("suffix"))
+            entries.append(entry)
+        return entries
+
+
+    def load(self, digest: str) -> torch.Tensor:
+        """Load the stored tensor with content digest `digest`."""
+        entries = self.lookup(digest=digest)
+        path = entries[0]["object"] if entries else self.object_path(digest)
+        if path.suffix != ".pt":
+            from src.utils.io_utils import load_samples
+            return load_samples(path)
+        return torch.load(path, map_location="cpu", weights_only=True)
+
+
+    def gc(self, *, dry_run: bool = False) -> dict:
+        """
+        Garbage-collect the store.
+
+        1. Drop index entries whose file reference no longer exists or no longer holds the stored object
+           (e.g. it was deleted or overwritten).
+        2. Delete objects that are not referenced by any remaining entry.
+
+        Args:
+            dry_run (bool): Only report what would be removed.
+
+        Returns:
+            dict: 'stale_refs' (dropped references), 'objects' (removed object paths) and 'bytes' (freed).
+        """
+        stale = []
+        referenced = set()
+        for entry in self.lookup():
+            ref, obj = entry["ref"], entry["object"]
+            if ref.startswith("name:"):
+                alive = obj.exists()
+            else:
+                ref_path = Path(ref)
+                # A copy (no hard link support) still counts as long as its content is unchanged
+                alive = obj.exists() and ref_path.exists() and (
+                    os.path.samefile(ref_path, obj) or file_checksum(ref_path) == file_checksum(obj)
+                )
+            if alive:
+                referenced.add(obj)
+            else:
+                stale.append(ref)
+
+        unreferenced = [p for p in self.objects.glob("*/*") if p.is_file() and p not in referenced
+                        and not p.name.startswith(".")]
+        freed = sum(p.stat().st_size for p in unreferenced)
+
+        if not dry_run:
+            with self._connection:
+                self._connection.executemany(f"DELETE FROM {self.TABLE} WHERE ref = ?", [(ref,) for ref in stale])
+            for p in unreferenced:
+                p.unlink()
+        return {"stale_refs": stale, "objects": unreferenced, "bytes": freed}
+
+
+def parse_args(argv=None):
+    """Parse and return command-line arguments."""
+    p = argparse.ArgumentParser(description="Inspect and garbage-collect the content-addressed artifact store.")
+    p.add_argument("--root", type=Path, default=DEFAULT_ROOT, help="Store directory (default: outputs/.artifacts)")
+    p.add_argument("--gc", action="store_true", help="Remove unreferenced artifacts")
+    p.add_argument("--dry-run", action="store_true", help="With --gc: only report what would be removed")
+    p.add_argument("--kind", type=str, default=None, help="List the artifacts of this kind (e.g. observation)")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with ArtifactStore(args.root) as store:
+        if args.gc:
+            result = store.gc(dry_run=args.dry_run)
+            verb = "Would remove" if args.dry_run else "Removed"
+            print(f"{verb} {len(result['objects'])} object(s) ({result['bytes'] / 1024 ** 2:.1f} MB) and "
+                  f"{len(result['stale_refs'])} stale reference(s)")
+        else:
+            entries = store.lookup(kind=args.kind)
+            for entry in entries:
+                print(f"{entry['digest'][:12]}  {entry['kind'] or '-':<18} {entry['ref']}")
+            print(f"{len(entries)} reference(s) to {len({e['digest'] for e in entries})} object(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,38 @@
+import math
 import random
+import statistics
 import torch
 import os
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 import pandas as pd
+from pathlib import Path
 from omegaconf import OmegaConf
 
 from src.evaluation.evaluate_inference import evaluate_inference
-from src.inference.Run_Inference import run_inference
-from src.tasks.misspecified_tasks import LikelihoodMisspecifiedTask
+from src.inference.Run_Inference import run_inference, sample_posterior, train_posterior
+from src.tasks.registry import task_registry
+from src.utils.csv_utils import write_csv_atomic
+from src.utils.io_utils import sample_filename, storage_options
+from src.utils.memory_tracking import MemoryTracker
+from src.utils.progress import STATUS_FILENAME, ProgressReporter, hydra_output_dir, report_progress
+from src.utils.results_store import ResultsStore
+from src.utils.run_manifest import RunManifest, config_hash
 
 
-# Task registry to hold all available task classes
-task_registry = {
-    "misspecified_likelihood": LikelihoodMisspecifiedTask,
-
-}
+def run_benchmark(config):
+    """
+    Run the benchmark for one config (or, with `grid.enabled`, for its whole grid; see run_grid).
 
+    Returns:
+        list[str]: The run folders whose metrics.csv were written.
+    """
+    # Grid mode: run the full cross-product of the sweep axes in this process
+    grid = config.get("grid")
+    if grid is not None and grid.get("enabled", False):
+        return run_grid(config)
 
-def run_benchmark(config):
     random_seed = config.get('random_seed')
     if random_seed is None:
         random_seed = random.randint(0, 2 ** 32 - 1)
@@ -24,91 +40,548 @@ def run_benchmark(config):
     else:
         print(f"Using provided random seed: {random_seed}")
 
+    task = build_task(config)
+    num_observations = config.inference.num_observations
+
+    # the observation is fixed here and passed during the benchmarking process
+    observations = [task.get_observation(i) for i in range(num_observations)]
+
+    outdir, all_metrics = run_point(config, task, random_seed, observations, job_dir=hydra_output_dir())
+
+    # Save metrics.csv and add the rows to the results store
+    save_metrics(outdir, all_metrics)
+    store_metrics(config, all_metrics)
+    return [outdir]
+
+
+def build_task(config):
+    """Instantiate the task described by `config.task` from the task registry."""
     task_name = config.task.name
     if task_name not in task_registry:
         raise ValueError(f"Unknown task: {task_name}. Available: {list(task_registry.keys())}")
 
-    
-    Task = task_registry[task_name]   # Get the task class from the registry
-    
     task_kwargs = OmegaConf.to_container(config.task, resolve=True) or {} # Convert Hydra node to a dict
 
     task_kwargs.pop("name", None)  # Remove the 'name' key if it exists
-    task = Task(**task_kwargs)  # Initialize the task with the provided parameters
+    task_registry.spec(task_name).validate(task_kwargs)
+
+    Task = task_registry[task_name]   # Get the task class from the registry (imported on first use)
+    return Task(**task_kwargs)  # Initialize the task with the provided parameters
+
+
+def save_metrics(outdir, all_metrics):
+    """Write the metric rows of one run folder to '<outdir>/metrics.csv'."""
+    write_csv_atomic(pd.DataFrame(all_metrics), Path(outdir) / "metrics.csv")
+    print(f"Saved metrics ➜ {os.path.join(outdir, 'metrics.csv')}")
+
+
+def store_metrics(config, all_metrics):
+    """
+    Write the metric rows of one run folder to the results store at `config.results_store` in one batch.
+
+    Rows of an earlier run of the same task, method and budget are replaced, mirroring the rewrite of metrics.csv.
+    Does nothing if no results store is configured.
+    """
+    store_path = config.get("results_store")
+    if not store_path or not all_metrics:
+        return
+
+    first = all_metrics[0]
+    with ResultsStore(store_path) as store:
+        store.write(all_metrics, replace={key: first[key] for key in ["task", "method", "num_simulations"]})
+    print(f"Stored {len(all_metrics)} rows ➜ {store_path}")
+
+
+def run_point(config, task, random_seed, observations, simulations=None, reference_samples=None, job_dir=None):
+    """
+    Run inference and evaluation for a single configuration (one task, method, budget and seed).
+
+    Args:
+        config: Resolved config of this run; only `task`, `inference`, `metric`, `force`, `storage`, `memory`,
+            `progress` and `adaptive` are read.
+        task: The instantiated task.
+        random_seed (int): Seed used for training.
+        observations (list[torch.Tensor]): Observations to run inference and evaluation for.
+        simulations (tuple, optional): Pre-simulated training data (theta, x) passed to run_inference.
+        reference_samples (list[torch.Tensor], optional): Pre-drawn reference posterior samples per observation.
+        job_dir (str | Path, optional): Output directory of the Hydra job, which also gets the run's status.jsonl.
+
+    Returns:
+        Tuple[str, list[dict]]: The run folder and the metric rows of all observations.
+    """
+    task_name = config.task.name
+    task_kwargs = OmegaConf.to_container(config.task, resolve=True) or {}
 
     method = config.inference.method.upper()
     num_simulations = config.inference.num_simulations
     num_observations = config.inference.num_observations
     num_posterior_samples = config.inference.num_posterior_samples
 
-    # the observation is fixed here and passed during the benchmarking process
-    observations = [task.get_observation(i) for i in range(num_observations)]
+    # Completion manifest of this run folder; units of an identical earlier run are skipped
+    task_class_name = task.__class__.__name__
+    outdir = f"outputs/{task_class_name}_{method}/sims_{num_simulations}"
+    manifest = RunManifest(outdir)
+    if config.get("force", False):
+        manifest.reset()
 
+    unit = {
+        "task_hash": config_hash(task_kwargs),
+        "method": method,
+        "num_simulations": num_simulations,
+        "num_posterior_samples": num_posterior_samples,
+        "seed": random_seed,
+    }
+    # Sample storage format; non-default options are part of the unit, so changing them recomputes the samples
+    storage = storage_options(config.get("storage"))
+    if storage != storage_options(None):
+        unit["storage"] = storage
+    samples_file = sample_filename("posterior_samples", **storage)
+
+    def obs_artifacts(obs_idx):
+        return [Path(f"obs_{obs_idx}") / samples_file, Path(f"obs_{obs_idx}") / "x_obs.pt"]
+
+    def is_sampled(obs_idx):
+        return manifest.is_complete({**unit, "observation_idx": obs_idx, "metric": None})
+
+    def record_samples(indices):
+        for obs_idx in indices:
+            if all((Path(outdir) / p).is_file() for p in obs_artifacts(obs_idx)):
+                manifest.record({**unit, "observation_idx": obs_idx, "metric": None}, artifacts=obs_artifacts(obs_idx))
 
-    print(
-        f"\n Running {method} on task {task_name} with {num_simulations} simulations and {num_observations} observations\n")
-
-    run_inference(
-        task=task,
-        method_name=method,
-        num_simulations=num_simulations,
-        seed=random_seed,
-        num_posterior_samples=num_posterior_samples,
-        num_observations=num_observations,
-        config=config,
-        observations=observations,
-
-    )
     # Determine which metrics to compute based on config
     metric_config = config.metric.name
     compute_c2st = metric_config in ["c2st", "c2st_ppc"]
     compute_ppc = metric_config in ["ppc", "c2st_ppc"]
+    metric_names = [name for name, enabled in [("c2st", compute_c2st), ("ppc", compute_ppc)] if enabled]
 
-    # Evaluation: collect all metrics for all obs, save one metrics.csv
-    all_metrics = []
-    for obs_idx in range(num_observations):
-
-        x_o = observations[obs_idx]
-        metrics_dict = {"obs_idx": obs_idx, "task": task_name, "method": method}
+    def evaluate_observation(obs_idx):
+        rows = []
+        for metric_name in metric_names:
+            metric_key = {**unit, "observation_idx": obs_idx, "metric": metric_name}
+            completed = manifest.get(metric_key)
 
+            if completed is not None:
+                score = completed["value"]
+            else:
+                evaluation_kwargs = {}
+                if reference_samples is not None and obs_idx < len(reference_samples):
+                    evaluation_kwargs["reference_samples"] = reference_samples[obs_idx]
+                score = evaluate_inference(
+                    task=task,
+                    method_name=method,
+                    metric_name=metric_name,
+                    num_simulations=num_simulations,
+                    obs_offset=obs_idx,
+                    **evaluation_kwargs,
+                )
+                if is_sampled(obs_idx):
+                    manifest.record(metric_key, artifacts=obs_artifacts(obs_idx),
+                                    value=None if score is None else float(score))
 
-        if compute_c2st:
-            c2st_score = evaluate_inference(
-                task=task,
-                method_name=method,
-                metric_name="c2st",
-                num_simulations=num_simulations,
-                obs_offset=obs_idx,
-            )
-            all_metrics.append({
-                "metric": "c2st",
-                "value": c2st_score,
+            rows.append({
+                "metric": metric_name,
+                "value": score,
                 "task": task_name,
                 "method": method,
                 "num_simulations": num_simulations,
                 "observation_idx": obs_idx,
             })
+        return rows
 
-        if compute_ppc:
-            ppc_score = evaluate_inference(
-                task=task,
-                method_name=method,
-                metric_name="ppc",
-                num_simulations=num_simulations,
-                obs_offset=obs_idx,
+    # Adaptive mode: observations are added in batches until the metrics are precise enough
+    adaptive = config.get("adaptive") or {}
+    adaptive_enabled = bool(adaptive.get("enabled", False))
+
+    print(
+        f"\n Running {method} on task {task_name} with {num_simulations} simulations and {num_observations} observations"
+        f"{' (adaptive)' if adaptive_enabled else ''}\n")
+
+    # Optional peak-memory tracking of all stages, written to <outdir>/memory.csv
+    memory_config = config.get("memory") or {}
+    tracker = None
+    if memory_config.get("enabled", False):
+        tracker = MemoryTracker(ceiling_mb=memory_config.get("ceiling_mb"),
+                                track_python=memory_config.get("track_python", False),
+                                track_tensors=memory_config.get("track_tensors", False))
+
+    # Optional progress events of the run, appended to <outdir>/status.jsonl and <job_dir>/status.jsonl
+    # (see `cli_tools status`)
+    reporter = None
+    if (config.get("progress") or {}).get("enabled", False):
+        mirrors = [] if job_dir is None else [Path(job_dir) / STATUS_FILENAME]
+        reporter = ProgressReporter(Path(outdir) / STATUS_FILENAME, total=num_observations, mirrors=mirrors,
+                                    task=task_name, method=method, num_simulations=num_simulations, seed=random_seed)
+
+    with tracker or nullcontext(), reporter or nullcontext():
+        if adaptive_enabled:
+            all_metrics = run_adaptive(
+                config, task, random_seed, observations, simulations,
+                metric_names=metric_names, is_sampled=is_sampled, record_samples=record_samples,
+                evaluate_observation=evaluate_observation, outdir=outdir,
             )
-            all_metrics.append({
-                "metric": "ppc",
-                "value": ppc_score,
-                "task": task_name,
-                "method": method,
-                "num_simulations": num_simulations,
-                "observation_idx": obs_idx
-            })
+        else:
+            # Inference: one trained estimator serves all observations, so any missing observation retrains it
+            missing = [obs_idx for obs_idx in range(num_observations) if not is_sampled(obs_idx)]
+            if missing:
+                inference_kwargs = {} if simulations is None else {"simulations": simulations}
+                if "storage" in unit:
+                    inference_kwargs["storage"] = storage
+                run_inference(
+                    task=task,
+                    method_name=method,
+                    num_simulations=num_simulations,
+                    seed=random_seed,
+                    num_posterior_samples=num_posterior_samples,
+                    num_observations=num_observations,
+                    config=config,
+                    observations=observations,
+                    **inference_kwargs,
+                )
+                record_samples(range(num_observations))
+            else:
+                print(f"Resuming: posterior samples for all {num_observations} observations are complete, skipping inference")
 
-    # Save metrics.csv
-    task_class_name = task.__class__.__name__
-    outdir = f"outputs/{task_class_name}_{method}/sims_{num_simulations}"
-    os.makedirs(outdir, exist_ok=True)
-    pd.DataFrame(all_metrics).to_csv(os.path.join(outdir, "metrics.csv"), index=False)
-    print(f"Saved metrics ➜ {os.path.join(outdir, 'metrics.csv')}")
\ No newline at end of file
+            # Evaluation: collect all metrics for all obs, save one metrics.csv
+            all_metrics = []
+            report_progress("evaluation", completed=0)
+            for obs_idx in range(num_observations):
+                all_metrics.extend(evaluate_observation(obs_idx))
+                report_progress("evaluation", completed=obs_idx + 1)
+
+    if tracker is not None and tracker.stages:
+        tracker.save(Path(outdir) / "memory.csv")
+
+    return outdir, all_metrics
+
+
+def stopping_decision(rows, metric_names, *, tolerance, max_observations):
+    """
+    Decide whether an adaptive run needs more observations.
+
+    The standard error of a metric is the standard deviation of its values over the observations divided by the
+    square root of their number (infinite with fewer than two values).
+
+    Args:
+        rows (list[dict]): Metric rows of all observations evaluated so far.
+        metric_names (list[str]): Metrics that must reach the tolerance.
+        tolerance (float): Target standard error of every metric.
+        max_observations (int): Maximum number of observations.
+
+    Returns:
+        Tuple[str, list[dict]]: The decision ("converged", "max_observations" or "continue") and per metric its
+        number of values 'n', 'mean' and standard error 'se'.
+    """
+    stats = []
+    for metric_name in metric_names:
+        values = [float(row["value"]) for row in rows
+                  if row["metric"] == metric_name and row["value"] is not None and not math.isnan(float(row["value"]))]
+        n = len(values)
+        mean = sum(values) / n if n else None
+        se = statistics.stdev(values) / math.sqrt(n) if n >= 2 else math.inf
+        stats.append({"metric": metric_name, "n": n, "mean": mean, "se": se})
+
+    num_observations = len({row["observation_idx"] for row in rows})
+    if all(stat["se"] <= tolerance for stat in stats):
+        return "converged", stats
+    if num_observations >= max_observations:
+        return "max_observations", stats
+    return "continue", stats
+
+
+def run_adaptive(config, task, random_seed, observations, simulations, *, metric_names, is_sampled, record_samples,
+                 evaluate_observation, outdir):
+    """
+    Evaluate a run with an adaptive number of observations (called by run_point with `adaptive.enabled`).
+
+    Starting with `inference.num_observations`, batches of `adaptive.batch_size` observations are sampled and
+    evaluated until the standard error of every metric is at most `adaptive.tolerance` or
+    `adaptive.max_observations` is reached. The posterior is trained once, on the first batch that needs
+    samples. The decision of every round is written to '<outdir>/adaptive.csv', and the final decision and
+    standard error are added to the metric rows ('stopping', 'standard_error').
+
+    Returns:
+        list[dict]: The metric rows of all evaluated observations.
+    """
+    adaptive = config.adaptive
+    tolerance = float(adaptive.tolerance)
+    batch_size = max(int(adaptive.get("batch_size") or 1), 1)
+    num_observations = max(int(config.inference.num_observations), 1)
+    max_observations = max(int(adaptive.get("max_observations") or num_observations), num_observations)
+    method = config.inference.method.upper()
+    num_simulations = config.inference.num_simulations
+    storage = storage_options(config.get("storage"))
+
+    posterior = None
+    all_metrics, rounds = [], []
+    start, stop = 0, num_observations
+    for round_idx in itertools.count(1):
+        indices = list(range(start, stop))
+        report_progress("sampling", completed=start, total=stop)
+        missing = [obs_idx for obs_idx in indices if not is_sampled(obs_idx)]
+        if missing:
+            if posterior is None:
+                posterior = train_posterior(task, method, num_simulations, seed=random_seed, simulations=simulations)
+            sample_posterior(
+                posterior, task, method, num_simulations, config.inference.num_posterior_samples,
+                [observations[i] if i < len(observations) else task.get_observation(i) for i in missing],
+                indices=missing, seed=random_seed, config=config, storage=storage,
+            )
+            record_samples(missing)
+
+        report_progress("evaluation", completed=start)
+        for obs_idx in indices:
+            all_metrics.extend(evaluate_observation(obs_idx))
+            report_progress("evaluation", completed=obs_idx + 1)
+
+        decision, stats = stopping_decision(all_metrics, metric_names, tolerance=tolerance,
+                                            max_observations=max_observations)
+        rounds.extend({"round": round_idx, "num_observations": stop, **stat, "tolerance": tolerance,
+                       "decision": decision} for stat in stats)
+        summary = ", ".join(f"{stat['metric']} SE {stat['se']:.4f}" for stat in stats)
+        print(f"Adaptive: {stop} observations ({summary}; tolerance {tolerance}) ➜ {decision}")
+        if decision != "continue":
+            break
+        start, stop = stop, min(stop + batch_size, max_observations)
+
+    write_csv_atomic(pd.DataFrame(rounds), Path(outdir) / "adaptive.csv")
+    final = {stat["metric"]: stat["se"] for stat in stats}
+    for row in all_metrics:
+        row["stopping"] = decision
+        row["standard_error"] = final.get(row["metric"])
+    return all_metrics
+
+
+def _as_list(value):
+    """Normalize a scalar, list or comma-separated string config value to a list."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(",") if v.strip()]
+    if OmegaConf.is_list(value) or isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+def expand_grid(config):
+    """
+    Expand the `grid` section of `config` into one resolved config per grid point.
+
+    Empty grid axes fall back to the single value of the regular config (`inference.method`,
+    `inference.num_simulations`, `random_seed`, `task.*`).
+
+    Args:
+        config: Config with a `grid` section of lists `methods`, `num_simulations`, `seeds` and a mapping
+            `task_params` of task parameter names to lists of values.
+
+    Returns:
+        Tuple[list, list[str]]: The per-point configs and the names of all axes with more than one value.
+    """
+    grid = config.grid
+
+    methods = _as_list(grid.get("methods")) or [config.inference.method]
+    budgets = [int(n) for n in _as_list(grid.get("num_simulations")) or _as_list(config.inference.num_simulations)]
+    seeds = _as_list(grid.get("seeds")) or [config.get("random_seed")]
+    seeds = [random.randint(0, 2 ** 32 - 1) if s is None else int(s) for s in seeds]
+
+    task_params = OmegaConf.to_container(grid.get("task_params"), resolve=True) if grid.get("task_params") else {}
+    param_names = list(task_params)
+    param_values = [_as_list(task_params[name]) for name in param_names]
+
+    varying = [name for name, values in [("method", methods), ("num_simulations", budgets), ("seed", seeds)]
+               if len(values) > 1]
+    varying += [name for name, values in zip(param_names, param_values) if len(values) > 1]
+
+    points = []
+    for method, budget, seed, *params in itertools.product(methods, budgets, seeds, *param_values):
+        point = OmegaConf.merge(config, {
+            "task": dict(zip(param_names, params)),
+            "inference": {"method": method, "num_simulations": budget},
+            "random_seed": seed,
+        })
+        point.grid.enabled = False
+        points.append(point)
+
+    return points, varying
+
+
+def _run_lane(lane):
+    """
+    Run the grid points of one run folder sequentially and return their metric rows.
+
+    Points sharing a folder (same task, method and budget) overwrite each other's posterior samples,
+    so each point is evaluated before the next one starts.
+    """
+    rows = []
+    outdir = None
+    for point in lane:
+        outdir, point_rows = run_point(
+            point["config"],
+            point["task"],
+            point["seed"],
+            point["observations"],
+            simulations=point["simulations"],
+            reference_samples=point["reference_samples"],
+        )
+        rows.extend({**row, **point["columns"]} for row in point_rows)
+    return outdir, rows
+
+
+def simulate_points(points, task_keys, tasks, budgets, batch_size=None):
+    """
+    Draw the training simulations of every task configuration and seed of a grid.
+
+    Parameters are drawn from the prior with the seed at the largest budget. Task configurations that only
+    differ in the GRID_PARAMETERS of a task class with `simulate_grid` (e.g. a sweep over tau_m and
+    lambda_val) share the parameters and are simulated together in one batched call per chunk.
+
+    Args:
+        points (list): Grid point configs.
+        task_keys (list[str]): Task configuration hash of each point.
+        tasks (dict): Task of each task configuration hash.
+        budgets (dict): Largest budget per (task configuration hash, seed).
+        batch_size (int, optional): Simulate in chunks of this many parameter sets.
+
+    Returns:
+        dict: (theta, x) per (task configuration hash, seed).
+    """
+    # Group the task configurations that can be simulated together
+    groups = {}
+    for task_key, point in zip(task_keys, points):
+        task = tasks[task_key]
+        names = getattr(task, "GRID_PARAMETERS", ()) if hasattr(task, "simulate_grid") else ()
+        shared = {k: v for k, v in OmegaConf.to_container(point.task, resolve=True).items() if k not in names}
+        group = groups.setdefault((type(task).__name__, config_hash(shared), point.random_seed), [])
+        if task_key not in group:
+            group.append(task_key)
+
+    simulations = {}
+    for (_, _, seed), group in groups.items():
+        max_budget = max(budgets[(task_key, seed)] for task_key in group)
+        first = tasks[group[0]]
+        torch.manual_seed(seed)
+        theta = first.get_prior().sample((max_budget,))
+        if len(group) == 1:
+            simulations[(group[0], seed)] = (theta, simulate(first, theta, batch_size))
+            continue
+
+        values = {name: torch.tensor([float(getattr(tasks[task_key], name)) for task_key in group])
+                  for name in first.GRID_PARAMETERS}
+        chunk = int(batch_size) if batch_size else len(theta)
+        x = torch.cat([first.simulate_grid(part, offset=i * chunk, **values)
+                       for i, part in enumerate(torch.split(theta, chunk))], dim=1)
+        print(f"Simulated {len(group)} task configurations x {max_budget} parameter sets in one batch (seed {seed})")
+        for task_key, x_task in zip(group, x):
+            simulations[(task_key, seed)] = (theta[:budgets[(task_key, seed)]], x_task[:budgets[(task_key, seed)]])
+    return simulations
+
+
+def simulate(task, theta, batch_size=None):
+    """
+    Simulate `theta` with the task's simulator, in chunks of `batch_size` parameter sets to bound peak memory
+    (all at once if None). Tasks with common random numbers get the offset of each chunk in their streams.
+    """
+    simulator = task.get_simulator()
+    if not batch_size or batch_size >= len(theta):
+        return simulator(theta)
+    chunks = torch.split(theta, int(batch_size))
+    if getattr(task, "common_random_numbers", False):
+        return torch.cat([simulator(chunk, offset=i * int(batch_size)) for i, chunk in enumerate(chunks)])
+    return torch.cat([simulator(chunk) for chunk in chunks])
+
+
+def _init_worker(num_threads):
+    """Limit the torch threads of a pool worker so that workers don't oversubscribe the cores."""
+    if num_threads:
+        torch.set_num_threads(num_threads)
+
+
+def run_grid(config):
+    """
+    Run the full cross-product of methods, budgets, seeds and task parameters of `config.grid` in one process.
+
+    Work is shared across grid points:
+        - observations and reference posterior samples are computed once per task configuration,
+        - training simulations are drawn once per task configuration and seed at the largest budget;
+          smaller budgets use the leading rows,
+        - task configurations that only differ in parameters the task can simulate as a grid (e.g. tau_m and
+          lambda_val) share their prior draws and are simulated in one batched call (see simulate_points).
+    Points writing to the same run folder form a lane that runs sequentially; independent lanes run on a
+    pool of `grid.workers` processes with `grid.threads` torch threads each (default: cores / workers).
+    `grid.simulation_batch_size` simulates the training data in chunks. Each run folder gets the same files as a single run; when a grid axis
+    has more than one value, its value is added as a column to the metric rows.
+
+    Returns:
+        list[str]: The run folders whose metrics.csv were written.
+    """
+    points, varying = expand_grid(config)
+    workers = int(config.grid.get("workers") or 1)
+    threads = config.grid.get("threads")
+    batch_size = config.grid.get("simulation_batch_size")
+    metric_config = config.metric.name
+    need_reference = metric_config in ["c2st", "c2st_ppc"]
+
+    print(f"\n Running grid of {len(points)} points (varying: {', '.join(varying) or 'none'}) on {workers} worker(s)\n")
+
+    # Shared work per task configuration (and seed, for the simulations)
+    task_keys = [config_hash(OmegaConf.to_container(point.task, resolve=True)) for point in points]
+    tasks, observations, references, budgets = {}, {}, {}, {}
+    for task_key, point in zip(task_keys, points):
+        if task_key not in tasks:
+            task = build_task(point)
+            tasks[task_key] = task
+            observations[task_key] = [task.get_observation(i) for i in range(point.inference.num_observations)]
+            if need_reference:
+                num_posterior_samples = point.inference.num_posterior_samples
+                references[task_key] = [
+                    task.get_reference_posterior(x_o).sample((num_posterior_samples,))
+                    for x_o in observations[task_key]
+                ]
+        key = (task_key, point.random_seed)
+        budgets[key] = max(budgets.get(key, 0), int(point.inference.num_simulations))
+
+    simulations = simulate_points(points, task_keys, tasks, budgets, batch_size)
+
+    lanes = {}
+    for task_key, point in zip(task_keys, points):
+        seed = point.random_seed
+        task = tasks[task_key]
+        theta, x = simulations[(task_key, seed)]
+        budget = int(point.inference.num_simulations)
+
+        columns = {}
+        for name in varying:
+            if name == "seed":
+                columns["seed"] = seed
+            elif name in point.task:
+                columns[name] = point.task[name]
+
+        lane_key = (task.__class__.__name__, point.inference.method.upper(), budget)
+        lanes.setdefault(lane_key, []).append({
+            "config": point,
+            "task": task,
+            "seed": seed,
+            "observations": observations[task_key],
+            "simulations": (theta[:budget], x[:budget]),
+            "reference_samples": references.get(task_key),
+            "columns": columns,
+        })
+
+    # Run the lanes (inline for a single worker, with the caller's torch threads restored afterwards)
+    if workers <= 1 or len(lanes) == 1:
+        previous_threads = torch.get_num_threads()
+        _init_worker(threads)
+        try:
+            results = [_run_lane(lane) for lane in lanes.values()]
+        finally:
+            torch.set_num_threads(previous_threads)
+    else:
+        num_threads = int(threads) if threads else max(1, (os.cpu_count() or 1) // workers)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(num_threads,)) as pool:
+            results = list(pool.map(_run_lane, lanes.values()))
+
+    outdirs = []
+    for outdir, rows in results:
+        save_metrics(outdir, rows)
+        store_metrics(config, rows)
+        outdirs.append(outdir)
+    return outdirs
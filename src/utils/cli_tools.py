@@ -1,32 +1,144 @@
 import argparse
+from pathlib import Path
 
-# metrics used in Lueckmann et al. (2021) - Benchmarking Simulation-Based Inference
-valid_metrics = ["ppc", "mmd", "c2st", "probability_true"]
+# metrics implemented by the benchmark (see src/configs/metric); several metrics run as one combined config
+valid_metrics = ["ppc", "c2st"]
 
-def run_tool(args):  # dummy
-    return f"Running the tool with metric: {', '.join(args)}"
+CONFIG_DIR = Path(__file__).resolve().parents[1] / "configs"
 
-def list_methods():  # dummy
-    """Placeholder function for the 'list-methods' command."""
-    methods = ["Method 1: ExampleMethodA", "Method 2: ExampleMethodB"]
-    return "\n".join(methods)
+
+def _split(value):
+    """Split a comma-separated CLI value into a list (empty for None)."""
+    return [v.strip() for v in value.split(",") if v.strip()] if value else []
+
+
+def metric_config_name(metrics):
+    """Return the name of the metric config that computes `metrics` (e.g. ['c2st', 'ppc'] -> 'c2st_ppc')."""
+    selected = [m for m in valid_metrics if m in metrics]
+    return "c2st_ppc" if len(selected) > 1 else selected[0]
+
+
+def build_config(
+        metrics,
+        *,
+        task="misspecified_likelihood",
+        methods=None,
+        num_simulations=None,
+        seeds=None,
+        workers=1,
+        threads=None,
+        chunk_size=None,
+        resume=True,
+        overrides=(),
+):
+    """
+    Compose the benchmark config of a CLI run from src/configs/main.yaml.
+
+    The run is executed in grid mode: the cross-product of `methods`, `num_simulations` and `seeds` runs in one
+    process, with independent run folders on a pool of `workers` processes.
+
+    Args:
+        metrics (list[str]): Metrics to compute (see valid_metrics).
+        task (str): Task config name (src/configs/task).
+        methods (list[str], optional): Inference methods, e.g. ['npe', 'nle']; defaults to the config's method.
+        num_simulations (list[int], optional): Simulation budgets; defaults to the config's budget.
+        seeds (list[int], optional): Random seeds; defaults to the config's seed.
+        workers (int): Number of worker processes.
+        threads (int, optional): Torch threads per worker (default: cores / workers).
+        chunk_size (int, optional): Simulate the training data in chunks of this many parameter sets.
+        resume (bool): Skip units completed by an earlier identical run; False recomputes everything.
+        overrides (Sequence[str]): Further Hydra overrides, e.g. ['task.tau_m=2.0'].
+
+    Returns:
+        DictConfig: The composed config.
+    """
+    from hydra import compose, initialize_config_dir
+
+    def as_list(values):
+        return "[" + ",".join(str(v) for v in values) + "]"
+
+    cli_overrides = [
+        f"task={task}",
+        f"metric={metric_config_name(metrics)}",
+        "grid.enabled=true",
+        f"grid.methods={as_list(methods or [])}",
+        f"grid.num_simulations={as_list(num_simulations or [])}",
+        f"grid.seeds={as_list(seeds or [])}",
+        f"grid.workers={int(workers)}",
+        f"grid.threads={'null' if threads is None else int(threads)}",
+        f"grid.simulation_batch_size={'null' if chunk_size is None else int(chunk_size)}",
+        f"force={'false' if resume else 'true'}",
+    ]
+    with initialize_config_dir(config_dir=str(CONFIG_DIR), version_base="1.3"):
+        return compose(config_name="main", overrides=cli_overrides + list(overrides))
+
+
+def run_tool(metrics, **options):
+    """
+    Run the benchmark for `metrics` (see build_config for the options) and consolidate the metrics of every
+    task-method folder into its metrics_all.csv.
+
+    Returns:
+        list[str]: The run folders whose metrics.csv were written.
+    """
+    from src.utils.benchmark_run import run_benchmark
+    from src.utils.consolidate_metrics import update_consolidated_metrics
+
+    config = build_config(metrics, **options)
+    print(f"Running the tool with metric: {', '.join(metrics)}")
+    outdirs = run_benchmark(config) or []
+
+    if config.get("postprocess", True):
+        for group in sorted({Path(outdir).parent for outdir in outdirs}):
+            update_consolidated_metrics(input_dir=group, output_file=group / "metrics_all.csv")
+            print(f"Consolidated metrics ➜ {group / 'metrics_all.csv'}")
+    return outdirs
+
+
+def list_methods():
+    """Return the inference methods of the method registry (src/inference/Run_Inference.py), one per line."""
+    from src.inference.Run_Inference import methods
+    return "\n".join(f"Method {i}: {name}" for i, name in enumerate(methods, start=1))
+
+
+def list_tasks():
+    """Return the tasks of the task registry (config name and task class), one per line; no task is imported."""
+    from src.tasks.registry import task_registry
+    return "\n".join(f"Task {i}: {name} ({task_registry.class_name(name)})" for i, name in enumerate(task_registry, start=1))
 
 def help_function(parser):
     # guides the user through the program
     print("CLI for interacting with the sbi-misspecification-benchmark tool.")
-    print("Choose one of the following commands: \n  1) run\n  2) list-methods\n  3) help/exit")
+    print("Choose one of the following commands: \n  1) run\n  2) list-methods\n  3) list-tasks\n  4) help/exit")
     choice = input("Enter a number ").strip()
     if choice == "1":
         handle_command(argparse.Namespace(metrics=None))
     elif choice == "2":
         print(list_methods())
     elif choice == "3":
+        print(list_tasks())
+    elif choice == "4":
         parser.print_help()
         return
     else:
         print("Invalid choice.")
         help_function(parser)
 
+def run_options(args):
+    """Collect the run options of build_config from parsed CLI arguments (missing ones keep their defaults)."""
+    options = {
+        "task": getattr(args, "task", None),
+        "methods": _split(getattr(args, "methods", None)),
+        "num_simulations": [int(n) for n in _split(getattr(args, "num_simulations", None))],
+        "seeds": [int(s) for s in _split(getattr(args, "seeds", None))],
+        "workers": getattr(args, "workers", None),
+        "threads": getattr(args, "threads", None),
+        "chunk_size": getattr(args, "chunk_size", None),
+        "resume": not getattr(args, "force", False),
+        "overrides": getattr(args, "set", None) or [],
+    }
+    return {key: value for key, value in options.items() if value not in (None, [])}
+
 def handle_command(args):
     # user can either enter valid evaluation manually or choose them
     if args.metrics:
@@ -43,13 +155,66 @@ def handle_command(args):
             print(f"Invalid metric: {', '.join(invalid)}")
             print(f"Valid metrics are: {', '.join(valid_metrics)}")
         else:
-            print(run_tool(user_metrics))
+            run_tool(user_metrics, **run_options(args))
     else:
         selected = ask_user_for_metrics()
         if not selected:
             print("No metric selected.")
         else:
-            print(run_tool(selected))
+            run_tool(selected, **run_options(args))
+
+def handle_bench(args):
+    # profile one combination at the given sizes
+    from src.utils.profiling import bench
+
+    metrics = _split(args.metrics.lower())
+    invalid = [m for m in metrics if m not in valid_metrics]
+    if invalid or not metrics:
+        print(f"Invalid metric: {', '.join(invalid)}")
+        print(f"Valid metrics are: {', '.join(valid_metrics)}")
+        return None
+    return bench(
+        task=args.task,
+        method=args.method,
+        metrics=metrics,
+        sizes=[int(n) for n in _split(args.num_simulations)],
+        num_observations=args.num_observations,
+        num_posterior_samples=args.num_posterior_samples,
+        profiler=args.profiler,
+        interval=args.interval,
+        top=args.top,
+        collapsed=args.collapsed,
+        overrides=args.set or [],
+    )
+
+def show_status(directory="outputs", *, watch=None, stale_after=None):
+    """
+    Print the progress of the jobs below a sweep directory (see src/utils/progress.py).
+
+    Args:
+        directory (str): Output tree or Hydra multirun folder holding the jobs' status.jsonl files.
+        watch (float, optional): Refresh every `watch` seconds until no job is running (or Ctrl+C).
+        stale_after (float, optional): Seconds without a new event after which a running job counts as stale
+            (default: progress.STALE_AFTER).
+
+    Returns:
+        list[dict]: The latest event of every job.
+    """
+    import time
+    from src.utils.progress import STALE_AFTER, collect_status, format_status, job_state
+
+    stale_after = STALE_AFTER if stale_after is None else stale_after
+    while True:
+        events = collect_status(directory)
+        if watch:
+            print("\033[2J\033[H", end="")   # clear the terminal
+        print(format_status(events, stale_after=stale_after))
+        if not watch or not any(job_state(event, stale_after=stale_after) == "running" for event in events):
+            return events
+        try:
+            time.sleep(watch)
+        except KeyboardInterrupt:
+            return events
 
 def ask_user_for_metrics():
     # function to choose the evaluation
@@ -65,7 +230,7 @@ def ask_user_for_metrics():
             print(f"{answer} is not a valid input.")
     return selected
 
-def main():
+def build_parser():
     # Initialize the argument parser
     parser = argparse.ArgumentParser(
         description="CLI for interacting with the sbi-misspecification-benchmark tool."
@@ -75,25 +240,75 @@ def main():
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
     # run command
-    run_parser = subparsers.add_parser("run", help="Run the tool.")
-    run_parser.add_argument(
-        "--metric",
-        type=str,
-    )
+    run_parser = subparsers.add_parser("run", help="Run the benchmark (all combinations in one process).")
+    run_parser.add_argument("--metric", "--metrics", dest="metrics", type=str,
+                            help=f"Comma-separated metrics ({', '.join(valid_metrics)}); asked interactively if omitted")
+    run_parser.add_argument("--task", type=str, default=None, help="Task config name (see list-tasks)")
+    run_parser.add_argument("--methods", type=str, default=None, help="Comma-separated methods (see list-methods)")
+    run_parser.add_argument("--num-simulations", type=str, default=None, help="Comma-separated simulation budgets")
+    run_parser.add_argument("--seeds", type=str, default=None, help="Comma-separated random seeds")
+    run_parser.add_argument("--workers", type=int, default=None, help="Worker processes for independent run folders")
+    run_parser.add_argument("--threads", type=int, default=None, help="Torch threads per worker (default: cores / workers)")
+    run_parser.add_argument("--chunk-size", type=int, default=None,
+                            help="Simulate the training data in chunks of this many parameter sets")
+    resume = run_parser.add_mutually_exclusive_group()
+    resume.add_argument("--resume", dest="force", action="store_false",
+                        help="Skip units completed by an earlier identical run (default)")
+    resume.add_argument("--force", dest="force", action="store_true", help="Recompute all units")
+    run_parser.set_defaults(force=False)
+    run_parser.add_argument("--set", action="append", metavar="KEY=VALUE",
+                            help="Further config override, e.g. --set task.tau_m=2.0 (repeatable)")
 
-    # list-methods command
+    # bench command
+    bench_parser = subparsers.add_parser("bench", help="Profile one task/method/metric combination.")
+    bench_parser.add_argument("--task", type=str, default="misspecified_likelihood", help="Task config name")
+    bench_parser.add_argument("--method", type=str, default="npe", help="Inference method")
+    bench_parser.add_argument("--metric", "--metrics", dest="metrics", type=str, default="ppc",
+                              help=f"Comma-separated metrics ({', '.join(valid_metrics)})")
+    bench_parser.add_argument("--num-simulations", type=str, default="1000",
+                              help="Comma-separated simulation budgets to profile")
+    bench_parser.add_argument("--num-observations", type=int, default=1, help="Observations per run")
+    bench_parser.add_argument("--num-posterior-samples", type=int, default=1000, help="Posterior samples per observation")
+    bench_parser.add_argument("--profiler", choices=["cprofile", "sampling"], default="cprofile")
+    bench_parser.add_argument("--interval", type=float, default=0.005, help="Sampling interval in seconds")
+    bench_parser.add_argument("--top", type=int, default=20, help="Number of hot functions to print")
+    bench_parser.add_argument("--collapsed", type=str, default=None,
+                              help="Write the sampled stacks in collapsed-stack (flamegraph) format to this file")
+    bench_parser.add_argument("--set", action="append", metavar="KEY=VALUE", help="Further config override")
+
+    # status command
+    status_parser = subparsers.add_parser("status", help="Show the progress of the jobs of a sweep.")
+    status_parser.add_argument("directory", nargs="?", default="outputs",
+                               help="Output tree or Hydra multirun folder (default: outputs)")
+    status_parser.add_argument("--watch", type=float, default=None, metavar="SECONDS",
+                               help="Refresh every SECONDS until no job is running")
+    status_parser.add_argument("--stale-after", type=float, default=None, metavar="SECONDS",
+                               help="Show running jobs without a new event for SECONDS as stale (default: 3600)")
+
+    # list-methods / list-tasks commands
     subparsers.add_parser("list-methods", help="List available methods.")
+    subparsers.add_parser("list-tasks", help="List available tasks.")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
 
     # Parse arguments
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Command handling
     if args.command == "run":
         handle_command(args)
     elif args.command is None:
         help_function(parser)
+    elif args.command == "bench":
+        handle_bench(args)
+    elif args.command == "status":
+        show_status(args.directory, watch=args.watch, stale_after=args.stale_after)
     elif args.command == "list-methods":
         print(list_methods())
+    elif args.command == "list-tasks":
+        print(list_tasks())
     else:
         parser.print_help()
 
@@ -7,16 +7,42 @@ This will:
 3. Validate and reorder columns.
 4. Write the resulting DataFrame to 'output_file' as a .csv file, then return it.
 
+In incremental mode, a sidecar manifest '<output_file>.manifest.json' records the size, mtime and row count of
+every consolidated file together with the output columns. Only new or modified files are read: new files are
+appended, rows of modified or removed files are replaced. A full rebuild only happens if the columns change (or
+the manifest or output is missing or inconsistent).
+
 Usage:
-    python consolidate_metrics.py --input_dir <base_directory> --output_file <metrics_all.csv>
+    python consolidate_metrics.py --input_dir <base_directory> --output_file <metrics_all.csv> [--incremental]
 """
 
 import argparse
+import json
 from pathlib import Path
 import sys
+from typing import Dict, List
 
 import pandas as pd
-from src.utils.csv_utils import gather_csv_files, read_csv_files, ensure_columns
+from src.utils.csv_utils import (
+    append_csv_locked,
+    concat_frames,
+    ensure_columns,
+    gather_csv_files,
+    get_csv_header,
+    read_csv_files_by_path,
+    write_csv_atomic,
+)
+from src.utils.file_utils import atomic_write, file_lock
+
+
+BASE_FIELDNAMES = [
+    "metric",
+    "value",
+    "task",
+    "method",
+    "num_simulations",
+    "observation_idx",
+]
 
 
 def parse_args():
@@ -37,10 +63,158 @@ def parse_args():
         required=True,
         help="File path where to write the consolidated .csv file (e.g. metrics_all.csv)"
     )
+    p.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only read new or modified metrics.csv files, using the sidecar manifest next to the output file"
+    )
     return p.parse_args()
 
 
-def consolidate_metrics(input_dir: Path, output_file: Path) -> pd.DataFrame:
+def manifest_path(output_file: Path) -> Path:
+    """Return the location of the sidecar manifest of a consolidated output file."""
+    output_file = Path(output_file)
+    return output_file.with_name(output_file.name + ".manifest.json")
+
+
+def _stat(path: Path) -> Dict[str, int]:
+    """Return the size and mtime (ns) of a file."""
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _read_frames(csv_paths: List[Path]) -> Dict[Path, pd.DataFrame]:
+    """Read the files in parallel with validated required columns; unreadable files are skipped."""
+    return {path: ensure_columns(df, BASE_FIELDNAMES) for path, df in read_csv_files_by_path(csv_paths).items()}
+
+
+def _write_manifest(output_file: Path, input_dir: Path, columns: List[str], files: Dict[str, dict]) -> None:
+    """Write the sidecar manifest; `files` must be in the order of their row blocks in the output file."""
+    manifest = {"input_dir": str(Path(input_dir).resolve()), "columns": list(columns), "files": files}
+    with atomic_write(manifest_path(output_file)) as f:
+        f.write(json.dumps(manifest, indent=2))
+
+
+def _load_manifest(output_file: Path, input_dir: Path) -> dict | None:
+    """Load the sidecar manifest if it exists, belongs to `input_dir` and matches the output file."""
+    try:
+        manifest = json.loads(manifest_path(output_file).read_text())
+        if manifest["input_dir"] != str(Path(input_dir).resolve()):
+            return None
+        if get_csv_header(Path(output_file)) != manifest["columns"]:
+            return None
+        return manifest
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _rebuild(input_dir: Path, output_file: Path, csv_paths: List[Path]) -> pd.DataFrame:
+    """Read all files, write the consolidated output and its manifest, and return the combined DataFrame."""
+    frames = _read_frames(csv_paths)
+    if not frames:
+        raise FileNotFoundError(f"Failed to read any CSVs from: {csv_paths!r}")
+
+    combined = ensure_columns(concat_frames(frames.values()), BASE_FIELDNAMES)
+    write_csv_atomic(combined, output_file)
+
+    files = {
+        path.relative_to(input_dir).as_posix(): {**_stat(path), "rows": len(df)} for path, df in frames.items()
+    }
+    _write_manifest(output_file, input_dir, list(combined.columns), files)
+    return combined
+
+
+def update_consolidated_metrics(input_dir: Path, output_file: Path) -> dict:
+    """
+    Bring 'output_file' up to date with the 'sims_*/metrics.csv' files under `input_dir`, reading as few files
+    as possible.
+
+    - Unchanged files (same size and mtime as in the manifest) are not read.
+    - Rows of new files are appended to the output file.
+    - Rows of modified or removed files are dropped from the output (located via the row counts in the manifest)
+      and the modified files' current rows are appended.
+    - Everything is rebuilt if the manifest is missing or inconsistent, or if the columns change.
+
+    Args:
+        input_dir: Base directory under which to glob for sims_*/metrics.csv
+        output_file: File path of the consolidated .csv file.
+
+    Returns:
+        dict: Lists of 'new', 'modified' and 'removed' files (relative to `input_dir`), the number of 'rows' in
+            the output, and whether a full rebuild happened ('rebuilt').
+
+    Raises:
+        FileNotFoundError: If no metrics.csv files can be read or found.
+        ValueError: If base fieldnames are missing or contain missing values.
+    """
+    input_dir, output_file = Path(input_dir), Path(output_file)
+    # Concurrent updates of the same output are serialized; readers see complete files (atomic rewrites)
+    with file_lock(output_file):
+        return _update(input_dir, output_file)
+
+
+def _update(input_dir: Path, output_file: Path) -> dict:
+    """Incremental update of `output_file`; see update_consolidated_metrics (called with its lock held)."""
+    csv_paths = gather_csv_files(data_sources="sims_*/metrics.csv", base_directory=input_dir)
+    if not csv_paths:
+        raise FileNotFoundError(f"No metrics.csv under {input_dir!r}")
+
+    current = {path.relative_to(input_dir).as_posix(): path for path in sorted(csv_paths)}
+    manifest = _load_manifest(output_file, input_dir) if output_file.is_file() else None
+    if manifest is None:
+        combined = _rebuild(input_dir, output_file, csv_paths)
+        return {"new": list(current), "modified": [], "removed": [], "rows": len(combined), "rebuilt": True}
+
+    # 1) Classify files against the manifest (stat only)
+    known = manifest["files"]
+    new = [name for name in current if name not in known]
+    removed = [name for name in known if name not in current]
+    modified = [
+        name for name in current
+        if name in known and {k: known[name][k] for k in ("size", "mtime_ns")} != _stat(current[name])
+    ]
+    summary = {"new": new, "modified": modified, "removed": removed, "rebuilt": False}
+    if not (new or modified or removed):
+        summary["rows"] = sum(entry["rows"] for entry in known.values())
+        return summary
+
+    # 2) Read only the new and modified files; a change of columns requires a full rebuild
+    frames = _read_frames([current[name] for name in new + modified])
+    columns = manifest["columns"]
+    extra = set().union(*(df.columns for df in frames.values())) - set(columns)
+    if extra:
+        print(f"Columns changed ({sorted(extra)}); rebuilding {output_file}")
+        combined = _rebuild(input_dir, output_file, csv_paths)
+        return {**summary, "rows": len(combined), "rebuilt": True}
+
+    files = {name: entry for name, entry in known.items() if name not in removed and name not in modified}
+    appended = [df.reindex(columns=columns) for df in frames.values()]
+
+    # 3) Drop the row blocks of modified/removed files, or append only
+    if modified or removed:
+        existing = pd.read_csv(output_file)
+        if len(existing) != sum(entry["rows"] for entry in known.values()):
+            combined = _rebuild(input_dir, output_file, csv_paths)
+            return {**summary, "rows": len(combined), "rebuilt": True}
+
+        keep, offset = [], 0
+        for name, entry in known.items():
+            if name in files:
+                keep.append(existing.iloc[offset:offset + entry["rows"]])
+            offset += entry["rows"]
+        write_csv_atomic(pd.concat(keep + appended, ignore_index=True), output_file)
+    elif appended:
+        append_csv_locked(pd.concat(appended, ignore_index=True), output_file, columns)
+
+    for path, df in frames.items():
+        files[path.relative_to(input_dir).as_posix()] = {**_stat(path), "rows": len(df)}
+    _write_manifest(output_file, input_dir, columns, files)
+
+    summary["rows"] = sum(entry["rows"] for entry in files.values())
+    return summary
+
+
+def consolidate_metrics(input_dir: Path, output_file: Path, *, incremental: bool = False) -> pd.DataFrame:
     """
     Consolidate 'metrics.csv' files (of the same task and method) across simulations into one DataFrame.
 
@@ -49,9 +223,12 @@ def consolidate_metrics(input_dir: Path, output_file: Path) -> pd.DataFrame:
     3. Validate and reorder columns.
     4. Write the resulting DataFrame to 'output_file' as a CSV file, then return it.
 
+    With `incremental=True`, only new or modified files are read (see update_consolidated_metrics).
+
     Args:
         input_dir: Base directory under which to glob for sims_*/metrics.csv
         output_file: File path where to write the consolidated .csv file.
+        incremental: Update an existing output file using its sidecar manifest instead of rebuilding it.
 
     Returns:
         The consolidated DataFrame.
@@ -60,44 +237,27 @@ def consolidate_metrics(input_dir: Path, output_file: Path) -> pd.DataFrame:
         FileNotFoundError: If no metrics.csv files can be read or found.
         ValueError: If base fieldnames are missing or contain missing values.
     """
-    # 1) Merge CSV files
-    # 1.1) Gather all 'metrics.csv' files from all simulation subfolders 'sim_*' at given input directory `input_dir`
+    input_dir, output_file = Path(input_dir), Path(output_file)
+    if incremental:
+        update_consolidated_metrics(input_dir, output_file)
+        return pd.read_csv(output_file)
+
+    # 1) Gather all 'metrics.csv' files from all simulation subfolders 'sim_*' at given input directory `input_dir`
     csv_paths = gather_csv_files(data_sources="sims_*/metrics.csv", base_directory=input_dir)
     if not csv_paths:
         raise FileNotFoundError(f"No metrics.csv under {input_dir!r}")
 
-    # 1.2) Read all .csv files
-    frames = read_csv_files(csv_paths)
-    if not frames:
-        raise FileNotFoundError(f"Failed to read any CSVs from: {csv_paths!r}")
-
-    # 1.3) Concatenate frames into one combined DataFrame
-    combined = pd.concat(frames, ignore_index=True)
-
-
-    # 2) Validate and reorder columns
-    base_fieldnames = [
-        "metric",
-        "value",
-        "task",
-        "method",
-        "num_simulations",
-        "observation_idx",
-    ]
-    combined = ensure_columns(combined, base_fieldnames)
-
-
-    # 3) Write out at given output directory 'output_file'
-    combined.to_csv(output_file, index=False)
-
-    return combined
+    # 2) Read, validate, concatenate and write out (also records the manifest for later incremental updates)
+    with file_lock(output_file):
+        return _rebuild(input_dir, output_file, csv_paths)
 
 
 def main():
     args = parse_args()
 
     try:
-        df = consolidate_metrics(input_dir=args.input_dir, output_file=args.output_file)
+        df = consolidate_metrics(input_dir=args.input_dir, output_file=args.output_file,
+                                 incremental=args.incremental)
     except (FileNotFoundError, ValueError) as e:
         print(e)
         sys.exit(1)
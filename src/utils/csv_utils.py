@@ -1,9 +1,29 @@
 import csv
 import glob
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable, List, Literal, Sequence, Tuple, Union
+from typing import Any, Dict, Iterable, List, Literal, Mapping, Optional, Sequence, Tuple, Union
 
 import pandas as pd
+from pandas.api.types import union_categoricals
+
+from src.utils.file_utils import atomic_write, locked
+
+
+# Explicit dtypes of the base fieldnames of all result files: low-cardinality strings as categoricals and
+# 32-bit integers, which avoids per-file type inference and shrinks the loaded frames severalfold
+BASE_SCHEMA = {
+    "metric": "category",
+    "value": "float64",
+    "task": "category",
+    "method": "category",
+    "num_simulations": "int32",
+    "observation_idx": "int32",
+}
+
+# Rows per chunk when filtered files are streamed, so that only matching rows are kept in memory
+FILTER_CHUNK_SIZE = 100_000
 
 
 def get_csv_header(path: Path) -> List[str]:
@@ -84,6 +104,41 @@ def resolve_file_mode(path: Path, file_mode: Literal["write", "append"]) -> Tupl
         raise ValueError(f"Unknown file_mode: {file_mode!r}")
 
 
+def write_csv_atomic(df: pd.DataFrame, path: Path, **to_csv_kwargs) -> Path:
+    """
+    Write a DataFrame as CSV via write-then-rename, so that concurrent readers never see a partial file.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to write.
+        path (Path): Target .csv file.
+        **to_csv_kwargs: Passed to DataFrame.to_csv (default: index=False).
+
+    Returns:
+        Path: The path written to.
+    """
+    to_csv_kwargs.setdefault("index", False)
+    with atomic_write(path, newline="") as f:
+        df.to_csv(f, **to_csv_kwargs)
+    return Path(path)
+
+
+def append_csv_locked(df: pd.DataFrame, path: Path, columns: Sequence[str]) -> None:
+    """
+    Append the rows of a DataFrame to a CSV file under an exclusive lock, in a single write.
+
+    The header is written if the file is empty (or new); concurrent appenders therefore never tear rows or
+    write a second header.
+
+    Args:
+        df (pd.DataFrame): Rows to append.
+        path (Path): Target .csv file.
+        columns (Sequence[str]): Column order of the file.
+    """
+    with Path(path).open("a", newline="") as f, locked(f):
+        empty = f.seek(0, os.SEEK_END) == 0  # checked under the lock: another writer may have just created it
+        f.write(df.reindex(columns=list(columns)).to_csv(index=False, header=empty))
+
+
 def gather_csv_files(
         data_sources: Union[str, Path, Iterable[Union[str, Path]]],
         base_directory: Path
@@ -130,10 +185,8 @@ def gather_csv_files(
 
         # 3) Glob pattern
         elif glob.has_magic(str(source_path)):
-            # Normalize glob pattern (turn relative patterns to absolute patterns)
-            pattern = str(source_path) if source_path.is_absolute() else str(base_directory / source_path)
-            # Gather all .csv files that match the glob pattern
-            for match_str in glob.glob(pattern, recursive=True):
+            # Gather all .csv files that match the glob pattern (already joined with base_directory if relative)
+            for match_str in glob.glob(str(source_path), recursive=True):
                 match_path = Path(match_str)
                 if match_path.is_file() and match_path.suffix.lower() == ".csv":
                     matched.add(match_path)
@@ -151,25 +204,183 @@ def gather_csv_files(
     return list(csv_paths)
 
 
-def read_csv_files(paths: List[Path]) -> list[pd.DataFrame]:
+def filter_mask(df: pd.DataFrame, filters: Mapping[str, Any]) -> pd.Series:
     """
-    Read each .csv file in `paths` into a pandas DataFrame, and return the list of DataFrames.
+    Return the boolean row mask of 'df' for the given column filters (all must match).
+
+    A filter value is either
+        - a scalar: the column equals the value, e.g. {"metric": "c2st"},
+        - a list or set: the column is one of the values, e.g. {"method": ["NPE", "NLE"]},
+        - a tuple (low, high): the column lies in the closed range; None leaves a side open, e.g. {"tau_m": (0.5, None)}.
+    Filters on columns that 'df' doesn't have match no rows.
+    """
+    mask = pd.Series(True, index=df.index)
+    for column, condition in filters.items():
+        if column not in df.columns:
+            return pd.Series(False, index=df.index)
+        values = df[column]
+        if isinstance(condition, tuple):
+            low, high = condition
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+        elif isinstance(condition, (list, set, frozenset)):
+            mask &= values.isin(list(condition))
+        else:
+            mask &= values == condition
+    return mask
+
+
+def _read_csv(
+        path: Path,
+        schema: Optional[Mapping[str, str]],
+        engine: Optional[str],
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Mapping[str, Any]] = None,
+) -> pd.DataFrame:
+    """
+    Read one .csv file with the given schema; fall back to type inference if the file doesn't fit it.
+
+    Only the projected `columns` (plus the filtered ones) are parsed; with `filters` the file is streamed in chunks
+    and only matching rows are kept.
+    """
+    kwargs = {} if engine is None else {"engine": engine}
+    if columns is not None:
+        wanted = set(columns) | set(filters or ())
+        kwargs["usecols"] = lambda column: column in wanted  # tolerate columns a file doesn't have
+
+    def read(**dtype):
+        if not filters:
+            return pd.read_csv(path, **dtype, **kwargs)
+        with pd.read_csv(path, chunksize=FILTER_CHUNK_SIZE, **dtype, **kwargs) as reader:
+            chunks = [chunk[filter_mask(chunk, filters)] for chunk in reader]
+        if not chunks:  # header-only file
+            return pd.read_csv(path, nrows=0, **dtype, **kwargs)
+        return concat_frames(chunks) if len(chunks) > 1 else chunks[0]
+
+    if schema:
+        try:
+            df = read(dtype=dict(schema))
+        except (ValueError, TypeError):
+            df = None  # e.g. missing values in an integer column; validated later by ensure_columns
+    if not schema or df is None:
+        df = read()
+
+    if columns is not None:
+        df = df[[column for column in columns if column in df.columns]]  # drop columns only read for filtering
+    return df
+
+
+def read_csv_files_by_path(
+        paths: Iterable[Path],
+        *,
+        schema: Optional[Mapping[str, str]] = BASE_SCHEMA,
+        max_workers: Optional[int] = None,
+        engine: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Mapping[str, Any]] = None,
+) -> Dict[Path, pd.DataFrame]:
+    """
+    Read .csv files in parallel on a thread pool and return them keyed by path (in sorted path order).
 
     Args:
-        paths (List[Path]): List of absolute .csv file paths.
+        paths (Iterable[Path]): .csv file paths.
+        schema (Mapping[str, str], optional): dtypes of known columns (default: BASE_SCHEMA); columns missing from
+            a file are ignored, other columns are inferred. None infers all columns.
+        max_workers (int, optional): Number of reader threads; defaults to min(32, cpu_count + 4).
+        engine (str, optional): pandas parser engine, e.g. "pyarrow" if installed; defaults to pandas' C parser.
+        columns (Sequence[str], optional): Column projection: only these columns are parsed (missing ones are
+            skipped). None reads all columns.
+        filters (Mapping[str, Any], optional): Row filters applied while reading (see filter_mask); files are
+            streamed in chunks of FILTER_CHUNK_SIZE rows, so non-matching rows are never kept.
 
     Returns:
-        List[pd.DataFrame]: A list of DataFrames for each CSV successfully read.
-            If reading a file fails, that file is skipped; the returned list may be empty.
+        Dict[Path, pd.DataFrame]: The DataFrame of each file that was read successfully.
     """
-    frames: list[pd.DataFrame] = []
-    for path in sorted(paths):
+    paths = sorted(paths)
+    if not paths:
+        return {}
+
+    def read(path):
         try:
-            df = pd.read_csv(path)
-            frames.append(df)
+            return path, _read_csv(path, schema, engine, columns, filters)
         except Exception as e:
             print(f"Failed to read {path!r}: {e}")
-    return frames
+            return path, None
+
+    workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+    if workers == 1 or len(paths) == 1:
+        results = map(read, paths)
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+            results = list(pool.map(read, paths))
+    return {path: df for path, df in results if df is not None}
+
+
+def read_csv_files(
+        paths: List[Path],
+        *,
+        schema: Optional[Mapping[str, str]] = BASE_SCHEMA,
+        max_workers: Optional[int] = None,
+        engine: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Mapping[str, Any]] = None,
+) -> list[pd.DataFrame]:
+    """
+    Read each .csv file in `paths` into a pandas DataFrame, and return the list of DataFrames.
+
+    The files are read in parallel with explicit dtypes for the base fieldnames (see read_csv_files_by_path).
+
+    Args:
+        paths (List[Path]): List of absolute .csv file paths.
+        schema (Mapping[str, str], optional): dtypes of known columns; None infers all columns.
+        max_workers (int, optional): Number of reader threads.
+        engine (str, optional): pandas parser engine.
+        columns (Sequence[str], optional): Column projection; None reads all columns.
+        filters (Mapping[str, Any], optional): Row filters applied while reading (see filter_mask).
+
+    Returns:
+        List[pd.DataFrame]: A list of DataFrames for each CSV successfully read, in sorted path order.
+            If reading a file fails, that file is skipped; the returned list may be empty.
+    """
+    return list(read_csv_files_by_path(paths, schema=schema, max_workers=max_workers, engine=engine,
+                                       columns=columns, filters=filters).values())
+
+
+def concat_frames(frames: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate DataFrames like pd.concat(..., ignore_index=True), but keep categorical columns categorical.
+
+    pd.concat turns categoricals with different categories (e.g. one method per file) into object columns;
+    here the categories are unioned up front, so the result is built from the integer codes directly and no
+    intermediate object column is materialized.
+    """
+    frames = list(frames)
+    for column in {column for df in frames for column in df.columns}:
+        parts = [df[column] for df in frames if column in df.columns]
+        if (len(parts) < len(frames) or len(parts) < 2
+                or not all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts)):
+            continue
+        categories = union_categoricals(parts, ignore_order=True).categories
+        if not all(part.cat.categories.equals(categories) for part in parts):
+            frames = [df.assign(**{column: df[column].cat.set_categories(categories)}) for df in frames]
+    return pd.concat(frames, ignore_index=True)
+
+
+def as_categorical(df: pd.DataFrame, columns: Iterable[str]) -> pd.DataFrame:
+    """
+    Convert string columns of 'df' to categoricals in place (columns that are missing or already categorical
+    are left untouched) and return 'df'.
+
+    Low-cardinality labels (metric, task, method) take one small integer code per row instead of one Python
+    string, which shrinks large result frames severalfold.
+    """
+    for column in columns:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype) \
+                and not pd.api.types.is_numeric_dtype(df[column].dtype):
+            df[column] = df[column].astype("category")
+    return df
 
 
 def ensure_columns(
@@ -183,7 +394,10 @@ def ensure_columns(
 
     Ensure all 'required_columns' exist in 'df' and do not contain missing values.
     Optionally sort any extra columns beyond the 'required_columns'.
-    Return a new DataFrame with columns ordered as: [*required_columns, *extra_columns].
+    Return a DataFrame with columns ordered as: [*required_columns, *extra_columns].
+
+    No data is copied: if the columns are already in order (e.g. files written by save_results), 'df' itself is
+    returned; otherwise a DataFrame that shares the column data of 'df' (treat both as read-only).
 
     Args:
         df (pd.DataFrame): The DataFrame to validate and reorder.
@@ -191,7 +405,7 @@ def ensure_columns(
         sort_extra (bool): If True, any extra columns (beyond the 'required_columns') will be sorted lexicographically.
 
     Returns:
-        pd.DataFrame: A new DataFrame with the validated and reordered columns.
+        pd.DataFrame: The DataFrame with the validated and reordered columns.
 
     Raises:
         ValueError: If any 'required_columns' are missing or contain missing values.
@@ -201,8 +415,8 @@ def ensure_columns(
     if missing_cols:
         raise ValueError(f"Missing required columns: {missing_cols}")
 
-    # Ensure no required column has missing values (NaNs)
-    missing_value_cols = [col for col in required_columns if df[col].isnull().any()]
+    # Ensure no required column has missing values (NaNs); hasnans is cached and avoids a boolean mask per column
+    missing_value_cols = [col for col in required_columns if df[col].hasnans]
     if missing_value_cols:
         raise ValueError(f"Required columns contain missing values: {missing_value_cols}")
 
@@ -211,8 +425,8 @@ def ensure_columns(
     if sort_extra:
         extra_columns.sort()
 
-    # Build column order and reindex the df to match it
+    # Build column order; only reorder if needed, without copying the column data
     column_order = list(required_columns) + extra_columns
-    ordered_df = df.reindex(columns=column_order)
-
-    return ordered_df
+    if list(df.columns) == column_order:
+        return df
+    return pd.DataFrame({col: df[col] for col in column_order}, index=df.index, copy=False)
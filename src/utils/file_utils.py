@@ -1,5 +1,18 @@
+import os
+import tempfile
+from contextlib import contextmanager
 from itertools import count
 from pathlib import Path
+from typing import IO, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; locking becomes a no-op there
+    fcntl = None
+
+# Process umask, read once at import (os.umask can only be read by setting it, which is not thread-safe)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
 
 
 def ensure_directory(directory: Path | str) -> None:
@@ -72,3 +85,87 @@ def create_unique_path(
     directory_path = Path(directory)
     ensure_directory(directory_path)
     return unique_path(directory_path / f"{stem}{extension}", sep=sep)
+
+
+@contextmanager
+def locked(file: IO) -> Iterator[IO]:
+    """
+    Hold an exclusive advisory lock (fcntl.flock) on an open file while the block runs.
+
+    Writers that lock the file before writing never interleave their writes; on platforms without fcntl the
+    lock is a no-op.
+
+    Args:
+        file (IO): An open file object.
+    """
+    if fcntl is None:
+        yield file
+        return
+    fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+    try:
+        yield file
+    finally:
+        file.flush()
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def file_lock(path: Path | str) -> Iterator[None]:
+    """
+    Hold an exclusive advisory lock on the sidecar '<path>.lock' file, e.g. around a read-modify-write of `path`.
+
+    Args:
+        path (Path | str): The file to protect (the lock file is created next to it).
+    """
+    path = Path(path)
+    ensure_directory(path.parent)
+    with path.with_name(path.name + ".lock").open("a") as lock_file, locked(lock_file):
+        yield
+
+
+def apply_target_mode(tmp_path: Path | str, target: Path | str) -> None:
+    """
+    Give a temporary file the permissions it would have if it had been written in place as `target`.
+
+    tempfile.mkstemp creates files with mode 0600, which os.replace keeps. Call this before replacing `target`:
+    the temporary file gets the mode of the existing target, or 0666 minus the umask for a new file.
+
+    Args:
+        tmp_path (Path | str): The temporary file.
+        target (Path | str): The file it will replace.
+    """
+    try:
+        mode = os.stat(target).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    os.chmod(tmp_path, mode)
+
+
+@contextmanager
+def atomic_write(path: Path | str, mode: str = "w", *, newline: Optional[str] = None) -> Iterator[IO]:
+    """
+    Write a file atomically: the content goes to a temporary file in the same directory, which replaces `path`
+    (os.replace) only once it was written completely. Readers see either the old or the new file, never a
+    partial one; if the block raises, `path` is left unchanged.
+
+    Args:
+        path (Path | str): Target file; parent directories are created.
+        mode (str): "w" for text or "wb" for binary content.
+        newline (str, optional): Passed to open() in text mode (e.g. "" for the csv module).
+
+    Yields:
+        IO: The open temporary file to write to.
+    """
+    path = Path(path)
+    ensure_directory(path.parent)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, mode, **({} if "b" in mode else {"newline": newline})) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        apply_target_mode(tmp_name, path)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
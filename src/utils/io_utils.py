@@ -1,24 +1,43 @@
 import os
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Mapping, Optional, Union
+
+import numpy as np
 import torch
+
+from src.utils.artifact_store import ArtifactStore
+from src.utils.file_utils import atomic_write
+
 #utils for i/o that are needed for evaluate_inference
+# Tensors are kept in the content-addressed artifact store (outputs/.artifacts) under logical names
+
+# uses the given store, or opens the default store for one call and closes its index connection afterwards
+def _open_store(store=None):
+    return nullcontext(store) if store is not None else ArtifactStore()
 
 # saves posterior samples as torch tensor
-# in a standardized path
-def save_samples(tensor, task_name, method_name):
-    path = f"outputs/{task_name}/{method_name}/posterior_samples.pt"
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    torch.save(tensor, path)
+# under the logical name posterior_samples/<task_name>/<method_name>
+def save_samples(tensor, task_name, method_name, store=None):
+    with _open_store(store) as store:
+        return store.put_tensor(tensor, name=f"posterior_samples/{task_name}/{method_name}",
+                                kind="posterior_samples", task=task_name, method=method_name)
 
 # saves reference posterior samples as torch tensor
-# in a standardized path
-def save_reference_samples(tensor, task_name, seed):
-    path = f"outputs/{task_name}/reference/ref_posterior_seed{seed}.pt"
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    torch.save(tensor, path)
+# under the logical name reference_samples/<task_name>/seed_<seed>
+def save_reference_samples(tensor, task_name, seed, store=None):
+    with _open_store(store) as store:
+        return store.put_tensor(tensor, name=f"reference_samples/{task_name}/seed_{seed}",
+                                kind="reference_samples", task=task_name, seed=seed)
 
 # loads a tensor to be used for evaluation.py
-def load_tensor(task_name, method_name, name):
-    return torch.load(f"outputs/{task_name}/{method_name}/{name}.pt")
+# (the newest artifact of kind `name`, e.g. "posterior_samples", for the task and method)
+def load_tensor(task_name, method_name, name, store=None):
+    with _open_store(store) as store:
+        entries = store.lookup(kind=name, task=task_name, method=method_name)
+        if not entries:
+            raise FileNotFoundError(f"No {name} artifact for task {task_name!r} and method {method_name!r}")
+        return store.load(entries[0]["digest"])
 
 # saves a panda dataframe as CSV file
 def save_file(task_name, method_name, file_name, dataframe):
@@ -26,3 +45,136 @@ def save_file(task_name, method_name, file_name, dataframe):
     os.makedirs(os.path.dirname(path), exist_ok=True)
     dataframe.to_csv(path, index=False)
 
+
+# Sample storage backend
+#
+# Samples (e.g. posterior_samples) are stored in one of the formats
+#   - "pt":  pickled torch tensor (torch.save), the default,
+#   - "npy": raw numpy array, which can be memory-mapped on load (zero-copy),
+#   - "npz": compressed numpy archive (smallest, but read fully on load),
+# optionally downcast to float16 or bfloat16. numpy has no bfloat16, so bfloat16 samples are stored as their raw
+# 16-bit patterns with the suffix '.bf16.npy'/'.bf16.npz'. load_samples() reads every variant.
+SAMPLE_FORMATS = ("pt", "npy", "npz")
+SAMPLE_DTYPES = {"float32": torch.float32, "float16": torch.float16, "bfloat16": torch.bfloat16}
+
+# Suffixes probed by find_samples(), in order of preference
+_SAMPLE_SUFFIXES = (".npy", ".bf16.npy", ".npz", ".bf16.npz", ".pt")
+
+
+def sample_filename(stem: str, *, format: str = "pt", dtype: str = "float32", compress: bool = False) -> str:
+    """
+    Return the filename under which samples are stored with the given storage options.
+
+    Args:
+        stem (str): File stem, e.g. "posterior_samples".
+        format (str): "pt" or "npy"; with `compress=True` numpy formats become "npz".
+        dtype (str): "float32", "float16" or "bfloat16".
+        compress (bool): Store a compressed numpy archive.
+
+    Raises:
+        ValueError: If the format or dtype is unknown.
+    """
+    if format not in SAMPLE_FORMATS:
+        raise ValueError(f"Unknown sample format: {format!r}. Available: {list(SAMPLE_FORMATS)}")
+    if dtype not in SAMPLE_DTYPES:
+        raise ValueError(f"Unknown sample dtype: {dtype!r}. Available: {list(SAMPLE_DTYPES)}")
+
+    if format == "pt" and not compress:
+        return f"{stem}.pt"
+    extension = "npz" if compress or format == "npz" else "npy"
+    return f"{stem}.bf16.{extension}" if dtype == "bfloat16" else f"{stem}.{extension}"
+
+
+def save_samples_to(
+        tensor: torch.Tensor,
+        directory: Union[str, Path],
+        stem: str = "posterior_samples",
+        *,
+        format: str = "pt",
+        dtype: str = "float32",
+        compress: bool = False,
+) -> Path:
+    """
+    Save samples to `directory` with the given storage options and remove stored variants in other formats.
+
+    Args:
+        tensor (torch.Tensor): Samples to store.
+        directory (str | Path): Target folder (created if missing).
+        stem (str): File stem, e.g. "posterior_samples".
+        format (str): "pt" (torch.save) or "npy" (memory-mappable); see sample_filename.
+        dtype (str): Storage dtype: "float32", "float16" or "bfloat16".
+        compress (bool): Store a compressed numpy archive (.npz).
+
+    Returns:
+        Path: The written file.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / sample_filename(stem, format=format, dtype=dtype, compress=compress)
+
+    tensor = tensor.detach().cpu().to(SAMPLE_DTYPES[dtype]).contiguous()
+    # Write-then-rename: never truncate an existing file in place, which may be a hard link into the artifact store
+    with atomic_write(path, "wb") as f:
+        if path.suffix == ".pt":
+            torch.save(tensor, f)
+        else:
+            array = tensor.view(torch.int16).numpy().view(np.uint16) if dtype == "bfloat16" else tensor.numpy()
+            if path.suffix == ".npz":
+                np.savez_compressed(f, samples=array)
+            else:
+                np.save(f, array)
+
+    # A stale file of another format would otherwise shadow or be confused with the new one
+    for suffix in _SAMPLE_SUFFIXES:
+        stale = directory / f"{stem}{suffix}"
+        if stale != path and stale.exists():
+            stale.unlink()
+    return path
+
+
+def find_samples(directory: Union[str, Path], stem: str = "posterior_samples") -> Optional[Path]:
+    """Return the stored samples file `stem` in `directory` in any supported format, or None."""
+    for suffix in _SAMPLE_SUFFIXES:
+        path = Path(directory) / f"{stem}{suffix}"
+        if path.is_file():
+            return path
+    return None
+
+
+def load_samples(path: Union[str, Path], *, mmap: bool = True) -> torch.Tensor:
+    """
+    Load samples stored by save_samples_to (or torch.save) as a CPU tensor in their stored dtype.
+
+    '.npy' files are memory-mapped (copy-on-write) by default, so the returned tensor shares memory with the
+    page cache instead of being unpickled; convert with `.float()` where float32 is needed (a no-op for float32).
+
+    Args:
+        path (str | Path): The samples file.
+        mmap (bool): Memory-map '.npy' files instead of reading them.
+
+    Returns:
+        torch.Tensor: The samples.
+    """
+    path = Path(path)
+    if path.suffix == ".pt":
+        return torch.load(path, map_location="cpu", weights_only=True)
+
+    if path.suffix == ".npz":
+        with np.load(path) as archive:
+            array = archive["samples"]
+    else:
+        array = np.load(path, mmap_mode="c" if mmap else None)
+
+    if path.name.endswith((".bf16.npy", ".bf16.npz")):
+        return torch.from_numpy(array.view(np.int16)).view(torch.bfloat16)
+    return torch.from_numpy(array)
+
+
+def storage_options(config: Optional[Mapping]) -> dict:
+    """Return the keyword arguments of save_samples_to from a `storage` config node (defaults if None)."""
+    config = config or {}
+    return {
+        "format": str(config.get("format", "pt")),
+        "dtype": str(config.get("dtype", "float32")),
+        "compress": bool(config.get("compress", False)),
+    }
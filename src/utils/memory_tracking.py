@@ -0,0 +1,274 @@
+"""
+Peak-memory tracking per pipeline stage.
+
+A MemoryTracker is activated around a run (e.g. in run_benchmark); pipeline code marks its stages with
+`track_stage(...)`, which is a no-op while no tracker is active:
+
+    >>> with MemoryTracker(ceiling_mb=8000) as tracker:
+    ...     with track_stage("simulation", estimated_bytes=theta.nbytes):
+    ...         x = simulator(theta)
+    >>> tracker.save("outputs/<Task>_<Method>/sims_<N>/memory.csv")
+
+For every stage the tracker records
+    - seconds: total wall-clock time spent in the stage,
+    - peak_rss_mb: peak resident set size of the process during the stage (Linux: VmHWM, reset per stage;
+      elsewhere the lifetime maximum from `resource`),
+    - python_peak_mb: peak of Python-level allocations (`tracemalloc`; opt-in via `track_python`, since tracing
+      every allocation slows the whole run down),
+    - torch_peak_mb: peak CUDA memory allocated by torch (CUDA only),
+    - largest_tensor_mb/op/shape: the largest tensor produced by a torch operation (opt-in via `track_tensors`,
+      recorded by a torch dispatch mode, which slows the stage down).
+A stage that runs several times (e.g. sampling per observation) keeps the maximum over all runs.
+"""
+
+import csv
+import heapq
+import sys
+import time
+import tracemalloc
+import warnings
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+import torch
+
+from src.utils.file_utils import atomic_write
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+try:
+    from torch.utils._python_dispatch import TorchDispatchMode
+    from torch.utils._pytree import tree_flatten
+except ImportError:  # torch builds without python dispatch support
+    TorchDispatchMode = None
+
+
+_MB = 1024 ** 2
+
+_active_tracker: ContextVar[Optional["MemoryTracker"]] = ContextVar("memory_tracker", default=None)
+
+
+def _reset_peak_rss() -> None:
+    """Reset the kernel's RSS high-water mark of this process (Linux only, best effort)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    """Return the peak resident set size since the last reset (Linux) or since process start."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024  # bytes on macOS, kilobytes elsewhere
+
+
+def _current_rss_bytes() -> Optional[int]:
+    """Return the current resident set size of this process, if available."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+if TorchDispatchMode is not None:
+    class _TensorAllocationRecorder(TorchDispatchMode):
+        """Torch dispatch mode that keeps the `top_k` largest tensors created by torch operations."""
+
+        def __init__(self, top_k: int = 3):
+            super().__init__()
+            self.top_k = top_k
+            self.largest: List[tuple] = []  # min-heap of (nbytes, op name, shape)
+
+        def __torch_dispatch__(self, func, types, args=(), kwargs=None):
+            out = func(*args, **(kwargs or {}))
+            for t in tree_flatten(out)[0]:
+                if isinstance(t, torch.Tensor) and not t._is_view():
+                    entry = (t.element_size() * t.nelement(), str(func), tuple(t.shape))
+                    if len(self.largest) < self.top_k:
+                        heapq.heappush(self.largest, entry)
+                    elif entry[0] > self.largest[0][0]:
+                        heapq.heapreplace(self.largest, entry)
+            return out
+
+
+class MemoryTracker:
+    """
+    Records peak memory usage per pipeline stage and warns when a memory ceiling is (about to be) exceeded.
+
+    Args:
+        ceiling_mb (float, optional): Memory ceiling in MB. A warning is issued if a stage's estimated allocation
+            would push the process above it, or if the stage's peak RSS exceeded it.
+        track_python (bool): Trace Python allocations with tracemalloc for python_peak_mb (slower).
+        track_tensors (bool): Record the largest tensor allocations per stage (slower).
+
+    Attributes:
+        stages (dict[str, dict]): Measurements per stage name, in order of first execution.
+    """
+    FIELDNAMES = [
+        "stage",
+        "calls",
+        "seconds",
+        "peak_rss_mb",
+        "python_peak_mb",
+        "torch_peak_mb",
+        "largest_tensor_mb",
+        "largest_tensor_op",
+        "largest_tensor_shape",
+    ]
+
+    def __init__(self, *, ceiling_mb: Optional[float] = None, track_python: bool = False, track_tensors: bool = False):
+        self.ceiling_mb = ceiling_mb
+        self.track_python = track_python
+        self.track_tensors = track_tensors and TorchDispatchMode is not None
+        self.stages: Dict[str, dict] = {}
+        self._token = None
+        self._started_tracemalloc = False
+
+
+    def __enter__(self) -> "MemoryTracker":
+        if self.track_python and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._token = _active_tracker.set(self)
+        return self
+
+
+    def __exit__(self, *exc_info) -> None:
+        _active_tracker.reset(self._token)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+
+    def check_ceiling(self, stage: str, estimated_bytes: int) -> None:
+        """Warn if allocating `estimated_bytes` on top of the current RSS would exceed the ceiling."""
+        if self.ceiling_mb is None:
+            return
+        current = _current_rss_bytes() or 0
+        projected_mb = (current + estimated_bytes) / _MB
+        if projected_mb > self.ceiling_mb:
+            warnings.warn(
+                f"Stage '{stage}' is estimated to need {estimated_bytes / _MB:.1f} MB, which would raise memory "
+                f"usage to {projected_mb:.1f} MB above the ceiling of {self.ceiling_mb:.1f} MB."
+            )
+
+
+    @contextmanager
+    def stage(self, name: str, *, estimated_bytes: Optional[int] = None) -> Iterator[None]:
+        """Measure the peak memory of the enclosed code as stage `name`."""
+        if estimated_bytes is not None:
+            self.check_ceiling(name, estimated_bytes)
+
+        _reset_peak_rss()
+        tracing = self.track_python and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        cuda = torch.cuda.is_available()
+        if cuda:
+            torch.cuda.reset_peak_memory_stats()
+
+        recorder = _TensorAllocationRecorder() if self.track_tensors else None
+        start = time.perf_counter()
+        try:
+            if recorder is not None:
+                with recorder:
+                    yield
+            else:
+                yield
+        finally:
+            peak_rss = _peak_rss_bytes()
+            measurement = {
+                "seconds": time.perf_counter() - start,
+                "peak_rss_mb": None if peak_rss is None else peak_rss / _MB,
+                "python_peak_mb": tracemalloc.get_traced_memory()[1] / _MB if tracing else None,
+                "torch_peak_mb": torch.cuda.max_memory_allocated() / _MB if cuda else None,
+            }
+            if recorder is not None and recorder.largest:
+                nbytes, op, shape = max(recorder.largest)
+                measurement.update({
+                    "largest_tensor_mb": nbytes / _MB,
+                    "largest_tensor_op": op,
+                    "largest_tensor_shape": "x".join(map(str, shape)),
+                })
+            self._update(name, measurement)
+
+
+    def _update(self, name: str, measurement: dict) -> None:
+        """Merge a measurement into the stage record, summing the time and keeping the maximum of each other value."""
+        record = self.stages.setdefault(name, {"stage": name, "calls": 0, "seconds": 0.0})
+        record["calls"] += 1
+        for key, value in measurement.items():
+            if value is None:
+                continue
+            if key == "seconds":
+                record[key] += value
+            elif key.startswith("largest_tensor_"):
+                if measurement.get("largest_tensor_mb", 0) >= record.get("largest_tensor_mb", 0):
+                    record[key] = value
+            else:
+                record[key] = max(value, record.get(key, value))
+
+        peak = record.get("peak_rss_mb")
+        if self.ceiling_mb is not None and peak is not None and peak > self.ceiling_mb:
+            warnings.warn(
+                f"Stage '{name}' reached a peak RSS of {peak:.1f} MB, above the ceiling of {self.ceiling_mb:.1f} MB."
+            )
+
+
+    def to_rows(self) -> List[dict]:
+        """Return one row per stage with all FIELDNAMES (missing values are None)."""
+        return [{field: record.get(field) for field in self.FIELDNAMES} for record in self.stages.values()]
+
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """
+        Write the per-stage measurements as CSV (atomically: readers see the old or the complete new file).
+
+        Args:
+            path (str | Path): Target file (e.g. the run folder's 'memory.csv').
+
+        Returns:
+            Path: The path written to.
+        """
+        path = Path(path)
+        with atomic_write(path, newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=self.FIELDNAMES)
+            writer.writeheader()
+            writer.writerows(self.to_rows())
+        return path
+
+
+@contextmanager
+def track_stage(name: str, *, estimated_bytes: Optional[int] = None) -> Iterator[None]:
+    """
+    Measure the enclosed code as stage `name` of the active MemoryTracker; does nothing if none is active.
+
+    Args:
+        name (str): Stage name (e.g. "simulation", "training", "sampling").
+        estimated_bytes (int, optional): Expected allocation of the stage, checked against the memory ceiling.
+    """
+    tracker = _active_tracker.get()
+    if tracker is None:
+        yield
+        return
+    with tracker.stage(name, estimated_bytes=estimated_bytes):
+        yield
@@ -1,5 +1,8 @@
 import argparse
 from pathlib import Path
+from typing import List, Optional, Sequence
+
+import pandas as pd
 
 from src.utils.LinePlot import LinePlot
 
@@ -16,24 +19,61 @@ def parse_args():
     parser.add_argument(
         "--metric",
         type=str,
-        help="Name of the metric to plot (e.g. c2st, ppc)."
+        nargs="+",
+        help="Name(s) of the metric(s) to plot (e.g. c2st, ppc)."
     )
     parser.add_argument(
         "--task_param",
         type=str,
-        help="Task parameter column to use for the x-axis (e.g. tau_m, lambda_val)."
+        nargs="+",
+        help="Task parameter column(s) to use for the x-axis (e.g. tau_m, lambda_val)."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of processes rendering the metric/parameter combinations in parallel (default: cpu count)."
     )
     return parser.parse_args()
 
 
+class MetricVsTaskParamPlot(LinePlot):
+    """
+    LinePlot of one metric against a task parameter, saved to outputs/{task}_{method}/plots/{metric}__vs__{param}.png
+    where `{task}` and `{method}` are inferred from the data.
+
+    Args:
+        data_sources (str | Path): Path to the metrics CSV file (e.g. "metrics_all.csv").
+        metric (str): Name of the metric to plot.
+        task_param (str): Column name of the task parameter to use for the x-axis.
+    """
+    def __init__(self, data_sources, *, metric: str, task_param: str):
+        # Only the rows of the metric and the plotted columns are read
+        super().__init__(data_sources=data_sources, x=task_param, log_x=False,
+                         filename=f"{metric}__vs__{task_param}.png",
+                         filters={"metric": metric}, columns=["metric", "value", "task", "method", task_param])
+        self.metric = metric
+
+
+    def load_data(self, **kwargs) -> pd.DataFrame:
+        """Load the rows of the metric and derive the save directory from their task and method."""
+        df = super().load_data(**kwargs)
+
+        # Build save dir from the filtered data
+        task = df["task"].unique().item()
+        method = df["method"].unique().item()
+        self.save_directory = Path(f"outputs/{task}_{method}/plots").resolve()
+        return df
+
+
 def plot_metric_vs_taskparam(input_path: str, metric: str, task_param: str) -> None:
     """
     Generate and save a line plot of a chosen evaluation metric
     against a given task parameter from a metrics CSV file.
 
     The function:
-      - Loads benchmark results from `input_path` (metrics_all.csv format).
-      - Filters the data for the specified `metric`.
+      - Loads the rows of the specified `metric` from `input_path` (metrics_all.csv format); the filter and the
+        needed columns are pushed down into the CSV reader.
       - Creates a line plot with `task_param` on the x-axis and the metric values on the y-axis.
       - Saves the plot to `outputs/{task}_{method}/plots/{metric}_vs_{task_param}.png`,
         where `{task}` and `{method}` are inferred from the data.
@@ -48,37 +88,39 @@ def plot_metric_vs_taskparam(input_path: str, metric: str, task_param: str) -> N
         None: The plot is saved to disk.
     """
 
-    # Initialize the LinePlot Instance
-    plotter = LinePlot(data_sources=input_path, x=task_param, log_x=False, filename=f"{metric}__vs__{task_param}.png")
-
-    # Load the data
-    df = plotter.load_data()
-
-    # Extract rows that match the metric
-    df_filtered = df[df["metric"] == metric]
-
-    # Create the plot and get the Figure
-    fig, _ = plotter.plot(df_filtered)
-
-    # Build save dir and filename from the filtered data
-    task = df_filtered["task"].unique().item()
-    method = df_filtered["method"].unique().item()
+    MetricVsTaskParamPlot(input_path, metric=metric, task_param=task_param).run()
 
-    plotter.save_directory = Path(f"outputs/{task}_{method}/plots").resolve()
 
+def plot_metrics_vs_taskparams(
+        input_path: str,
+        metrics: Sequence[str],
+        task_params: Sequence[str],
+        *,
+        max_workers: Optional[int] = None,
+) -> List[Optional[Path]]:
+    """
+    Plot every combination of `metrics` and `task_params` (see plot_metric_vs_taskparam), rendered in parallel.
 
-    # Save the figure
-    plotter.save(fig)
-
+    Returns:
+        List[Optional[Path]]: The save path of each combination (None if it failed).
+    """
+    specs = [
+        {"plot_class": MetricVsTaskParamPlot, "data_sources": input_path, "metric": metric, "task_param": task_param}
+        for metric in metrics for task_param in task_params
+    ]
+    return LinePlot.render_batch(specs, max_workers=max_workers)
 
 
 def main():
     args = parse_args()
-    plot_metric_vs_taskparam(
-        input_path=args.input_path,
-        metric=args.metric,
-        task_param=args.task_param,
-    )
+    if len(args.metric) == 1 and len(args.task_param) == 1:
+        plot_metric_vs_taskparam(
+            input_path=args.input_path,
+            metric=args.metric[0],
+            task_param=args.task_param[0],
+        )
+    else:
+        plot_metrics_vs_taskparams(args.input_path, args.metric, args.task_param, max_workers=args.workers)
 
 
 if __name__ == "__main__":
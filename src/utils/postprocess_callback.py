@@ -1,21 +1,83 @@
+import json
 from pathlib import Path
+from typing import Dict, Union
+
 import pandas as pd
 
 from hydra.experimental.callback import Callback
 from omegaconf import OmegaConf
 
 from src.utils.LinePlot import LinePlot
-from src.utils.consolidate_metrics import consolidate_metrics
-from src.tasks.misspecified_tasks import LikelihoodMisspecifiedTask
+from src.utils.consolidate_metrics import update_consolidated_metrics
+from src.utils.file_utils import atomic_write
+from src.tasks.registry import task_registry
+
 
-# Task registry to hold all available task classes
-task_registry = {
-    "misspecified_likelihood": LikelihoodMisspecifiedTask,
-}
+def _file_signature(path: Path) -> Dict[str, int]:
+    """Return the cheap change signature (size and mtime) of a file."""
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
 
 
 class PostProcessCallback(Callback):
+    """
+    Consolidates and plots the results of a multirun incrementally.
+
+    On each multirun
+    - job configs are only re-read if they changed (their parsed parameters are cached in a state file,
+      default: outputs/.postprocess_state.json),
+    - each task/method group's metrics_all.csv is updated incrementally: only new or modified metrics.csv files
+      are read, using the sidecar manifest of consolidate_metrics,
+    - plots are only re-rendered for task/method groups whose data changed.
+
+    Args:
+        state_file (str | Path): Location of the state file.
+    """
+    def __init__(self, state_file: Union[str, Path] = Path("outputs") / ".postprocess_state.json"):
+        self.state_file = Path(state_file)
+
+
+    def _load_state(self) -> dict:
+        """Load the state of previous post-processing runs (empty if missing or unreadable)."""
+        try:
+            state = json.loads(self.state_file.read_text())
+        except (OSError, json.JSONDecodeError):
+            return {"jobs": {}}
+        state.setdefault("jobs", {})
+        return state
+
+
+    def _save_state(self, state: dict) -> None:
+        """Persist the post-processing state."""
+        with atomic_write(self.state_file) as f:
+            f.write(json.dumps(state, indent=2, sort_keys=True))
+
+
+    @staticmethod
+    def _job_record(cfg_path: Path, state: dict) -> dict:
+        """Return task class name, method and num_simulations of a job, re-reading its config only if it changed."""
+        signature = _file_signature(cfg_path)
+        cached = state["jobs"].get(str(cfg_path))
+        if cached is not None and cached["signature"] == signature:
+            return cached["record"]
+
+        cfg = OmegaConf.load(cfg_path)
+        task_name = cfg.task.name
+        if task_name not in task_registry:
+            raise ValueError(f"Unknown task: {task_name}. Available: {list(task_registry.keys())}")
+
+        record = {
+            "task": task_registry.class_name(task_name),
+            "method": str(cfg.inference.method).upper(),
+            "num_simulations": int(cfg.inference.num_simulations),
+        }
+        state["jobs"][str(cfg_path)] = {"signature": signature, "record": record}
+        return record
+
+
     def on_multirun_end(self, config, **kwargs):
+        state = self._load_state()
+
         # 1) Gather run directories
         sweep_dir = Path(config.hydra.sweep.dir)                    # Sweep directory of the multirun
         job_dirs = [d for d in sweep_dir.iterdir() if d.is_dir()]   # Job directories of all the single runs
@@ -25,63 +87,66 @@ class PostProcessCallback(Callback):
         run_records = []    # Each record will hold task, method, num_simulations and the path to its metrics.csv
 
         for job_dir in job_dirs:
-            # Load the config of this job/run
             cfg_path = job_dir / ".hydra" / "config.yaml"
-            cfg = OmegaConf.load(cfg_path)
-
-            # Extract relevant config parameters (task, method, num_simulations)
-            task_name = config.task.name
-            if task_name not in task_registry:
-                raise ValueError(f"Unknown task: {task_name}. Available: {list(task_registry.keys())}")
-
-            # Initialize with arbitrary params to only infer the task class name
-            task_class_name = task_registry[task_name](1, 1, 1).__class__.__name__
-
-            method = str(cfg.inference.method)
-            num_simulations = int(cfg.inference.num_simulations)
+            if not cfg_path.is_file():
+                continue
+            record = self._job_record(cfg_path, state)
 
             # Derive path to benchmark results file metrics.csv
-            metrics_path = Path("outputs") / f"{task_class_name}_{method}" / f"sims_{num_simulations}" / "metrics.csv"
-
-            # Append record
-            run_records.append({
-                "task": task_class_name,
-                "method": method,
-                "num_simulations": num_simulations,
-                "metrics_path": metrics_path,
-            })
+            metrics_path = (Path("outputs") / f"{record['task']}_{record['method']}"
+                            / f"sims_{record['num_simulations']}" / "metrics.csv")
+            run_records.append({**record, "metrics_path": metrics_path})
 
-        df = pd.DataFrame(run_records)
+        if not run_records:
+            print(f"No job configs found under {sweep_dir}; nothing to post-process.")
+            return
 
+        df = pd.DataFrame(run_records)
 
-        # 3) Visualize
-        # 3.1) Get the data sources
-        metrics_paths = df["metrics_path"].tolist()
 
-        # 3.2) Get the save directory
-        # Get unique task-method pairs
+        # 3) Consolidate metrics.csv files into metrics_all.csv within their respective task_method folder
         unique_task_methods = df[["task", "method"]].drop_duplicates()
+        consolidated_files = {}
+        changed_groups = []
 
-        if len(unique_task_methods) == 1:
-            # Only one unique task-method combination
-            task = unique_task_methods.iloc[0]["task"]
-            method = unique_task_methods.iloc[0]["method"]
-
-            save_directory = Path(f"outputs/{task}_{method}/plots")
-        else:
-            # Multiple task-method combinations
-            save_directory = Path("outputs/plots")
-
-        # 3.3) Consolidate metrics.csv files to metrics_all.csv files within their respective task_method folder
         for _, row in unique_task_methods.iterrows():
-            task = row["task"]
-            method = row["method"]
-            input_dir = Path("outputs") / f"{task}_{method}"    # TODO !! changed task to concrete
+            task, method = row["task"], row["method"]
+            input_dir = Path("outputs") / f"{task}_{method}"
             output_file = input_dir / "metrics_all.csv"
+            consolidated_files[(task, method)] = output_file
+
+            if not any(input_dir.glob("sims_*/metrics.csv")):
+                print(f"No metrics.csv under {input_dir}; skipping.")
+                continue
+
+            # Only new or modified metrics.csv files (including those of earlier multiruns) are read
+            summary = update_consolidated_metrics(input_dir=input_dir, output_file=output_file)
+            if summary["rebuilt"] or summary["new"] or summary["modified"] or summary["removed"]:
+                changed_groups.append((task, method))
+
+
+        # 4) Re-render the plots of the groups whose data changed (in parallel, headless)
+        specs = [
+            {
+                "data_sources": consolidated_files[(task, method)],
+                "save_directory": Path("outputs") / f"{task}_{method}" / "plots",
+                "filename": "LinePlot.png",
+            }
+            for task, method in changed_groups
+        ]
+
+        # Combined plot over all task-method groups of this multirun
+        if len(consolidated_files) > 1 and changed_groups:
+            specs.append({
+                "data_sources": [p for p in consolidated_files.values() if p.is_file()],
+                "save_directory": Path("outputs") / "plots",
+                "filename": "LinePlot.png",
+            })
 
-            consolidate_metrics(input_dir=input_dir, output_file=output_file)
+        if specs:
+            LinePlot.render_batch(specs)
 
+        if not changed_groups:
+            print("No metrics changed since the last post-processing; plots are up to date.")
 
-        # 3.3) Create and Save the Plot
-        plotter = LinePlot(data_sources=metrics_paths, save_directory=save_directory)
-        plotter.run()
+        self._save_state(state)
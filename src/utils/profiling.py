@@ -0,0 +1,274 @@
+"""
+On-demand profiling of single benchmark configurations (used by `python -m src.utils.cli_tools bench`).
+
+A configuration (task, method, metric) is run once per requested size in a scratch directory, under
+    - cProfile (deterministic; exact call counts and cumulative times, with some overhead per call), or
+    - a sampling profiler, which records the Python stack of the running thread every `interval` seconds
+      (low overhead, suitable for long runs).
+Per size, the command prints the per-stage wall times (simulation, training, sampling, metrics; recorded by the
+MemoryTracker) and the top hot functions, ranked by their own time (cProfile also prints them by cumulative time). The sampled stacks can be written in the collapsed-stack format
+("frame;frame;frame count" per line) read by flamegraph.pl, speedscope and inferno:
+
+    python -m src.utils.cli_tools bench --method nle --metric c2st --num-simulations 1000,10000 \
+        --profiler sampling --collapsed nle.folded
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+
+PROFILERS = ("cprofile", "sampling")
+
+
+def _frame_label(frame) -> str:
+    """Return the 'module:function' label of a stack frame."""
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler that samples the Python stack of one thread from a background thread.
+
+        >>> with SamplingProfiler(interval=0.005) as profiler:
+        ...     run()
+        >>> profiler.write_collapsed("run.folded")
+
+    Args:
+        interval (float): Seconds between samples.
+        thread_id (int, optional): Thread to sample; defaults to the thread that starts the profiler.
+
+    Attributes:
+        stacks (Counter): Number of samples per stack (tuple of frame labels, outermost first).
+    """
+    def __init__(self, interval: float = 0.005, *, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+
+    def __enter__(self) -> "SamplingProfiler":
+        self.start()
+        return self
+
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+
+    @property
+    def num_samples(self) -> int:
+        return sum(self.stacks.values())
+
+
+    def top(self, n: int = 20) -> List[Tuple[str, int, int]]:
+        """
+        Return the `n` functions with the most samples in their own code (the hot spots).
+
+        Returns:
+            List[Tuple[str, int, int]]: (function, self samples, inclusive samples), sorted by self samples.
+        """
+        own, inclusive = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for label in set(stack):
+                inclusive[label] += count
+        ranked = sorted(inclusive, key=lambda label: (own[label], inclusive[label]), reverse=True)
+        return [(label, own[label], inclusive[label]) for label in ranked[:n]]
+
+
+    def write_collapsed(self, path: Union[str, Path]) -> Path:
+        """Write the samples in collapsed-stack format ('outer;...;inner count' per line)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{';'.join(stack)} {count}\n")
+        return path
+
+
+@contextmanager
+def _working_directory(directory: Path) -> Iterator[None]:
+    previous = Path.cwd()
+    os.chdir(directory)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _run_size(config, profiler: str, interval: float, top: int) -> Dict:
+    """Run one configuration under the profiler and return timings, stage table and profiler report."""
+    from src.utils.benchmark_run import run_benchmark
+
+    sampler = SamplingProfiler(interval) if profiler == "sampling" else None
+    profile = cProfile.Profile() if profiler == "cprofile" else None
+
+    start = time.perf_counter()
+    if sampler is not None:
+        sampler.start()
+    if profile is not None:
+        profile.enable()
+    try:
+        outdirs = run_benchmark(config) or []
+    finally:
+        if profile is not None:
+            profile.disable()
+        if sampler is not None:
+            sampler.stop()
+    seconds = time.perf_counter() - start
+
+    memory_csv = Path(outdirs[0]) / "memory.csv" if outdirs else None
+    stages = pd.read_csv(memory_csv) if memory_csv is not None and memory_csv.is_file() else pd.DataFrame()
+
+    if profile is not None:
+        # Own time (tottime) ranks the hot functions; cumulative time shows which callers they run under
+        stream = io.StringIO()
+        stats = pstats.Stats(profile, stream=stream).strip_dirs()
+        stream.write("By own time (tottime):\n")
+        stats.sort_stats("tottime").print_stats(top)
+        stream.write("By cumulative time (cumtime):\n")
+        stats.sort_stats("cumulative").print_stats(top)
+        report = stream.getvalue()
+    else:
+        lines = ["By own time (self samples):",
+                 f"{'self':>7} {'total':>7}  function   ({sampler.num_samples} samples every {interval * 1000:.1f} ms)"]
+        lines += [f"{own:>7} {total:>7}  {label}" for label, own, total in sampler.top(top)]
+        report = "\n".join(lines)
+
+    return {"seconds": seconds, "stages": stages, "report": report, "sampler": sampler}
+
+
+def bench(
+        *,
+        task: str = "misspecified_likelihood",
+        method: str = "npe",
+        metrics: Sequence[str] = ("ppc",),
+        sizes: Sequence[int] = (1000,),
+        num_observations: int = 1,
+        num_posterior_samples: int = 1000,
+        profiler: str = "cprofile",
+        interval: float = 0.005,
+        top: int = 20,
+        collapsed: Optional[Union[str, Path]] = None,
+        overrides: Sequence[str] = (),
+        workdir: Optional[Union[str, Path]] = None,
+) -> List[Dict]:
+    """
+    Profile one task/method/metric combination at each simulation budget in `sizes` and print the per-stage
+    timings and the hot functions.
+
+    Every size is computed from scratch (force=true, no results store) in `workdir` (default: a temporary
+    directory that is removed afterwards), so the outputs of real runs are neither reused nor touched.
+
+    Args:
+        task (str): Task config name.
+        method (str): Inference method.
+        metrics (Sequence[str]): Metrics to evaluate (see cli_tools.valid_metrics).
+        sizes (Sequence[int]): Simulation budgets to profile.
+        num_observations (int): Observations per run.
+        num_posterior_samples (int): Posterior samples per observation.
+        profiler (str): "cprofile" or "sampling".
+        interval (float): Sampling interval in seconds (sampling profiler).
+        top (int): Number of hot functions to print.
+        collapsed (str | Path, optional): Write the sampled stacks in collapsed-stack format to this file (with
+            several sizes, one file per size: '<stem>_<size><suffix>'). Samples alongside cProfile if needed.
+        overrides (Sequence[str]): Further config overrides.
+        workdir (str | Path, optional): Directory to run in (kept).
+
+    Returns:
+        List[Dict]: Per size: 'size', 'seconds', 'stages' (DataFrame) and 'collapsed' (path or None).
+
+    Raises:
+        ValueError: If the profiler is unknown.
+    """
+    from src.utils.cli_tools import build_config
+
+    if profiler not in PROFILERS:
+        raise ValueError(f"Unknown profiler: {profiler!r}. Available: {list(PROFILERS)}")
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="sbi-bench-") as scratch:
+        directory = Path(workdir).resolve() if workdir is not None else Path(scratch)
+        directory.mkdir(parents=True, exist_ok=True)
+        collapsed_path = None if collapsed is None else Path(collapsed).resolve()
+
+        for size in sizes:
+            # A single (non-grid) run, so the simulation stage is tracked inside the run folder
+            config = build_config(
+                list(metrics), task=task, resume=False,
+                overrides=["grid.enabled=false", f"inference={method}",
+                           f"inference.num_simulations={int(size)}",
+                           f"inference.num_observations={int(num_observations)}",
+                           f"inference.num_posterior_samples={int(num_posterior_samples)}",
+                           "results_store=null", "memory.enabled=true", "memory.track_python=true", *overrides],
+            )
+            print(f"\n=== bench: {task} / {method.upper()} / {'+'.join(metrics)} at {size} simulations "
+                  f"({profiler}) ===")
+
+            # A sampler also runs alongside cProfile if collapsed stacks are requested
+            with _working_directory(directory):
+                if collapsed_path is not None and profiler == "cprofile":
+                    with SamplingProfiler(interval) as sampler:
+                        result = _run_size(config, profiler, interval, top)
+                    result["sampler"] = sampler
+                else:
+                    result = _run_size(config, profiler, interval, top)
+
+            print(f"\nTotal: {result['seconds']:.2f} s")
+            if not result["stages"].empty:
+                columns = [c for c in ["stage", "calls", "seconds", "peak_rss_mb"] if c in result["stages"].columns]
+                print(result["stages"][columns].to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+            print(f"\nTop {top} functions:\n{result['report']}")
+
+            written = None
+            if collapsed_path is not None:
+                target = collapsed_path if len(sizes) == 1 else collapsed_path.with_name(
+                    f"{collapsed_path.stem}_{size}{collapsed_path.suffix}")
+                written = result["sampler"].write_collapsed(target)
+                print(f"Collapsed stacks ➜ {written}")
+
+            results.append({"size": int(size), "seconds": result["seconds"], "stages": result["stages"],
+                            "collapsed": written})
+    return results
@@ -0,0 +1,279 @@
+"""
+Live progress reporting of benchmark jobs.
+
+A ProgressReporter is activated around a run (e.g. in run_point); pipeline code reports its progress with
+`report_progress(...)`, which is a no-op while no reporter is active:
+
+    >>> with ProgressReporter("outputs/<Task>_<Method>/sims_<N>/status.jsonl", total=10, method="NPE"):
+    ...     report_progress("sampling", completed=0)
+    ...     for idx in range(10):
+    ...         ...
+    ...         report_progress("sampling", completed=idx + 1)
+
+Every event is appended as one JSON line to the job's status file:
+
+    {"time": 1.7e9, "state": "running", "stage": "sampling", "completed": 3, "total": 10, "elapsed": 12.5,
+     "throughput": 0.8, "eta": 8.75, "method": "NPE", ...}
+
+with
+    - state: "running", "done" or "failed" (with "error"),
+    - completed/total: observations completed in the current stage,
+    - elapsed: seconds since the job started,
+    - throughput: observations per second in the current stage (None until one is completed),
+    - eta: estimated seconds until the current stage completes.
+
+Single runs also write their events to the job's Hydra output directory (see hydra_output_dir), so
+`python -m src.utils.cli_tools status <sweep directory>` works for the output tree ('outputs') and for a Hydra
+multirun folder alike; it reads the latest event of every status file below a directory (see collect_status and
+format_status). A job that was killed (e.g. SIGKILL, out of memory) cannot record its final state: its last
+"running" event is shown as "stale" once it is older than `stale_after` seconds.
+"""
+
+import json
+import os
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Union
+
+from src.utils.file_utils import ensure_directory
+
+
+STATUS_FILENAME = "status.jsonl"
+
+# Bytes read from the end of a status file to find its latest event
+_TAIL_BYTES = 16 * 1024
+
+# Seconds without a new event after which a running job is shown as stale (no events are written during training)
+STALE_AFTER = 3600.0
+
+_active_reporter: ContextVar[Optional["ProgressReporter"]] = ContextVar("progress_reporter", default=None)
+
+
+class ProgressReporter:
+    """
+    Appends the progress events of one job to its JSON-lines status file.
+
+    The file is started afresh when the reporter is entered; leaving it records the final state ("done", or
+    "failed" with the error if the job raised).
+
+    Args:
+        path (str | Path): The status file (e.g. '<run folder>/status.jsonl').
+        total (int): Number of observations of the job.
+        mirrors (Sequence[str | Path]): Further status files that receive the same events (e.g. in the job's
+            Hydra output directory).
+        **fields: Job description added to every event (e.g. task, method, num_simulations).
+    """
+    def __init__(self, path: Union[str, Path], *, total: int, mirrors: Sequence[Union[str, Path]] = (),
+                 **fields: Any):
+        self.path = Path(path)
+        self.mirrors = [Path(mirror) for mirror in mirrors if Path(mirror) != self.path]
+        self.total = int(total)
+        self.fields = fields
+        self.stage: Optional[str] = None
+        self.completed = 0
+        self._started = None
+        self._stage_started = None
+        self._stage_completed = 0
+        self._token = None
+
+
+    def __enter__(self) -> "ProgressReporter":
+        for path in [self.path, *self.mirrors]:
+            ensure_directory(path.parent)
+            path.write_text("")
+        self._started = time.time()
+        self._token = _active_reporter.set(self)
+        self.update("start", completed=0)
+        return self
+
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _active_reporter.reset(self._token)
+        if exc_type is None:
+            self._emit(state="done", stage="done", completed=self.total)
+        else:
+            self._emit(state="failed", error=f"{exc_type.__name__}: {exc}")
+
+
+    def update(self, stage: str, completed: Optional[int] = None, total: Optional[int] = None) -> dict:
+        """
+        Record that the job is in `stage` with `completed` observations done (None: unchanged).
+
+        Args:
+            stage (str): Current stage.
+            completed (int, optional): Observations completed in this stage.
+            total (int, optional): New number of observations of the job (e.g. when observations are added).
+
+        Returns:
+            dict: The event written.
+        """
+        now = time.time()
+        if total is not None:
+            self.total = int(total)
+        if completed is not None:
+            completed = int(completed)
+        if stage != self.stage:
+            self.stage = stage
+            self._stage_started = now
+            self._stage_completed = completed if completed is not None else 0
+        if completed is not None:
+            self.completed = completed
+
+        throughput = eta = None
+        done = self.completed - self._stage_completed
+        if done > 0 and now > self._stage_started:
+            throughput = done / (now - self._stage_started)
+            eta = max(self.total - self.completed, 0) / throughput
+        return self._emit(state="running", throughput=throughput, eta=eta)
+
+
+    def _emit(self, **event: Any) -> dict:
+        now = time.time()
+        record = {
+            "time": now,
+            "state": "running",
+            "stage": self.stage,
+            "completed": self.completed,
+            "total": self.total,
+            "elapsed": now - self._started,
+            "throughput": None,
+            "eta": None,
+            **self.fields,
+            **event,
+        }
+        line = json.dumps(record, default=str) + "\n"
+        for path in [self.path, *self.mirrors]:
+            with path.open("a") as f:
+                f.write(line)
+        return record
+
+
+def report_progress(stage: str, completed: Optional[int] = None, total: Optional[int] = None) -> None:
+    """
+    Report the progress of the running job to the active ProgressReporter; does nothing if none is active.
+
+    Args:
+        stage (str): Current stage (e.g. "simulation", "training", "sampling", "evaluation").
+        completed (int, optional): Observations completed in this stage.
+        total (int, optional): New number of observations of the job.
+    """
+    reporter = _active_reporter.get()
+    if reporter is not None:
+        reporter.update(stage, completed, total)
+
+
+def hydra_output_dir() -> Optional[Path]:
+    """Return the output directory of the running Hydra job, or None outside of a Hydra app."""
+    try:
+        from hydra.core.hydra_config import HydraConfig
+        return Path(HydraConfig.get().runtime.output_dir)
+    except (ImportError, ValueError):
+        return None
+
+
+def read_status(path: Union[str, Path]) -> Optional[dict]:
+    """
+    Return the latest event of a status file, or None if it has none yet.
+
+    Only the end of the file is read; a last line that is still being written is skipped.
+    """
+    path = Path(path)
+    try:
+        with path.open("rb") as f:
+            f.seek(max(f.seek(0, os.SEEK_END) - _TAIL_BYTES, 0))
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+
+    for line in reversed(lines):
+        try:
+            return json.loads(line)
+        except (ValueError, UnicodeDecodeError):
+            continue
+    return None
+
+
+def collect_status(directory: Union[str, Path]) -> List[dict]:
+    """
+    Return the latest event of every job below `directory`, with its status file under 'path'.
+
+    Args:
+        directory (str | Path): Sweep directory (e.g. 'outputs' or a Hydra multirun folder).
+
+    Returns:
+        List[dict]: One event per job, sorted by path.
+    """
+    events = []
+    for path in sorted(Path(directory).rglob(STATUS_FILENAME)):
+        event = read_status(path)
+        if event is not None:
+            events.append({**event, "path": str(path)})
+    return events
+
+
+def _duration(seconds: Optional[float]) -> str:
+    """Format a duration as 'h:mm:ss' ('-' if unknown)."""
+    if seconds is None:
+        return "-"
+    seconds = int(round(seconds))
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def job_state(event: dict, *, now: Optional[float] = None, stale_after: float = STALE_AFTER) -> str:
+    """Return the state of an event, with "stale" for a running job whose last event is older than `stale_after`."""
+    state = event.get("state", "?")
+    now = time.time() if now is None else now
+    if state == "running" and now - event.get("time", now) > stale_after:
+        return "stale"
+    return state
+
+
+def format_status(events: List[dict], *, now: Optional[float] = None, stale_after: float = STALE_AFTER) -> str:
+    """
+    Format the latest events of a sweep as a progress table with a summary line.
+
+    Args:
+        events (List[dict]): Events from collect_status.
+        now (float, optional): Current time (default: time.time()), used for the age of each event.
+        stale_after (float): Seconds after which a running job without new events is shown as "stale".
+
+    Returns:
+        str: The progress view.
+    """
+    if not events:
+        return "No status files found."
+    now = time.time() if now is None else now
+    states = [job_state(event, now=now, stale_after=stale_after) for event in events]
+
+    rows = [("job", "state", "stage", "obs", "obs/s", "elapsed", "eta", "updated")]
+    for event, state in zip(events, states):
+        job = str(Path(event["path"]).parent)
+        throughput = event.get("throughput")
+        rows.append((
+            job,
+            state,
+            str(event.get("stage") or "-"),
+            f"{event.get('completed', 0)}/{event.get('total', '?')}",
+            "-" if throughput is None else f"{throughput:.2f}",
+            _duration(event.get("elapsed")),
+            _duration(event.get("eta")),
+            f"{_duration(now - event['time'])} ago",
+        ))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = ["  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip() for row in rows]
+
+    # An observation is finished once it is evaluated (the last stage of a job)
+    evaluated = sum(int(event.get("completed") or 0) for event in events
+                    if event.get("state") == "done" or event.get("stage") == "evaluation")
+    total = sum(int(event.get("total") or 0) for event in events)
+    running_etas = [event["eta"] for event, state in zip(events, states)
+                    if state == "running" and event.get("eta") is not None]
+    summary = (f"{len(events)} jobs: {states.count('done')} done, {states.count('running')} running, "
+               f"{states.count('failed')} failed")
+    if states.count("stale"):
+        summary += f", {states.count('stale')} stale"
+    summary += f"; {evaluated}/{total} observations evaluated"
+    if running_etas:
+        summary += f"; longest stage ETA {_duration(max(running_etas))}"
+    return "\n".join(lines + ["", summary])
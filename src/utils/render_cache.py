@@ -0,0 +1,104 @@
+"""
+Render cache for plots.
+
+A plot is identified by
+    - its parameters (plot class, data sources, axes, orders, styling, ...), and
+    - the input data slice it is drawn from: the signature (path, size, mtime) of every CSV file it reads.
+
+The cache index 'outputs/.plot_cache.json' maps the hash of both to the rendered image:
+
+    {"entries": {"<key>": {"path": "outputs/plots/LinePlot.png", "params": "<params hash>", "created": 1.7e9}}}
+
+An unchanged plot whose image still exists is not rendered again, which only takes a few file stats.
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, Optional, Union
+
+from src.utils.file_utils import atomic_write, ensure_directory, file_lock
+from src.utils.run_manifest import config_hash
+
+
+def data_signature(paths: Iterable[Path]) -> str:
+    """
+    Hash the identity of the input data: path, size and modification time of each file.
+
+    Args:
+        paths (Iterable[Path]): Input files (e.g. the gathered .csv files of a plot).
+
+    Returns:
+        str: The hex digest.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(Path(p).resolve() for p in paths):
+        stat = path.stat()
+        digest.update(f"{path}|{stat.st_size}|{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """
+    Index of rendered plots, keyed by the hash of their parameters and input data.
+
+    Concurrent renderers (e.g. BasePlot.render_batch) update the index under a lock with write-then-rename.
+
+    Args:
+        index_path (str | Path): Location of the JSON index.
+        base_directory (str | Path): Directory the image paths are recorded relative to.
+    """
+    def __init__(self, index_path: Union[str, Path], base_directory: Union[str, Path]):
+        self.index_path = Path(index_path)
+        self.base_directory = Path(base_directory)
+
+
+    @staticmethod
+    def key(params: Mapping[str, Any], data: str) -> str:
+        """Return the cache key of a plot from its parameters and data signature."""
+        return config_hash({"params": config_hash(params), "data": data})
+
+
+    def _load(self) -> Dict[str, dict]:
+        """Load the index entries (empty if missing or unreadable)."""
+        try:
+            return json.loads(self.index_path.read_text()).get("entries", {})
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+
+    def lookup(self, key: str) -> Optional[Path]:
+        """
+        Return the image rendered for `key`, or None if it was never rendered or the image no longer exists.
+        """
+        entry = self._load().get(key)
+        if entry is None:
+            return None
+        path = self.base_directory / entry["path"]
+        return path if path.is_file() else None
+
+
+    def previous_path(self, params: Mapping[str, Any]) -> Optional[Path]:
+        """Return the image of the newest entry with the same parameters (rendered from other data), if any."""
+        params_hash = config_hash(params)
+        entries = [e for e in self._load().values() if e.get("params") == params_hash]
+        if not entries:
+            return None
+        return self.base_directory / max(entries, key=lambda e: e.get("created", 0))["path"]
+
+
+    def record(self, key: str, params: Mapping[str, Any], path: Union[str, Path]) -> None:
+        """
+        Record that `path` holds the image of `key`; older entries of the same image are replaced.
+        """
+        path = Path(path)
+        if path.is_absolute():
+            path = path.relative_to(self.base_directory)
+
+        ensure_directory(self.index_path.parent)
+        with file_lock(self.index_path):
+            entries = {k: e for k, e in self._load().items() if e["path"] != str(path)}
+            entries[key] = {"path": str(path), "params": config_hash(params), "created": time.time()}
+            with atomic_write(self.index_path) as f:
+                f.write(json.dumps({"entries": entries}, indent=2, sort_keys=True))
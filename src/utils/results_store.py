@@ -0,0 +1,199 @@
+"""
+SQLite-backed store for benchmark results.
+
+All results live in one table (one row per metric and observation) with the base fieldnames
+    metric, value, task, method, num_simulations, observation_idx
+plus any metadata columns (e.g. seed, tau_m), which are added on first use.
+Indexes on task/method/num_simulations/metric let `query` return filtered DataFrames
+without scanning the output tree.
+
+Usage:
+    >>> with ResultsStore("outputs/results.sqlite") as store:
+    ...     store.write(rows, replace={"task": "misspecified_likelihood", "method": "NPE", "num_simulations": 100})
+    ...     df = store.query(method="NPE", metric=["c2st", "ppc"])
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterable, List, Mapping, Optional, Sequence, Union
+
+import pandas as pd
+
+from src.utils.file_utils import ensure_directory
+
+
+BASE_COLUMNS = {
+    "metric": "TEXT",
+    "value": "REAL",
+    "task": "TEXT",
+    "method": "TEXT",
+    "num_simulations": "INTEGER",
+    "observation_idx": "INTEGER",
+}
+
+
+def _to_sql_value(value: Any) -> Any:
+    """Convert numpy/torch scalars to plain Python values that sqlite3 can bind."""
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+def _quote(name: str) -> str:
+    """Quote a column name for use in SQL statements."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class ResultsStore:
+    """
+    Append-friendly results store backed by a single SQLite file.
+
+    Args:
+        path (str | Path): Location of the SQLite database; created (with parents) if missing.
+        timeout (float): Seconds to wait for the database lock held by concurrent writers.
+
+    Attributes:
+        path (Path): Location of the SQLite database.
+    """
+    TABLE = "results"
+
+    def __init__(self, path: Union[str, Path] = "outputs/results.sqlite", *, timeout: float = 60.0):
+        self.path = Path(path)
+        ensure_directory(self.path.parent)
+        self._connection = sqlite3.connect(self.path, timeout=timeout)
+        self._create_schema()
+
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+
+    def _create_schema(self) -> None:
+        """Create the results table and its indexes if they don't exist yet."""
+        columns = ", ".join(f"{_quote(name)} {sql_type}" for name, sql_type in BASE_COLUMNS.items())
+        with self._connection:
+            self._connection.execute(f"CREATE TABLE IF NOT EXISTS {self.TABLE} ({columns})")
+            self._connection.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{self.TABLE}_run "
+                f"ON {self.TABLE} (task, method, num_simulations, metric)"
+            )
+            self._connection.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.TABLE}_metric ON {self.TABLE} (metric)")
+
+
+    @property
+    def columns(self) -> List[str]:
+        """Names of all columns of the results table, base fieldnames first."""
+        return [row[1] for row in self._connection.execute(f"PRAGMA table_info({self.TABLE})")]
+
+
+    def _ensure_columns(self, names: Iterable[str]) -> None:
+        """Add metadata columns that are not part of the table yet."""
+        existing = set(self.columns)
+        for name in sorted(set(names) - existing):
+            self._connection.execute(f"ALTER TABLE {self.TABLE} ADD COLUMN {_quote(name)}")
+
+
+    @staticmethod
+    def _where(filters: Mapping[str, Any]):
+        """Build a WHERE clause and its parameters; list values become IN (...) conditions."""
+        clauses, params = [], []
+        for name, value in filters.items():
+            if value is None:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                values = [_to_sql_value(v) for v in value]
+                clauses.append(f"{_quote(name)} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+            else:
+                clauses.append(f"{_quote(name)} = ?")
+                params.append(_to_sql_value(value))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+    def write(self, rows: Iterable[Mapping[str, Any]], *, replace: Optional[Mapping[str, Any]] = None) -> int:
+        """
+        Insert `rows` in a single transaction.
+
+        Args:
+            rows (Iterable[Mapping[str, Any]]): Result rows with (at least) the base fieldnames.
+            replace (Mapping[str, Any], optional): Rows matching these column values are deleted first in the same
+                transaction, e.g. all rows of a run folder that is being recomputed.
+
+        Returns:
+            int: Number of inserted rows.
+
+        Raises:
+            ValueError: If a row lacks one of the base fieldnames.
+        """
+        rows = list(rows)
+        for row in rows:
+            missing = [name for name in BASE_COLUMNS if name not in row]
+            if missing:
+                raise ValueError(f"Missing required columns: {missing}")
+
+        with self._connection:
+            if replace:
+                where, params = self._where(replace)
+                self._connection.execute(f"DELETE FROM {self.TABLE}{where}", params)
+            if not rows:
+                return 0
+
+            # Group rows by their column set so that each group is one executemany batch
+            batches = {}
+            for row in rows:
+                batches.setdefault(tuple(row.keys()), []).append(row)
+
+            self._ensure_columns(name for names in batches for name in names)
+            for names, batch in batches.items():
+                statement = (f"INSERT INTO {self.TABLE} ({', '.join(_quote(n) for n in names)}) "
+                             f"VALUES ({', '.join('?' * len(names))})")
+                self._connection.executemany(
+                    statement, ([_to_sql_value(row[n]) for n in names] for row in batch)
+                )
+        return len(rows)
+
+
+    def query(
+            self,
+            *,
+            task: Optional[Union[str, Sequence[str]]] = None,
+            method: Optional[Union[str, Sequence[str]]] = None,
+            num_simulations: Optional[Union[int, Sequence[int]]] = None,
+            metric: Optional[Union[str, Sequence[str]]] = None,
+            columns: Optional[Sequence[str]] = None,
+            **filters: Any,
+    ) -> pd.DataFrame:
+        """
+        Return the results matching all given filters as a DataFrame.
+
+        Each filter accepts a single value or a list of values; None means no filter.
+
+        Args:
+            task, method, num_simulations, metric: Filters on the indexed base columns.
+            columns (Sequence[str], optional): Columns to return; defaults to all columns.
+            **filters: Equality filters on further (metadata) columns, e.g. seed=1.
+
+        Returns:
+            pd.DataFrame: The matching rows.
+
+        Raises:
+            ValueError: If a requested or filtered column does not exist.
+        """
+        all_filters = {"task": task, "method": method, "num_simulations": num_simulations, "metric": metric, **filters}
+        existing = self.columns
+        unknown = [name for name in [*(columns or []), *filters] if name not in existing]
+        if unknown:
+            raise ValueError(f"Unknown result columns: {unknown}")
+
+        selected = ", ".join(_quote(name) for name in columns) if columns else "*"
+        where, params = self._where(all_filters)
+        return pd.read_sql_query(f"SELECT {selected} FROM {self.TABLE}{where}", self._connection, params=params)
@@ -0,0 +1,161 @@
+"""
+Completion manifest for resumable benchmark runs.
+
+A manifest records every finished unit of work of one run folder
+(outputs/<TaskClassName>_<Method>/sims_<NumSimulations>/) as one JSON line in 'manifest.jsonl':
+
+    {"key": {...}, "artifacts": {"obs_0/posterior_samples.pt": "<sha256>", ...}, "value": 0.53}
+
+A unit is identified by its key (task config hash, method, num_simulations, seed, observation_idx, metric).
+It only counts as complete while all of its recorded artifacts still exist with unchanged checksums,
+so deleted or rewritten outputs are recomputed on the next run.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, Optional, Union
+
+from src.utils.file_utils import ensure_directory, locked
+
+
+def config_hash(config: Mapping[str, Any]) -> str:
+    """
+    Compute a short, order-independent hash of a (resolved) configuration mapping.
+
+    Args:
+        config (Mapping[str, Any]): Configuration values, e.g. the task config as a plain dict.
+
+    Returns:
+        str: The first 16 hex characters of the SHA-256 of the canonical JSON encoding.
+    """
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def file_checksum(path: Path, *, chunk_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 checksum of a file, reading it in chunks.
+
+    Args:
+        path (Path): File to hash.
+        chunk_size (int): Number of bytes read per chunk.
+
+    Returns:
+        str: The hex digest of the file content.
+    """
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class RunManifest:
+    """
+    Append-only record of the completed units of one run folder.
+
+    Args:
+        directory (str | Path): Run folder holding the manifest (e.g. outputs/<Task>_<Method>/sims_<N>).
+
+    Attributes:
+        directory (Path): The run folder; artifact paths are stored relative to it.
+        path (Path): Location of the 'manifest.jsonl' file.
+    """
+    FILENAME = "manifest.jsonl"
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self.path = self.directory / self.FILENAME
+        self._entries: Dict[str, dict] = {}
+        self._load()
+
+
+    @staticmethod
+    def unit_id(key: Mapping[str, Any]) -> str:
+        """Return the canonical string identifying the unit `key`."""
+        return json.dumps(key, sort_keys=True, default=str)
+
+
+    def _load(self) -> None:
+        """Read all records from disk; later records of the same unit replace earlier ones."""
+        if not self.path.exists():
+            return
+        with self.path.open() as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    self._entries[self.unit_id(entry["key"])] = entry
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    # A torn last line from an interrupted run: the unit simply counts as missing
+                    continue
+
+
+    def get(self, key: Mapping[str, Any]) -> Optional[dict]:
+        """Return the record of the unit `key` if it is complete, otherwise None."""
+        entry = self._entries.get(self.unit_id(key))
+        if entry is None:
+            return None
+
+        for relative_path, checksum in entry.get("artifacts", {}).items():
+            artifact = self.directory / relative_path
+            if not artifact.is_file() or file_checksum(artifact) != checksum:
+                return None
+        return entry
+
+
+    def is_complete(self, key: Mapping[str, Any]) -> bool:
+        """Check whether the unit `key` was recorded and all of its artifacts are unchanged."""
+        return self.get(key) is not None
+
+
+    def record(
+            self,
+            key: Mapping[str, Any],
+            *,
+            artifacts: Iterable[Union[str, Path]] = (),
+            value: Any = None,
+    ) -> dict:
+        """
+        Mark the unit `key` as complete and persist the record immediately.
+
+        Args:
+            key (Mapping[str, Any]): Identity of the unit.
+            artifacts (Iterable[str | Path], optional): Files the unit depends on, relative to `directory`.
+            value (Any, optional): JSON-serializable result of the unit (e.g. a metric score).
+
+        Returns:
+            dict: The written record.
+
+        Raises:
+            FileNotFoundError: If one of the artifacts does not exist.
+        """
+        checksums = {}
+        for relative_path in artifacts:
+            artifact = self.directory / relative_path
+            if not artifact.is_file():
+                raise FileNotFoundError(f"Cannot record missing artifact: {artifact}")
+            checksums[Path(relative_path).as_posix()] = file_checksum(artifact)
+
+        entry = {"key": dict(key), "artifacts": checksums, "value": value}
+
+        ensure_directory(self.directory)
+        line = (json.dumps(entry, default=str) + "\n").encode()
+        with self.path.open("a+b") as f, locked(f):
+            # Terminate a torn last line of an interrupted run, so this record starts on a line of its own
+            size = f.seek(0, os.SEEK_END)
+            if size > 0:
+                f.seek(size - 1)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line)
+        self._entries[self.unit_id(key)] = entry
+        return entry
+
+
+    def reset(self) -> None:
+        """Forget all recorded units and delete the manifest file."""
+        self._entries.clear()
+        if self.path.exists():
+            self.path.unlink()
@@ -1,9 +1,277 @@
 import csv
+import io
+import logging
+import os
+import tempfile
 from pathlib import Path
-from typing import Any, Literal, Mapping, Optional, Union
+from typing import Any, Dict, List, Literal, Mapping, Optional, Sequence, Union
 
-from .csv_utils import assert_csv_header_matches, resolve_file_mode
-from .file_utils import ensure_directory
+from .csv_utils import assert_csv_header_matches
+from .file_utils import apply_target_mode, ensure_directory, locked
+
+log = logging.getLogger(__name__)
+
+BASE_FIELDNAMES = ["metric", "value", "task", "method", "num_simulations", "observation_idx"]
+
+
+def result_path(
+        *,
+        task: str,
+        method: str,
+        num_simulations: int,
+        observation_idx: int,
+        base_directory: Optional[Union[str, Path]] = None,
+        filename: Optional[str] = None,
+) -> Path:
+    """
+    Return the path of the results file of one observation:
+        <base_directory>/outputs/<task>_<method>/sims_<num_simulations>/obs_<observation_idx>/<filename>.csv
+
+    Args:
+        task (str): Benchmark task name.
+        method (str): Inference method name.
+        num_simulations (int): Number of simulations.
+        observation_idx (int): Index of observation.
+        base_directory (Path | str, optional): Root directory for folder structure; defaults to cwd.
+        filename (str, optional): Custom .csv filename (stem or with extension). Defaults to "metrics.csv".
+    """
+    base_dir = Path.cwd() if base_directory is None else Path(base_directory)  # Normalize the base directory
+    stem = Path(filename).stem if filename else "metrics"  # Normalize the file stem
+    return (base_dir
+            / "outputs"
+            / f"{task}_{method}"
+            / f"sims_{num_simulations}"
+            / f"obs_{observation_idx}"
+            / f"{stem}.csv")
+
+
+def build_rows(
+        results: Mapping[str, float],
+        *,
+        task: str,
+        method: str,
+        num_simulations: int,
+        observation_idx: int,
+        **metadata: Union[str, int, float, bool],
+) -> List[Dict[str, Any]]:
+    """
+    Build one result row per metric.
+
+    Raises:
+        ValueError: If `results` is empty.
+    """
+    if not results:
+        raise ValueError("`results` is empty; nothing to save.")
+
+    return [
+        {
+            "metric": metric_name,
+            "value": metric_value,
+            "task": task,
+            "method": method,
+            "num_simulations": num_simulations,
+            "observation_idx": observation_idx,
+            **metadata,
+        }
+        for metric_name, metric_value in results.items()
+    ]
+
+
+class ResultWriter:
+    """
+    Buffered writer for result rows of one CSV file.
+
+    The schema (base fieldnames + sorted metadata fieldnames) is fixed by `metadata_fields` or by the first
+    written rows and validated against an existing file only once. The file stays open while the writer is
+    active; rows are buffered in memory and written in batches of `batch_size` and on exit.
+
+    Writing is safe with concurrent processes:
+        - "append": every batch is written with a single write under an exclusive lock (fcntl), so rows of
+          concurrent writers never interleave and the header is written exactly once. If the block raises, the
+          rows still buffered are dropped; batches written before the error stay in the file.
+        - "write": rows go to a temporary file that atomically replaces the target on exit, so readers never
+          see a partially written file. If the block raises, the temporary file is discarded and the target is
+          left unchanged.
+
+        >>> with ResultWriter(path, file_mode="append") as writer:
+        ...     for idx, results in enumerate(all_results):
+        ...         writer.write(results, task="t", method="NPE", num_simulations=100, observation_idx=idx, seed=1)
+
+    Args:
+        path (str | Path): Target .csv file; parent directories are created.
+        file_mode ("write" or "append"):
+            - "write" (default): overwrite the file if it exists, or create it otherwise.
+            - "append": append rows if the file exists, or create it otherwise.
+        metadata_fields (Sequence[str], optional): Metadata column names; defaults to those of the first rows.
+        batch_size (int): Number of buffered rows that triggers a write.
+
+    Attributes:
+        path (Path): Target .csv file.
+        fieldnames (list[str] | None): Column order of the file, known once the schema is fixed.
+        rows_written (int): Number of rows written to the file so far.
+    """
+    def __init__(
+            self,
+            path: Union[str, Path],
+            *,
+            file_mode: Literal["write", "append"] = "write",
+            metadata_fields: Optional[Sequence[str]] = None,
+            batch_size: int = 1000,
+    ):
+        self.path = Path(path)
+        self.file_mode = file_mode
+        self.batch_size = max(1, batch_size)
+        self.fieldnames: Optional[List[str]] = None
+        self.rows_written = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._file = None
+        self._tmp_name: Optional[str] = None
+        self._header_checked = False
+        if metadata_fields is not None:
+            self.fieldnames = BASE_FIELDNAMES + sorted(metadata_fields)
+
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.discard()
+        else:
+            self.close()
+
+
+    def _open(self) -> None:
+        """Open the target (append) or a temporary file next to it (write)."""
+        ensure_directory(self.path.parent)
+        if self.file_mode == "append":
+            self._file = self.path.open("a", newline="")
+        elif self.file_mode == "write":
+            fd, self._tmp_name = tempfile.mkstemp(prefix=f".{self.path.name}.", suffix=".tmp", dir=self.path.parent)
+            self._file = os.fdopen(fd, "w", newline="")
+        else:
+            raise ValueError(f"Unknown file_mode: {self.file_mode!r}")
+
+
+    def _check_header(self) -> bool:
+        """
+        Assert that the header of the (locked) target matches the writer's columns, once.
+
+        Returns:
+            bool: True if the file is empty and the header still has to be written.
+
+        Raises:
+            ValueError: If the existing header differs from the writer's columns.
+        """
+        if self._file.seek(0, os.SEEK_END) == 0:
+            return True
+        if not self._header_checked:
+            assert_csv_header_matches(self.path, self.fieldnames)
+            self._header_checked = True
+        return False
+
+
+    def write_rows(self, rows: Sequence[Mapping[str, Any]]) -> int:
+        """
+        Buffer result rows that already contain the base fieldnames.
+
+        Returns:
+            int: Number of buffered rows.
+
+        Raises:
+            ValueError: If a row's columns don't match the writer's schema.
+        """
+        for row in rows:
+            fieldnames = BASE_FIELDNAMES + sorted(k for k in row if k not in BASE_FIELDNAMES)
+            if self.fieldnames is None:
+                self.fieldnames = fieldnames
+            elif fieldnames != self.fieldnames:
+                raise ValueError(f"Row columns {fieldnames!r} don't match the writer's columns {self.fieldnames!r}")
+            self._buffer.append(dict(row))
+
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+        return len(rows)
+
+
+    def write(
+            self,
+            results: Mapping[str, float],
+            *,
+            task: str,
+            method: str,
+            num_simulations: int,
+            observation_idx: int,
+            **metadata: Union[str, int, float, bool],
+    ) -> int:
+        """
+        Buffer one row per metric of `results` (see save_results for the arguments).
+
+        Returns:
+            int: Number of buffered rows.
+
+        Raises:
+            ValueError: If `results` is empty or the metadata fields don't match the writer's schema.
+        """
+        rows = build_rows(results, task=task, method=method, num_simulations=num_simulations,
+                          observation_idx=observation_idx, **metadata)
+        return self.write_rows(rows)
+
+
+    def flush(self) -> None:
+        """Write all buffered rows to the file."""
+        if not self._buffer:
+            return
+        if self._file is None:
+            self._open()
+
+        # Serialize the batch first so that it reaches the file in a single write
+        chunk = io.StringIO()
+        writer = csv.DictWriter(chunk, fieldnames=self.fieldnames)
+        if self.file_mode == "write":
+            if self.rows_written == 0:
+                writer.writeheader()
+            writer.writerows(self._buffer)
+            self._file.write(chunk.getvalue())
+        else:
+            with locked(self._file):
+                if self._check_header():
+                    writer.writeheader()
+                writer.writerows(self._buffer)
+                self._file.write(chunk.getvalue())
+
+        self._file.flush()
+        self.rows_written += len(self._buffer)
+        log.debug(f"Wrote {len(self._buffer)} row(s) ➜ {self.path}")
+        self._buffer.clear()
+
+
+    def close(self) -> None:
+        """Flush the remaining rows and close the file (in write mode, replace the target with it)."""
+        try:
+            self.flush()
+        finally:
+            if self._file is not None:
+                if self.file_mode == "write":
+                    os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
+                if self._tmp_name is not None:
+                    apply_target_mode(self._tmp_name, self.path)
+                    os.replace(self._tmp_name, self.path)
+                    self._tmp_name = None
+
+
+    def discard(self) -> None:
+        """Close the writer without writing the buffered rows (in write mode, remove the temporary file)."""
+        self._buffer.clear()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._tmp_name is not None:
+            Path(self._tmp_name).unlink(missing_ok=True)
+            self._tmp_name = None
 
 
 def save_results(
@@ -30,6 +298,7 @@ def save_results(
     By default, the file “metrics.csv” in that leaf folder is overwritten on each call.
     To add rows instead, set `file_mode="append"`.
     To write multiple files in the same folder, supply a custom `filename`.
+    To save many results to the same file, use a ResultWriter, which opens and validates the file only once.
 
     Args:
         results (Mapping[str, float]): Mapping of metric names to their respective values.
@@ -50,61 +319,17 @@ def save_results(
     Returns:
         Path: The absolute path of the .csv file the benchmark results have been saved to.
     """
-
-    # Assert results is not empty
-    if not results:
-        raise ValueError("`results` is empty; nothing to save.")
-
+    # Build rows for each metric (raises on empty results before anything is created)
+    rows = build_rows(results, task=task, method=method, num_simulations=num_simulations,
+                      observation_idx=observation_idx, **metadata)
 
     # Determine the save path
-    base_dir = Path.cwd() if base_directory is None else Path(base_directory)  # Normalize the base directory
-    stem = Path(filename).stem if filename else "metrics"  # Normalize the file stem
-    save_path = (base_dir
-                / "outputs"
-                / f"{task}_{method}"
-                / f"sims_{num_simulations}"
-                / f"obs_{observation_idx}"
-                / f"{stem}.csv")
-
-    ensure_directory(save_path.parent) # Ensure the determined save path exists
-
-
-    # Build rows for each metric
-    rows = [
-        {
-            "metric": metric_name,
-            "value": metric_value,
-            "task": task,
-            "method": method,
-            "num_simulations": num_simulations,
-            "observation_idx": observation_idx,
-            **metadata,
-        }
-        for metric_name, metric_value in results.items()
-    ]
-
-
-    # Assert that the headers/ fieldnames match when appending to an existing CSV file
-    base_fieldnames = ["metric", "value", "task", "method", "num_simulations", "observation_idx"]
-    metadata_fieldnames = sorted(metadata.keys())  # normalize metadata fieldnames order
-
-    fieldnames = base_fieldnames + metadata_fieldnames
-
-    if file_mode == "append" and save_path.exists():
-        assert_csv_header_matches(save_path, fieldnames)
-
+    save_path = result_path(task=task, method=method, num_simulations=num_simulations,
+                            observation_idx=observation_idx, base_directory=base_directory, filename=filename)
 
     # Write or append to the save path
-    mode, write_header = resolve_file_mode(save_path, file_mode)  # Decide mode and header-writing behavior
-
-    with save_path.open(mode, newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        if write_header:
-            writer.writeheader()
-        writer.writerows(rows)
-
-
-    # Confirm the file was saved
-    print(f"Saved {len(rows)} metric(s) ➜ {save_path}")
+    with ResultWriter(save_path, file_mode=file_mode) as writer:
+        writer.write_rows(rows)
 
+    log.info(f"Saved {len(rows)} metric(s) ➜ {save_path}")
     return save_path
@@ -0,0 +1,133 @@
+import os
+
+import pytest
+import torch
+
+from src.utils.artifact_store import ArtifactStore, main, tensor_digest
+from src.utils.io_utils import load_tensor, save_reference_samples, save_samples, save_samples_to
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ArtifactStore(tmp_path / ".artifacts") as store:
+        yield store
+
+
+def test_identical_tensors_are_stored_once(tmp_path, store):
+    x_obs = torch.randn(5)
+    a = tmp_path / "Task_NPE" / "sims_100" / "obs_0" / "x_obs.pt"
+    b = tmp_path / "Task_NLE" / "sims_1000" / "obs_0" / "x_obs.pt"
+    digest_a = store.put_tensor(x_obs, path=a, kind="observation", task="Task", method="NPE", observation_idx=0)
+    digest_b = store.put_tensor(x_obs.clone(), path=b, kind="observation", task="Task", method="NLE", observation_idx=0)
+
+    assert digest_a == digest_b == tensor_digest(x_obs)
+    assert os.path.samefile(a, b)
+    assert len(list(store.objects.glob("*/*"))) == 1
+    torch.testing.assert_close(torch.load(a, weights_only=True), x_obs)
+
+
+def test_objects_get_regular_file_permissions(tmp_path, store, monkeypatch):
+    import src.utils.file_utils as file_utils
+    monkeypatch.setattr(file_utils, "_UMASK", 0o022)
+    path = tmp_path / "obs_0" / "x_obs.pt"
+    digest = store.put_tensor(torch.randn(3), path=path, kind="observation")
+    assert store.object_path(digest).stat().st_mode & 0o777 == 0o644
+    assert path.stat().st_mode & 0o777 == 0o644
+
+
+def test_views_are_hashed_by_content(store):
+    base = torch.randn(3, 4)
+    assert tensor_digest(base[1]) == tensor_digest(base[1].clone())
+    assert tensor_digest(base[1]) != tensor_digest(base[2])
+    torch.testing.assert_close(store.load(store.put_tensor(base[1], name="row")), base[1])
+
+
+def test_lookup_filters_by_metadata(tmp_path, store):
+    for method in ("NPE", "NLE"):
+        for idx in range(2):
+            store.put_tensor(torch.full((2,), float(idx)), path=tmp_path / method / f"obs_{idx}.pt",
+                             kind="observation", task="Task", method=method, observation_idx=idx, seed=7)
+
+    assert len(store.lookup(kind="observation")) == 4
+    entries = store.lookup(method="NLE", observation_idx=1)
+    assert len(entries) == 1
+    assert entries[0]["seed"] == 7 and entries[0]["object"].is_file()
+    assert {e["digest"] for e in store.lookup(kind="observation")} == {e["digest"] for e in store.lookup(method="NPE")}
+    with pytest.raises(ValueError, match="Unknown artifact columns"):
+        store.lookup(colour="red")
+
+
+def test_add_file_deduplicates_sample_files(tmp_path, store):
+    samples = torch.randn(100, 2)
+    first = save_samples_to(samples, tmp_path / "a", format="npy")
+    second = save_samples_to(samples, tmp_path / "b", format="npy")
+    assert store.add_file(first, kind="posterior_samples") == store.add_file(second, kind="posterior_samples")
+    assert os.path.samefile(first, second)
+
+    # Overwriting one reference must not change the other (write-then-rename breaks the link)
+    save_samples_to(torch.zeros(100, 2), tmp_path / "a", format="npy")
+    torch.testing.assert_close(store.load(store.lookup(ref=str(second.resolve()))[0]["digest"]), samples)
+
+
+def test_gc_removes_unreferenced_objects(tmp_path, store):
+    kept, dropped = tmp_path / "kept.pt", tmp_path / "dropped.pt"
+    store.put_tensor(torch.ones(3), path=kept, kind="observation")
+    store.put_tensor(torch.zeros(3), path=dropped, kind="observation")
+    store.put_tensor(torch.arange(3.0), name="reference_samples/Task/seed_0", kind="reference_samples")
+    dropped.unlink()
+
+    report = store.gc(dry_run=True)
+    assert report["stale_refs"] == [str(dropped.resolve())] and len(report["objects"]) == 1
+    assert len(list(store.objects.glob("*/*"))) == 3
+
+    store.gc()
+    assert len(list(store.objects.glob("*/*"))) == 2
+    assert {e["ref"] for e in store.lookup()} == {str(kept.resolve()), "name:reference_samples/Task/seed_0"}
+    assert store.gc()["objects"] == []
+
+
+def test_legacy_io_utils_use_the_store(store):
+    samples, reference = torch.randn(10, 2), torch.randn(10, 2)
+    save_samples(samples, "Task", "NPE", store=store)
+    save_reference_samples(reference, "Task", seed=3, store=store)
+
+    torch.testing.assert_close(load_tensor("Task", "NPE", "posterior_samples", store=store), samples)
+    assert store.lookup(kind="reference_samples", seed=3)[0]["ref"] == "name:reference_samples/Task/seed_3"
+    with pytest.raises(FileNotFoundError):
+        load_tensor("Task", "NLE", "posterior_samples", store=store)
+
+
+def test_legacy_io_utils_close_the_default_store(tmp_path, monkeypatch):
+    import src.utils.io_utils as io_utils
+    opened = []
+
+    class TrackedStore(ArtifactStore):
+        def __init__(self):
+            super().__init__(tmp_path / ".artifacts")
+            self.closed = False
+            opened.append(self)
+
+        def close(self):
+            self.closed = True
+            super().close()
+
+    monkeypatch.setattr(io_utils, "ArtifactStore", TrackedStore)
+    samples = torch.randn(4, 2)
+    save_samples(samples, "Task", "NPE")
+    save_reference_samples(samples, "Task", seed=0)
+    torch.testing.assert_close(load_tensor("Task", "NPE", "posterior_samples"), samples)
+    with pytest.raises(FileNotFoundError):
+        load_tensor("Task", "NLE", "posterior_samples")
+    assert len(opened) == 4 and all(store.closed for store in opened)
+
+
+def test_cli_lists_and_collects(tmp_path, capsys):
+    root = tmp_path / ".artifacts"
+    with ArtifactStore(root) as store:
+        store.put_tensor(torch.ones(2), path=tmp_path / "x_obs.pt", kind="observation")
+    (tmp_path / "x_obs.pt").unlink()
+
+    assert main(["--root", str(root)]) == 0
+    assert "1 reference(s) to 1 object(s)" in capsys.readouterr().out
+    assert main(["--root", str(root), "--gc"]) == 0
+    assert "Removed 1 object(s)" in capsys.readouterr().out
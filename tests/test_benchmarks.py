@@ -0,0 +1,45 @@
+import json
+
+from benchmarks.run_benchmarks import BENCHMARKS, compare_to_baseline, main, run_benchmarks
+
+
+def timings(**medians):
+    return {"meta": {}, "results": {case: {"min": t, "median": t, "max": t, "repeat": 1} for case, t in medians.items()}}
+
+
+def test_registry_covers_pipeline_stages():
+    expected = [
+        "simulator/LikelihoodMisspecifiedTask",
+        "simulator/LinearGaussianTask",
+        "simulator/GroundTruthModel.sample_data",
+        "training/NPE", "training/NLE", "training/NRE",
+        "sampling/NPE",
+        "metric/compute_c2st", "metric/compute_ppc",
+        "postprocess/consolidate_metrics", "postprocess/LinePlot.run", "postprocess/LinePlot.run_cached",
+    ]
+    assert all(name in BENCHMARKS for name in expected)
+
+
+def test_compare_flags_only_slowdowns_beyond_threshold():
+    baseline = timings(a=1.0, b=1.0, c=1.0)
+    current = timings(a=1.1, b=1.5, c=0.5, d=9.0)  # 'd' has no baseline
+
+    regressions = compare_to_baseline(current, baseline, threshold=0.2)
+    assert [r["case"] for r in regressions] == ["b"]
+    assert regressions[0]["ratio"] == 1.5
+
+
+def test_run_benchmarks_writes_json_and_detects_regression(tmp_path):
+    results = run_benchmarks("simulator/LinearGaussianTask", repeat=1, quick=True)
+    assert list(results["results"]) == ["simulator/LinearGaussianTask/1000"]
+
+    output = tmp_path / "bench.json"
+    assert main(["--filter", "simulator/LinearGaussianTask", "--quick", "--repeat", "1",
+                 "--output", str(output)]) == 0
+    assert json.loads(output.read_text())["results"]
+
+    # A baseline that is impossibly fast makes the run fail
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(timings(**{"simulator/LinearGaussianTask/1000": 1e-12})))
+    assert main(["--filter", "simulator/LinearGaussianTask", "--quick", "--repeat", "1",
+                 "--baseline", str(baseline)]) == 1
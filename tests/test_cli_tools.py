@@ -1,41 +1,80 @@
 import argparse
-import argparse
 import builtins
 
+import pandas as pd
+import pytest
+
+import src.utils.cli_tools as cli_tools
 from src.utils.cli_tools import (
-    run_tool,
+    build_config,
     list_methods,
-    help_function,
+    list_tasks,
     handle_command,
     ask_user_for_metrics,
+    main,
     valid_metrics
 )
 
 
-# tests for run_tool() and list_methods()
-def test_run_tool_returns_expected_output():
-    metrics = ['ppc', 'c2st']
-    result = run_tool(metrics)
-    assert result == 'Running the tool with metric: ppc, c2st'
+@pytest.fixture
+def launched(monkeypatch):
+    """Capture the metrics and options run_tool is called with instead of running the benchmark."""
+    calls = []
+    monkeypatch.setattr(cli_tools, "run_tool", lambda metrics, **options: calls.append((metrics, options)))
+    return calls
+
+
+# tests for build_config(), list_methods() and list_tasks()
+def test_build_config_maps_options_to_grid_overrides():
+    cfg = build_config(["ppc", "c2st"], methods=["npe", "nle"], num_simulations=[100, 1000], seeds=[1, 2],
+                       workers=4, threads=2, chunk_size=500, resume=False, overrides=["task.tau_m=2.0"])
+    assert cfg.metric.name == "c2st_ppc"
+    assert cfg.grid.enabled is True
+    assert list(cfg.grid.methods) == ["npe", "nle"]
+    assert list(cfg.grid.num_simulations) == [100, 1000]
+    assert list(cfg.grid.seeds) == [1, 2]
+    assert (cfg.grid.workers, cfg.grid.threads, cfg.grid.simulation_batch_size) == (4, 2, 500)
+    assert cfg.force is True
+    assert cfg.task.tau_m == 2.0
+
+
+def test_build_config_defaults_resume_with_config_values():
+    cfg = build_config(["ppc"])
+    assert cfg.metric.name == "ppc"
+    assert cfg.force is False
+    assert list(cfg.grid.methods) == [] and cfg.grid.threads is None
+
 
+def test_list_methods_and_tasks_read_the_registries():
+    assert list_methods() == "Method 1: NPE\nMethod 2: NLE\nMethod 3: NRE"
+    assert "Task 1: misspecified_likelihood (LikelihoodMisspecifiedTask)" in list_tasks()
 
-def test_list_methods_returns_methods_list():
-    expected = "Method 1: ExampleMethodA\nMethod 2: ExampleMethodB"
-    assert list_methods() == expected
+
+def test_run_tool_runs_the_benchmark_and_consolidates(tmp_path, monkeypatch):
+    from src.utils.benchmark_run import task_registry
+    from tests.test_evaluate import DummyTask
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(task_registry, "test_task", DummyTask)
+
+    outdirs = cli_tools.run_tool(["c2st"], task="test_task", methods=["npe"], num_simulations=[10],
+                                 overrides=["inference.num_observations=2", "inference.num_posterior_samples=5",
+                                            "results_store=null", "memory.enabled=false"])
+    assert outdirs == ["outputs/DummyTask_NPE/sims_10"]
+    consolidated = pd.read_csv(tmp_path / "outputs/DummyTask_NPE/metrics_all.csv")
+    assert consolidated["observation_idx"].tolist() == [0, 1]
 
 
 # tests for handle_run_command()
-def test_handle_run_command_with_valid_metrics(monkeypatch, capsys):
+def test_handle_run_command_with_valid_metrics(monkeypatch, launched):
     args = argparse.Namespace(metrics='ppc,c2st')
     # No interactive input needed
     monkeypatch.setattr(builtins, 'input', lambda *args, **kwargs: '')
 
     handle_command(args)
-    captured = capsys.readouterr()
-    assert 'Running the tool with metric: ppc, c2st' in captured.out
+    assert launched == [(["ppc", "c2st"], {"resume": True})]
 
 
-def test_handle_run_command_with_invalid_metrics(monkeypatch, capsys):
+def test_handle_run_command_with_invalid_metrics(monkeypatch, capsys, launched):
     args = argparse.Namespace(metrics='ppc,nonsense')
     monkeypatch.setattr(builtins, 'input', lambda *args, **kwargs: '')
 
@@ -43,21 +82,31 @@ def test_handle_run_command_with_invalid_metrics(monkeypatch, capsys):
     captured = capsys.readouterr()
     assert 'Invalid metric: nonsense' in captured.out
     assert 'Valid metrics are:' in captured.out
+    assert launched == []
 
 
-# test ask_user_for_metrics()
-def test_ask_user_for_metrics(monkeypatch):
-    inputs = iter(['y', 'y', 'y', 'y'])
-    monkeypatch.setattr(builtins, 'input', lambda *args, **kwargs: next(inputs))
-    result = ask_user_for_metrics()
-    assert result == valid_metrics
-
-
-
-
+def test_main_parses_run_flags(launched):
+    main(["run", "--metric", "c2st", "--methods", "npe,nre", "--num-simulations", "100,1000", "--seeds", "7",
+          "--workers", "2", "--threads", "1", "--chunk-size", "256", "--force", "--set", "task.tau_m=1.5"])
+    assert launched == [(["c2st"], {
+        "methods": ["npe", "nre"], "num_simulations": [100, 1000], "seeds": [7], "workers": 2, "threads": 1,
+        "chunk_size": 256, "resume": False, "overrides": ["task.tau_m=1.5"],
+    })]
 
 
+def test_main_resumes_by_default(launched):
+    main(["run", "--metric", "ppc"])
+    assert launched == [(["ppc"], {"resume": True})]
 
 
+def test_main_lists_tasks(capsys):
+    main(["list-tasks"])
+    assert "misspecified_likelihood" in capsys.readouterr().out
 
 
+# test ask_user_for_metrics()
+def test_ask_user_for_metrics(monkeypatch):
+    inputs = iter(['y', 'y', 'y', 'y'])
+    monkeypatch.setattr(builtins, 'input', lambda *args, **kwargs: next(inputs))
+    result = ask_user_for_metrics()
+    assert result == valid_metrics
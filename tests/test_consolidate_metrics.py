@@ -163,7 +163,8 @@ def test_consolidate_required_columns_reordered(tmp_path):
     # Ensure the values for those columns match the original data
     pd.testing.assert_frame_equal(
         result_df[required].reset_index(drop=True),
-        df_bad[required].reset_index(drop=True)
+        df_bad[required].reset_index(drop=True),
+        check_dtype=False, check_categorical=False,  # base fieldnames are read as categoricals and int32
     )
 
 
@@ -203,5 +204,81 @@ def test_consolidate_extra_columns_reordered(tmp_path):
     # Underlying values should be preserved
     pd.testing.assert_frame_equal(
         result_df.reset_index(drop=True),
-        pd.DataFrame([{**{c: df.at[0, c] for c in required}, "a_meta": "foo", "z_meta": 123}])
+        pd.DataFrame([{**{c: df.at[0, c] for c in required}, "a_meta": "foo", "z_meta": 123}]),
+        check_dtype=False, check_categorical=False,
     )
+
+
+def test_incremental_appends_only_new_files(tmp_path, monkeypatch):
+    import src.utils.consolidate_metrics as cm
+    from src.utils.consolidate_metrics import manifest_path, update_consolidated_metrics
+
+    base = tmp_path / "TaskA_MethodA"
+    output_file = base / "metrics_all.csv"
+    create_dummy_csv(base / "sims_100" / "metrics.csv", "TaskA", "MethodA", 100, 0)
+    create_dummy_csv(base / "sims_200" / "metrics.csv", "TaskA", "MethodA", 200, 0)
+    consolidate_metrics(input_dir=base, output_file=output_file)
+    assert manifest_path(output_file).exists()
+
+    # Nothing changed: no file is read
+    read = []
+    original = cm.read_csv_files_by_path
+    monkeypatch.setattr(cm, "read_csv_files_by_path", lambda paths: read.extend(paths) or original(paths))
+    summary = update_consolidated_metrics(base, output_file)
+    assert summary == {"new": [], "modified": [], "removed": [], "rebuilt": False, "rows": 4}
+    assert read == []
+
+    # A new file is read alone and appended
+    create_dummy_csv(base / "sims_300" / "metrics.csv", "TaskA", "MethodA", 300, 0)
+    df = consolidate_metrics(input_dir=base, output_file=output_file, incremental=True)
+    assert read == [base / "sims_300" / "metrics.csv"]
+    assert len(df) == 6
+    assert sorted(df["num_simulations"].unique()) == [100, 200, 300]
+
+
+def test_incremental_replaces_modified_and_removed_files(tmp_path):
+    from src.utils.consolidate_metrics import update_consolidated_metrics
+
+    base = tmp_path / "TaskA_MethodA"
+    output_file = tmp_path / "metrics_all.csv"
+    for n in [100, 200, 300]:
+        create_dummy_csv(base / f"sims_{n}" / "metrics.csv", "TaskA", "MethodA", n, 0)
+    consolidate_metrics(input_dir=base, output_file=output_file)
+
+    # Modify sims_100 (one row instead of two), remove sims_200
+    pd.DataFrame([{"metric": "C2ST", "value": 0.9, "task": "TaskA", "method": "MethodA",
+                   "num_simulations": 100, "observation_idx": 0}]).to_csv(base / "sims_100" / "metrics.csv",
+                                                                          index=False)
+    (base / "sims_200" / "metrics.csv").unlink()
+
+    summary = update_consolidated_metrics(base, output_file)
+    assert summary["modified"] == ["sims_100/metrics.csv"]
+    assert summary["removed"] == ["sims_200/metrics.csv"]
+    assert not summary["rebuilt"]
+
+    df = pd.read_csv(output_file)
+    expected = consolidate_metrics(input_dir=base, output_file=tmp_path / "full.csv")
+    pd.testing.assert_frame_equal(
+        df.sort_values(["num_simulations", "metric"]).reset_index(drop=True),
+        expected.sort_values(["num_simulations", "metric"]).reset_index(drop=True),
+        check_dtype=False, check_categorical=False,
+    )
+
+
+def test_incremental_rebuilds_on_schema_change(tmp_path):
+    from src.utils.consolidate_metrics import update_consolidated_metrics
+
+    base = tmp_path / "TaskA_MethodA"
+    output_file = tmp_path / "metrics_all.csv"
+    create_dummy_csv(base / "sims_100" / "metrics.csv", "TaskA", "MethodA", 100, 0)
+    consolidate_metrics(input_dir=base, output_file=output_file)
+
+    path = base / "sims_200" / "metrics.csv"
+    create_dummy_csv(path, "TaskA", "MethodA", 200, 0)
+    pd.read_csv(path).assign(seed=1).to_csv(path, index=False)
+
+    summary = update_consolidated_metrics(base, output_file)
+    assert summary["rebuilt"]
+    df = pd.read_csv(output_file)
+    assert "seed" in df.columns
+    assert len(df) == 4
@@ -213,4 +213,87 @@ def test_read_csv_files_skip_error(tmp_path, monkeypatch, capsys):
     # Should log the failure for bad.csv
     assert "Failed to read" in captured.out
     # Restore pandas.read_csv
-    monkeypatch.setattr(pd, "read_csv", real_read_csv)
\ No newline at end of file
+    monkeypatch.setattr(pd, "read_csv", real_read_csv)
+
+def test_read_csv_files_applies_base_schema_in_parallel(tmp_path):
+    from src.utils.csv_utils import concat_frames, read_csv_files
+    paths = []
+    for i, method in enumerate(["NPE", "NLE", "NRE"]):
+        path = tmp_path / f"sims_{i}" / "metrics.csv"
+        path.parent.mkdir()
+        pd.DataFrame({
+            "metric": ["c2st"], "value": [0.5], "task": ["T"], "method": [method],
+            "num_simulations": [100 * (i + 1)], "observation_idx": [0], "seed": [i],
+        }).to_csv(path, index=False)
+        paths.append(path)
+
+    frames = read_csv_files(list(reversed(paths)), max_workers=3)
+    assert [df["method"].iloc[0] for df in frames] == ["NPE", "NLE", "NRE"]  # sorted path order
+    assert isinstance(frames[0]["method"].dtype, pd.CategoricalDtype)
+    assert frames[0]["num_simulations"].dtype == "int32"
+    assert frames[0]["value"].dtype == "float64"
+    assert frames[0]["seed"].dtype == "int64"  # columns outside the schema are inferred
+
+    combined = concat_frames(frames)
+    assert isinstance(combined["method"].dtype, pd.CategoricalDtype)
+    assert sorted(combined["method"].cat.categories) == ["NLE", "NPE", "NRE"]
+    assert combined["num_simulations"].tolist() == [100, 200, 300]
+
+
+def test_read_csv_files_falls_back_to_inference_for_missing_integers(tmp_path):
+    from src.utils.csv_utils import read_csv_files
+    path = tmp_path / "metrics.csv"
+    path.write_text("metric,value,num_simulations\nc2st,0.5,\n")
+    frames = read_csv_files([path])
+    assert len(frames) == 1
+    assert frames[0]["num_simulations"].isnull().all()
+
+
+def test_ensure_columns_does_not_copy_data():
+    import numpy as np
+    from src.utils.csv_utils import ensure_columns
+    ordered = pd.DataFrame({"metric": ["c2st"] * 3, "value": [0.5, 0.6, 0.7], "seed": [1, 2, 3]})
+    assert ensure_columns(ordered, ["metric", "value"]) is ordered
+
+    unordered = ordered[["seed", "value", "metric"]]
+    result = ensure_columns(unordered, ["metric", "value"])
+    assert list(result.columns) == ["metric", "value", "seed"]
+    assert np.shares_memory(result["value"].to_numpy(), unordered["value"].to_numpy())
+
+    with pytest.raises(ValueError, match="missing values"):
+        ensure_columns(pd.DataFrame({"metric": ["c2st", None]}), ["metric"])
+
+
+def test_concat_frames_unions_categories_without_object_columns():
+    from src.utils.csv_utils import as_categorical, concat_frames
+    frames = [
+        pd.DataFrame({"method": pd.Categorical([m, m]), "task": ["T", "T"], "value": [0.5, 0.6]})
+        for m in ("NPE", "NLE")
+    ]
+    combined = concat_frames(frames)
+    assert combined["method"].tolist() == ["NPE", "NPE", "NLE", "NLE"]
+    assert sorted(combined["method"].cat.categories) == ["NLE", "NPE"]
+
+    as_categorical(combined, ["task", "value", "missing"])
+    assert isinstance(combined["task"].dtype, pd.CategoricalDtype)
+    assert combined["value"].dtype == "float64"  # numeric columns are left untouched
+
+
+def test_read_csv_files_pushes_down_filters_and_columns(tmp_path, monkeypatch):
+    from src.utils.csv_utils import read_csv_files
+    monkeypatch.setattr(csv_utils, "FILTER_CHUNK_SIZE", 3)  # several chunks per file
+    path = tmp_path / "metrics.csv"
+    pd.DataFrame({
+        "metric": ["c2st", "ppc"] * 5, "value": [0.1 * i for i in range(10)], "task": "T",
+        "method": ["NPE"] * 6 + ["NLE"] * 4, "num_simulations": 100, "observation_idx": range(10),
+        "tau_m": [0.5 * i for i in range(10)],
+    }).to_csv(path, index=False)
+
+    [df] = read_csv_files([path], columns=["metric", "value", "tau_m"],
+                          filters={"metric": "c2st", "method": ["NPE"], "tau_m": (1.0, None)})
+    assert list(df.columns) == ["metric", "value", "tau_m"]  # 'method' is only read for filtering
+    assert df["tau_m"].tolist() == [1.0, 2.0]
+    assert isinstance(df["metric"].dtype, pd.CategoricalDtype)
+
+    [empty] = read_csv_files([path], filters={"lambda_val": 1})  # column not in the file
+    assert empty.empty
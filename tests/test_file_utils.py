@@ -152,3 +152,54 @@ def test_unique_path_non_strange_extensions(tmp_path):
     result = file_utils.unique_path(base, sep="-")
     expected = tmp_path / "filename-1"
     assert result == expected
+
+
+def test_atomic_write_replaces_only_on_success(tmp_path):
+    import pytest
+    target = tmp_path / "out" / "data.txt"
+    with file_utils.atomic_write(target) as f:
+        f.write("old")
+    assert target.read_text() == "old"
+
+    with pytest.raises(RuntimeError):
+        with file_utils.atomic_write(target) as f:
+            f.write("partial")
+            raise RuntimeError("interrupted")
+    assert target.read_text() == "old"
+    assert [p.name for p in target.parent.iterdir()] == ["data.txt"]  # no temporary files left behind
+
+
+def test_atomic_write_keeps_regular_file_permissions(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_utils, "_UMASK", 0o022)
+    target = tmp_path / "metrics.csv"
+    with file_utils.atomic_write(target) as f:
+        f.write("new")
+    assert target.stat().st_mode & 0o777 == 0o644  # not mkstemp's 0600
+
+    target.chmod(0o640)
+    with file_utils.atomic_write(target) as f:
+        f.write("replaced")
+    assert target.stat().st_mode & 0o777 == 0o640  # mode of the replaced file
+
+
+def _rewrite_repeatedly(path, n):
+    for i in range(n):
+        with file_utils.atomic_write(path) as f:
+            f.write("".join(f"{i},{j}\n" for j in range(2000)))
+
+
+def test_atomic_write_readers_never_see_partial_files(tmp_path):
+    import multiprocessing
+    path = tmp_path / "shared.csv"
+    _rewrite_repeatedly(path, 1)
+
+    writer = multiprocessing.get_context("fork").Process(target=_rewrite_repeatedly, args=(path, 200))
+    writer.start()
+    reads = 0
+    while writer.is_alive() or reads == 0:
+        lines = path.read_text().splitlines()
+        assert len(lines) == 2000
+        assert len({line.split(",")[0] for line in lines}) == 1  # all rows of one version
+        reads += 1
+    writer.join()
+    assert writer.exitcode == 0
@@ -0,0 +1,52 @@
+import pytest
+import torch
+
+from src.utils.io_utils import find_samples, load_samples, sample_filename, save_samples_to, storage_options
+
+
+@pytest.mark.parametrize("format, dtype, compress, filename", [
+    ("pt", "float32", False, "posterior_samples.pt"),
+    ("npy", "float32", False, "posterior_samples.npy"),
+    ("npy", "float16", False, "posterior_samples.npy"),
+    ("npy", "bfloat16", False, "posterior_samples.bf16.npy"),
+    ("npy", "float32", True, "posterior_samples.npz"),
+    ("pt", "bfloat16", True, "posterior_samples.bf16.npz"),
+])
+def test_round_trip_in_all_formats(tmp_path, format, dtype, compress, filename):
+    samples = torch.randn(200, 3)
+    path = save_samples_to(samples, tmp_path, format=format, dtype=dtype, compress=compress)
+    assert path.name == filename == sample_filename("posterior_samples", format=format, dtype=dtype,
+                                                   compress=compress)
+    assert find_samples(tmp_path) == path
+
+    loaded = load_samples(path)
+    assert loaded.shape == samples.shape
+    assert loaded.dtype == {"float32": torch.float32, "float16": torch.float16, "bfloat16": torch.bfloat16}[dtype]
+    tolerance = {"float32": 0, "float16": 1e-3, "bfloat16": 1e-2}[dtype]
+    torch.testing.assert_close(loaded.float(), samples, atol=tolerance * 4, rtol=tolerance)
+
+
+def test_npy_is_memory_mapped_and_smaller_when_downcast(tmp_path):
+    samples = torch.randn(10_000, 4)
+    full = save_samples_to(samples, tmp_path / "full", format="pt")
+    half = save_samples_to(samples, tmp_path / "half", format="npy", dtype="float16")
+    assert half.stat().st_size < 0.6 * full.stat().st_size
+
+    loaded = load_samples(save_samples_to(samples, tmp_path / "mmap", format="npy"))
+    assert loaded.float().data_ptr() == loaded.data_ptr()  # float32 needs no conversion copy
+    assert not loaded.numpy().flags["OWNDATA"]             # backed by the memory map
+
+
+def test_saving_another_format_removes_stale_files(tmp_path):
+    save_samples_to(torch.zeros(5, 2), tmp_path, format="pt")
+    save_samples_to(torch.ones(5, 2), tmp_path, format="npy")
+    assert [p.name for p in tmp_path.iterdir()] == ["posterior_samples.npy"]
+    assert load_samples(find_samples(tmp_path)).sum() == 10
+
+
+def test_invalid_options_raise():
+    with pytest.raises(ValueError, match="format"):
+        sample_filename("s", format="h5")
+    with pytest.raises(ValueError, match="dtype"):
+        sample_filename("s", dtype="int8")
+    assert storage_options(None) == {"format": "pt", "dtype": "float32", "compress": False}
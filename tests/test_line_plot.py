@@ -0,0 +1,47 @@
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.LinePlot import LinePlot
+
+
+def make_results(num_observations: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    rows = [
+        {"metric": metric, "value": rng.uniform(0.5, 1.0), "task": "Task", "method": method,
+         "num_simulations": sims, "observation_idx": idx}
+        for metric in ("c2st", "ppc") for method in ("NLE", "NPE") for sims in (100, 1000)
+        for idx in range(num_observations)
+    ]
+    df = pd.DataFrame(rows)
+    return df.astype({"metric": "category", "task": "category", "method": "category"})
+
+
+def test_aggregate_matches_groupwise_statistics(tmp_path):
+    df = make_results(5)
+    stats = LinePlot(tmp_path).aggregate(df)
+
+    assert len(stats) == 8
+    group = df[(df["metric"] == "ppc") & (df["method"] == "NPE") & (df["num_simulations"] == 1000)]["value"]
+    row = stats[(stats["task_metric"] == "Task__ppc") & (stats["method"] == "NPE")
+                & (stats["num_simulations"] == 1000)].iloc[0]
+    assert row["mean"] == pytest.approx(group.mean())
+    assert row["sd"] == pytest.approx(group.std())
+    assert row["count"] == 5
+
+
+@pytest.mark.parametrize("num_observations", [1, 50])
+def test_lines_are_drawn_from_aggregated_points(tmp_path, num_observations):
+    plot = LinePlot(tmp_path, base_directory=tmp_path, filename="plot.png")
+    df = make_results(num_observations)
+    fig, axes = plot.plot(df)
+
+    assert len(axes) == 4  # (task, metric) rows x method columns
+    for ax in axes:
+        assert len(ax.lines[0].get_xdata()) == 2  # one point per num_simulations, regardless of observations
+    assert plot.stats["count"].eq(num_observations).all()
+    assert plot.stats["sd"].isna().all() == (num_observations == 1)
+    assert plot.save(fig).name == "plot.png"
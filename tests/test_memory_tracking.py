@@ -0,0 +1,86 @@
+import warnings
+
+import pandas as pd
+import pytest
+import torch
+
+from src.utils.memory_tracking import MemoryTracker, track_stage
+
+
+def test_track_stage_without_tracker_is_noop():
+    with track_stage("simulation", estimated_bytes=10 ** 15):
+        x = torch.ones(3)
+    assert x.sum() == 3
+
+
+def test_stages_are_recorded_and_merged():
+    with MemoryTracker(track_python=True) as tracker:
+        with track_stage("simulation"):
+            data = [bytearray(1024) for _ in range(1000)]
+        for _ in range(3):
+            with track_stage("sampling"):
+                torch.randn(100, 2)
+
+    assert list(tracker.stages) == ["simulation", "sampling"]
+    assert tracker.stages["sampling"]["calls"] == 3
+    assert tracker.stages["simulation"]["python_peak_mb"] >= 1.0
+    assert tracker.stages["simulation"]["peak_rss_mb"] > 0
+    del data
+
+
+def test_python_allocations_are_only_traced_on_request():
+    import tracemalloc
+    with MemoryTracker() as tracker:
+        assert not tracemalloc.is_tracing()
+        with track_stage("simulation"):
+            torch.randn(100, 2)
+    assert tracker.stages["simulation"].get("python_peak_mb") is None
+    assert tracker.stages["simulation"]["peak_rss_mb"] > 0
+
+
+def test_track_tensors_records_largest_allocation():
+    with MemoryTracker(track_tensors=True) as tracker:
+        with track_stage("training"):
+            small = torch.ones(10)
+            large = torch.zeros(1000, 256)
+
+    record = tracker.stages["training"]
+    assert record["largest_tensor_mb"] == pytest.approx(1000 * 256 * 4 / 1024 ** 2)
+    assert record["largest_tensor_shape"] == "1000x256"
+    assert small.numel() + large.numel() > 0
+
+
+def test_ceiling_warnings():
+    with MemoryTracker(ceiling_mb=1) as tracker:
+        with pytest.warns(UserWarning, match="would raise memory usage"):
+            with warnings.catch_warnings():
+                warnings.simplefilter("always")
+                with track_stage("sampling", estimated_bytes=10 * 1024 ** 2):
+                    pass
+    assert "sampling" in tracker.stages
+
+
+def test_save_writes_csv(tmp_path):
+    with MemoryTracker() as tracker:
+        with track_stage("c2st"):
+            pass
+    path = tracker.save(tmp_path / "run" / "memory.csv")
+
+    df = pd.read_csv(path)
+    assert list(df.columns) == MemoryTracker.FIELDNAMES
+    assert df["stage"].tolist() == ["c2st"]
+
+
+def test_save_keeps_the_previous_file_on_error(tmp_path, monkeypatch):
+    import pytest
+    with MemoryTracker() as tracker:
+        with track_stage("c2st"):
+            pass
+    path = tracker.save(tmp_path / "memory.csv")
+    original = path.read_bytes()
+
+    monkeypatch.setattr(tracker, "to_rows", lambda: [{"stage": "ppc"}, None])
+    with pytest.raises(Exception):
+        tracker.save(path)
+    assert path.read_bytes() == original
+    assert [p.name for p in tmp_path.iterdir()] == ["memory.csv"]
@@ -60,3 +60,69 @@ def test_simulator_mixes_distributions():
     max_val = output.max().item()
 
     assert min_val < 0 or max_val > 1  # Simulator likely didn't mix both Beta and Normal samples
+
+
+def test_common_random_numbers_are_shared_across_parameters():
+    theta = torch.zeros(2000, 2)
+    low = LikelihoodMisspecifiedTask(dim=2, tau_m=1.0, lambda_val=0.2, common_random_numbers=True)
+    high = LikelihoodMisspecifiedTask(dim=2, tau_m=4.0, lambda_val=0.2, common_random_numbers=True)
+    x_low, x_high = low.simulator(theta), high.simulator(theta)
+
+    # Same Bernoulli mask and Beta samples; the Gaussian rows only differ by the scale sqrt(tau_m)
+    beta_rows = (x_low == x_high).all(dim=1)
+    assert 0.15 < beta_rows.float().mean() < 0.25
+    assert torch.allclose(x_high[~beta_rows], 2 * x_low[~beta_rows])
+
+    # A larger lambda_val keeps every Beta row and turns further rows into Beta rows
+    more = LikelihoodMisspecifiedTask(dim=2, tau_m=1.0, lambda_val=0.5, common_random_numbers=True)
+    assert torch.equal(more.simulator(theta)[beta_rows], x_low[beta_rows])
+
+    # Another seed gives other numbers
+    other = LikelihoodMisspecifiedTask(dim=2, tau_m=1.0, lambda_val=0.2, common_random_numbers=True, crn_seed=1)
+    assert not torch.equal(other.simulator(theta), x_low)
+
+
+def test_common_random_numbers_match_the_model():
+    task = LikelihoodMisspecifiedTask(dim=2, tau_m=2.0, lambda_val=0.3, common_random_numbers=True)
+    theta = torch.ones(20000, 2)
+    x = task.simulator(theta)
+    is_beta = ((x > 0) & (x < 1)).all(dim=1) & (task.simulator(theta * 5) == x).all(dim=1)
+
+    assert abs(is_beta.float().mean() - 0.3) < 0.02
+    assert abs(x[is_beta].mean() - 2 / 7) < 0.01             # mean of Beta(2, 5)
+    assert abs(x[~is_beta].var() - 2.0) < 0.1                # variance tau_m
+
+
+def test_common_random_numbers_do_not_depend_on_chunking():
+    from src.utils.benchmark_run import simulate
+    task = LikelihoodMisspecifiedTask(dim=2, tau_m=1.0, lambda_val=0.5, common_random_numbers=True)
+    theta = torch.randn(10000, 2)
+
+    whole = task.simulator(theta)
+    assert torch.equal(simulate(task, theta, batch_size=3000), whole)
+    assert torch.equal(task.simulator(theta[5000:], offset=5000), whole[5000:])
+
+
+def test_simulate_grid_shapes_and_parameters():
+    task = LikelihoodMisspecifiedTask(dim=2, tau_m=1.0, lambda_val=0.0)
+    theta = torch.zeros(500, 2)
+    tau = torch.tensor([0.01, 100.0, 1.0])
+    lam = torch.tensor([0.0, 0.0, 1.0])
+
+    x = task.simulate_grid(theta, tau, lam)
+    assert x.shape == (3, 500, 2)
+    assert x[0].abs().max() < 1.0                        # N(0, 0.01)
+    assert x[1].std() > 5.0                              # N(0, 100)
+    assert ((x[2] > 0) & (x[2] < 1)).all()               # Beta(2, 5) only
+    assert task.simulate_grid(theta).shape == (1, 500, 2)
+
+
+def test_simulate_grid_matches_single_tasks_with_common_random_numbers():
+    theta = torch.randn(300, 2)
+    tau, lam = [0.5, 2.0], [0.1, 0.4]
+    task = LikelihoodMisspecifiedTask(dim=2, tau_m=1.0, lambda_val=0.0, common_random_numbers=True)
+    x = task.simulate_grid(theta, torch.tensor(tau), torch.tensor(lam), offset=7)
+
+    for g in range(2):
+        single = LikelihoodMisspecifiedTask(dim=2, tau_m=tau[g], lambda_val=lam[g], common_random_numbers=True)
+        assert torch.allclose(x[g], single.simulator(theta, offset=7))
@@ -0,0 +1,110 @@
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+from omegaconf import OmegaConf
+
+from hydra_plugins.sbi_parallel_launcher.parallel_launcher import (
+    estimate_job_cost,
+    resolve_pool_size,
+    schedule,
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+METHOD_COST = {"npe": 1.0, "nle": 4.0, "nre": 3.0}
+
+
+def test_estimate_job_cost_weights_budget_by_method():
+    npe = OmegaConf.create({"inference": {"method": "NPE", "num_simulations": 1000}})
+    nle = OmegaConf.create({"inference": {"method": "NLE", "num_simulations": 1000}})
+    unknown = OmegaConf.create({"inference": {"method": "SNPE_X", "num_simulations": 10}})
+    assert estimate_job_cost(npe, METHOD_COST) == 1000
+    assert estimate_job_cost(nle, METHOD_COST) == 4000
+    assert estimate_job_cost(unknown, METHOD_COST) == 10
+    assert estimate_job_cost(OmegaConf.create({}), METHOD_COST) == 0
+
+
+def test_schedule_orders_expensive_jobs_first_and_keeps_ties_stable():
+    assert schedule([100, 4000, 1000, 4000]) == [1, 3, 2, 0]
+
+
+def test_resolve_pool_size_respects_all_limits(monkeypatch):
+    import hydra_plugins.sbi_parallel_launcher.parallel_launcher as pl
+    monkeypatch.setattr(pl.os, "cpu_count", lambda: 8)
+    monkeypatch.setattr(pl, "available_memory_mb", lambda: 4096)
+
+    assert resolve_pool_size(10, None, 1024) == 4    # memory bound
+    assert resolve_pool_size(10, 6, 8192) == 6       # explicit n_jobs overrides cores and memory
+    assert resolve_pool_size(2, 6, 1024) == 2
+    assert resolve_pool_size(3, None, 512) == 3      # job bound
+    assert resolve_pool_size(10, None, 8192) == 1    # never below one worker
+
+
+def test_execute_job_measures_its_own_duration(monkeypatch):
+    import time
+    import hydra_plugins.sbi_parallel_launcher.parallel_launcher as pl
+    sweep_config = OmegaConf.create({"hydra": {"job": {"num": 0}}})
+    monkeypatch.setattr(pl, "_LAUNCH_STATE", {"hydra_context": None, "task_function": None,
+                                              "sweep_configs": [sweep_config]})
+    monkeypatch.setattr(pl, "run_job", lambda **kwargs: time.sleep(0.2) or "run")
+
+    run, seconds = pl._execute_job(0)
+    assert run == "run"
+    assert seconds >= 0.2
+
+
+def test_launcher_runs_sweep_and_triggers_multirun_end(tmp_path):
+    app = tmp_path / "app.py"
+    app.write_text(textwrap.dedent("""
+        import os
+        from pathlib import Path
+
+        import hydra
+        from hydra.experimental.callback import Callback
+
+
+        class MarkerCallback(Callback):
+            def on_multirun_end(self, config, **kwargs):
+                Path(config.hydra.sweep.dir, "multirun_end").write_text("done")
+
+
+        @hydra.main(config_path=None, config_name=None, version_base="1.3")
+        def main(cfg):
+            Path(cfg.out, f"{cfg.inference.method}_{cfg.inference.num_simulations}").write_text(str(os.getpid()))
+            return cfg.inference.num_simulations
+
+
+        if __name__ == "__main__":
+            main()
+    """))
+    sweep_dir = tmp_path / "multirun"
+    out = tmp_path / "out"
+    out.mkdir()
+
+    result = subprocess.run(
+        [
+            sys.executable, str(app), "-m",
+            "hydra/launcher=sbi_parallel", "hydra.launcher.n_jobs=2",
+            f"hydra.sweep.dir={sweep_dir}",
+            "+hydra.callbacks.marker._target_=__main__.MarkerCallback",
+            f"+out={out}",
+            "+inference.method=NPE,NLE",
+            "+inference.num_simulations=10,100",
+        ],
+        cwd=tmp_path,
+        env={"PYTHONPATH": str(REPO_ROOT), "PATH": "/usr/bin:/bin"},
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+
+    assert sorted(p.name for p in out.iterdir()) == ["NLE_10", "NLE_100", "NPE_10", "NPE_100"]
+    assert (sweep_dir / "multirun_end").read_text() == "done"
+    # The most expensive job is scheduled first
+    log = result.stdout + result.stderr
+    assert "Launching 4 jobs on 2 worker(s)" in log
+    first_scheduled = log.split("Launching 4 jobs")[1].splitlines()[1]
+    assert "inference.method=NLE" in first_scheduled and "inference.num_simulations=100" in first_scheduled
+    assert log.count("completed after") == 4
@@ -29,3 +29,39 @@ def test_creates_png(tmp_path):
 
     finally:
         os.chdir(cwd)
+
+
+def test_batch_renders_all_combinations_in_parallel(tmp_path, monkeypatch):
+    from src.utils.plot_metric_vs_taskparam import plot_metrics_vs_taskparams
+    csv_path = tmp_path / "metrics_all.csv"
+    rows = [
+        [metric, 0.7 + 0.01 * i, "Task", "Method", 1000, i, 0.5 * i]
+        for metric in ("C2ST", "PPC") for i in range(4)
+    ]
+    _write_csv(csv_path, rows)
+    with csv_path.open() as f:
+        lines = f.read().splitlines()
+    csv_path.write_text("\n".join([lines[0] + ",lambda_val"] + [l + f",{i}" for i, l in enumerate(lines[1:])]) + "\n")
+
+    monkeypatch.chdir(tmp_path)
+    paths = plot_metrics_vs_taskparams(str(csv_path), ["C2ST", "PPC", "missing"], ["tau_m", "lambda_val"],
+                                       max_workers=2)
+
+    assert [p.name if p else None for p in paths] == [
+        "C2ST__vs__tau_m.png", "C2ST__vs__lambda_val.png", "PPC__vs__tau_m.png", "PPC__vs__lambda_val.png",
+        None, None,  # a failing combination doesn't stop the others
+    ]
+    for path in filter(None, paths):
+        assert (tmp_path / path).stat().st_size > 0
+
+
+def test_only_the_metric_rows_and_plot_columns_are_loaded(tmp_path):
+    from src.utils.plot_metric_vs_taskparam import MetricVsTaskParamPlot
+    csv_path = tmp_path / "metrics_all.csv"
+    _write_csv(csv_path, [["C2ST", 0.7, "Task", "Method", 1000, 0, 0.5], ["PPC", 0.6, "Task", "Method", 1000, 0, 0.5]])
+
+    plot = MetricVsTaskParamPlot(csv_path, metric="PPC", task_param="tau_m")
+    df = plot.load_data()
+    assert df["metric"].tolist() == ["PPC"]
+    assert list(df.columns) == ["metric", "value", "task", "method", "tau_m"]
+    assert plot.data is df
@@ -0,0 +1,122 @@
+import os
+
+import pandas as pd
+import pytest
+from omegaconf import OmegaConf
+
+import src.utils.postprocess_callback as pp
+from src.utils.postprocess_callback import PostProcessCallback
+
+
+def write_job(sweep_dir, idx, method, num_simulations):
+    # Configs name methods in lower case (inference/npe.yaml: method: npe); output folders use upper case
+    cfg_dir = sweep_dir / str(idx) / ".hydra"
+    cfg_dir.mkdir(parents=True)
+    OmegaConf.save(
+        OmegaConf.create({
+            "task": {"name": "misspecified_likelihood"},
+            "inference": {"method": method.lower(), "num_simulations": num_simulations},
+        }),
+        cfg_dir / "config.yaml",
+    )
+
+
+def write_metrics(method, num_simulations, value=0.5):
+    path = f"outputs/LikelihoodMisspecifiedTask_{method}/sims_{num_simulations}/metrics.csv"
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pd.DataFrame({
+        "metric": ["c2st", "c2st"],
+        "value": [value, value + 0.1],
+        "task": ["LikelihoodMisspecifiedTask"] * 2,
+        "method": [method] * 2,
+        "num_simulations": [num_simulations] * 2,
+        "observation_idx": [0, 1],
+    }).to_csv(path, index=False)
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rendered = []
+
+    class FakeLinePlot:
+        def __init__(self, data_sources, save_directory, filename):
+            rendered.append(str(save_directory))
+
+        def run(self):
+            pass
+
+        @classmethod
+        def render_batch(cls, specs, **kwargs):
+            return [cls(**spec).run() for spec in specs]
+
+    monkeypatch.setattr(pp, "LinePlot", FakeLinePlot)
+    return tmp_path, rendered
+
+
+def run_callback(sweep_dir):
+    PostProcessCallback().on_multirun_end(OmegaConf.create({"hydra": {"sweep": {"dir": str(sweep_dir)}}}))
+
+
+def test_consolidates_and_plots_each_group(workspace):
+    tmp_path, rendered = workspace
+    sweep = tmp_path / "multirun" / "a"
+    for idx, (method, n) in enumerate([("NPE", 100), ("NPE", 1000), ("NLE", 100)]):
+        write_job(sweep, idx, method, n)
+        write_metrics(method, n)
+
+    run_callback(sweep)
+
+    npe = pd.read_csv("outputs/LikelihoodMisspecifiedTask_NPE/metrics_all.csv")
+    assert sorted(npe["num_simulations"].unique()) == [100, 1000]
+    assert len(pd.read_csv("outputs/LikelihoodMisspecifiedTask_NLE/metrics_all.csv")) == 2
+    assert sorted(rendered) == sorted([
+        "outputs/LikelihoodMisspecifiedTask_NPE/plots", "outputs/LikelihoodMisspecifiedTask_NLE/plots", "outputs/plots"
+    ])
+
+
+def test_second_multirun_appends_new_rows_and_skips_unchanged_groups(workspace, monkeypatch):
+    tmp_path, rendered = workspace
+    first = tmp_path / "multirun" / "a"
+    write_job(first, 0, "NPE", 100)
+    write_job(first, 1, "NLE", 100)
+    write_metrics("NPE", 100)
+    write_metrics("NLE", 100)
+    run_callback(first)
+    rendered.clear()
+
+    # The second multirun only adds a budget for NPE: NLE is neither re-consolidated nor re-plotted
+    summaries = []
+    update = pp.update_consolidated_metrics
+    monkeypatch.setattr(pp, "update_consolidated_metrics", lambda **kw: summaries.append(update(**kw)) or summaries[-1])
+    second = tmp_path / "multirun" / "b"
+    write_job(second, 0, "NPE", 1000)
+    write_job(second, 1, "NLE", 100)
+    write_metrics("NPE", 1000)
+    run_callback(second)
+
+    # Only the new file was read and appended
+    assert [(s["new"], s["rebuilt"]) for s in summaries] == [(["sims_1000/metrics.csv"], False), ([], False)]
+    npe = pd.read_csv("outputs/LikelihoodMisspecifiedTask_NPE/metrics_all.csv")
+    assert len(npe) == 4
+    assert sorted(npe["num_simulations"].unique()) == [100, 1000]
+    assert "outputs/LikelihoodMisspecifiedTask_NLE/plots" not in rendered
+    assert "outputs/LikelihoodMisspecifiedTask_NPE/plots" in rendered
+
+
+def test_modified_file_triggers_rebuild_and_unchanged_rerun_does_nothing(workspace):
+    tmp_path, rendered = workspace
+    sweep = tmp_path / "multirun" / "a"
+    write_job(sweep, 0, "NPE", 100)
+    write_metrics("NPE", 100)
+    run_callback(sweep)
+
+    rendered.clear()
+    run_callback(sweep)
+    assert rendered == []
+
+    write_metrics("NPE", 100, value=0.9)
+    run_callback(sweep)
+    npe = pd.read_csv("outputs/LikelihoodMisspecifiedTask_NPE/metrics_all.csv")
+    assert npe["value"].tolist() == pytest.approx([0.9, 1.0])
+    assert rendered == ["outputs/LikelihoodMisspecifiedTask_NPE/plots"]
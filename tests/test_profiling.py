@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+from src.utils.cli_tools import main
+from src.utils.profiling import SamplingProfiler, bench
+
+
+def busy_wait(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+@pytest.fixture
+def dummy_task(monkeypatch):
+    from src.utils.benchmark_run import task_registry
+    from tests.test_evaluate import DummyTask
+    monkeypatch.setitem(task_registry, "test_task", DummyTask)
+    return "test_task"
+
+
+# tests for SamplingProfiler
+def test_sampling_profiler_records_the_running_function(tmp_path):
+    with SamplingProfiler(interval=0.001) as profiler:
+        busy_wait(0.2)
+
+    assert profiler.num_samples > 0
+    labels = [label for label, _, _ in profiler.top(1)]
+    assert labels == [f"{__name__}:busy_wait"]
+
+    path = profiler.write_collapsed(tmp_path / "run.folded")
+    lines = path.read_text().splitlines()
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == profiler.num_samples
+    assert any(line.split(" ")[0].endswith(f"{__name__}:busy_wait") for line in lines)
+
+
+# tests for bench()
+@pytest.mark.parametrize("profiler", ["cprofile", "sampling"])
+def test_bench_reports_stage_timings_per_size(tmp_path, dummy_task, profiler, capsys):
+    results = bench(task=dummy_task, method="npe", metrics=["c2st"], sizes=[20, 30], num_posterior_samples=20,
+                    profiler=profiler, interval=0.001, top=5, collapsed=tmp_path / "bench.folded",
+                    workdir=tmp_path / "work")
+
+    assert [r["size"] for r in results] == [20, 30]
+    for result in results:
+        stages = result["stages"]
+        assert {"simulation", "training", "sampling"} <= set(stages["stage"])
+        assert (stages["seconds"] >= 0).all() and result["seconds"] > 0
+        assert result["collapsed"] == tmp_path / f"bench_{result['size']}.folded"
+        assert result["collapsed"].is_file()
+
+    out = capsys.readouterr().out
+    assert "Top 5 functions" in out and "By own time" in out and "Total:" in out
+
+
+def test_bench_rejects_unknown_profiler(dummy_task):
+    with pytest.raises(ValueError, match="Unknown profiler"):
+        bench(task=dummy_task, profiler="perf")
+
+
+# tests for the CLI command
+def test_cli_bench_passes_options(monkeypatch):
+    import src.utils.profiling as profiling
+    calls = []
+    monkeypatch.setattr(profiling, "bench", lambda **options: calls.append(options))
+
+    main(["bench", "--method", "nle", "--metric", "c2st,ppc", "--num-simulations", "100,1000",
+          "--profiler", "sampling", "--collapsed", "out.folded", "--set", "seed=3"])
+
+    options = calls[0]
+    assert options["method"] == "nle" and options["metrics"] == ["c2st", "ppc"]
+    assert options["sizes"] == [100, 1000] and options["profiler"] == "sampling"
+    assert options["collapsed"] == "out.folded" and options["overrides"] == ["seed=3"]
+
+
+def test_cli_bench_rejects_invalid_metric(monkeypatch, capsys):
+    import src.utils.profiling as profiling
+    monkeypatch.setattr(profiling, "bench", lambda **options: pytest.fail("bench should not run"))
+    main(["bench", "--metric", "foo"])
+    assert "Invalid metric: foo" in capsys.readouterr().out
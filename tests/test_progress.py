@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+from src.utils.cli_tools import main
+from src.utils.progress import ProgressReporter, collect_status, format_status, read_status, report_progress
+
+
+def read_events(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+# tests for ProgressReporter and report_progress()
+def test_reporter_records_stages_throughput_and_eta(tmp_path, monkeypatch):
+    clock = iter([100.0, 100.0, 101.0, 102.0, 102.0, 104.0, 104.0, 104.0, 104.0, 105.0, 105.0])
+    monkeypatch.setattr("src.utils.progress.time.time", lambda: next(clock))
+    path = tmp_path / "job" / "status.jsonl"
+
+    with ProgressReporter(path, total=4, method="NPE"):
+        report_progress("sampling", completed=0)
+        report_progress("sampling", completed=2)
+
+    events = read_events(path)
+    assert [e["stage"] for e in events] == ["start", "sampling", "sampling", "done"]
+    assert events[2]["throughput"] == pytest.approx(1.0)    # 2 observations in 2 s
+    assert events[2]["eta"] == pytest.approx(2.0)           # 2 left
+    assert events[-1]["state"] == "done" and events[-1]["completed"] == 4
+    assert all(e["method"] == "NPE" for e in events)
+
+
+def test_reporter_records_failure(tmp_path):
+    path = tmp_path / "status.jsonl"
+    with pytest.raises(RuntimeError):
+        with ProgressReporter(path, total=1):
+            report_progress("training")
+            raise RuntimeError("diverged")
+
+    last = read_events(path)[-1]
+    assert last["state"] == "failed" and last["stage"] == "training"
+    assert last["error"] == "RuntimeError: diverged"
+
+
+def test_report_progress_without_reporter_is_noop(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    report_progress("sampling", completed=1)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_reporter_restarts_status_file(tmp_path):
+    path = tmp_path / "status.jsonl"
+    path.write_text('{"stage": "stale"}\n')
+    with ProgressReporter(path, total=1):
+        pass
+    assert [e["stage"] for e in read_events(path)] == ["start", "done"]
+
+
+def test_reporter_writes_mirrors(tmp_path):
+    path, mirror = tmp_path / "outputs" / "status.jsonl", tmp_path / "multirun" / "0" / "status.jsonl"
+    with ProgressReporter(path, total=1, mirrors=[mirror]):
+        report_progress("sampling", completed=1)
+    assert path.read_text() == mirror.read_text()
+    assert [e["stage"] for e in read_events(mirror)] == ["start", "sampling", "done"]
+
+
+# tests for read_status(), collect_status() and format_status()
+def test_read_status_skips_partial_last_line(tmp_path):
+    path = tmp_path / "status.jsonl"
+    path.write_text('{"stage": "training", "time": 1}\n{"stage": "samp')
+    assert read_status(path)["stage"] == "training"
+    assert read_status(tmp_path / "missing.jsonl") is None
+
+
+def test_collect_and_format_status(tmp_path):
+    with ProgressReporter(tmp_path / "A_NPE/sims_10/status.jsonl", total=2):
+        pass
+    with ProgressReporter(tmp_path / "A_NLE/sims_10/status.jsonl", total=3) as running:
+        running.update("evaluation", completed=1)
+        events = collect_status(tmp_path)
+
+    assert [e["state"] for e in events] == ["running", "done"]   # sorted by path: A_NLE before A_NPE
+
+    view = format_status(events)
+    assert "evaluation" in view and "1/3" in view
+    assert "2 jobs: 1 done, 1 running, 0 failed; 3/5 observations evaluated" in view
+    assert format_status([]) == "No status files found."
+
+
+def test_format_status_marks_silent_running_jobs_as_stale():
+    events = [
+        {"path": "a/status.jsonl", "time": 0.0, "state": "running", "stage": "training", "completed": 0, "total": 2},
+        {"path": "b/status.jsonl", "time": 990.0, "state": "running", "stage": "training", "completed": 0, "total": 2},
+        {"path": "c/status.jsonl", "time": 0.0, "state": "done", "stage": "done", "completed": 2, "total": 2},
+    ]
+    view = format_status(events, now=1000.0, stale_after=600.0)
+    assert "3 jobs: 1 done, 1 running, 0 failed, 1 stale; 2/6 observations evaluated" in view
+    assert view.splitlines()[1].split()[:2] == ["a", "stale"]
+
+
+# tests for the CLI command
+def test_cli_status_prints_progress(tmp_path, capsys):
+    with ProgressReporter(tmp_path / "run" / "status.jsonl", total=2):
+        pass
+    main(["status", str(tmp_path)])
+    assert "1 jobs: 1 done, 0 running, 0 failed; 2/2 observations evaluated" in capsys.readouterr().out
@@ -0,0 +1,73 @@
+import json
+import os
+
+import matplotlib
+matplotlib.use("Agg")
+
+import pandas as pd
+import pytest
+
+from src.utils.LinePlot import LinePlot
+from src.utils.render_cache import RenderCache, data_signature
+
+
+def write_metrics(path, values):
+    pd.DataFrame({
+        "metric": "c2st", "value": values, "task": "Task", "method": "NPE",
+        "num_simulations": [100 * (i + 1) for i in range(len(values))], "observation_idx": 0,
+    }).to_csv(path, index=False)
+
+
+@pytest.fixture
+def metrics(tmp_path):
+    path = tmp_path / "metrics_all.csv"
+    write_metrics(path, [0.9, 0.8, 0.7])
+    return path
+
+
+def test_unchanged_plot_is_not_rendered_again(tmp_path, metrics, monkeypatch):
+    first = LinePlot(metrics, base_directory=tmp_path).run()
+    assert first.name == "LinePlot.png"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("unchanged plot was rendered again")
+    monkeypatch.setattr(LinePlot, "load_data", fail)
+    assert LinePlot(metrics, base_directory=tmp_path).run() == first
+
+    index = json.loads((tmp_path / "outputs" / ".plot_cache.json").read_text())["entries"]
+    assert [entry["path"] for entry in index.values()] == [str(first)]
+
+
+def test_changed_data_or_parameters_are_rendered(tmp_path, metrics):
+    first = LinePlot(metrics, base_directory=tmp_path).run()
+
+    write_metrics(metrics, [0.9, 0.8, 0.6])
+    os.utime(metrics, ns=(1, 1))  # a different mtime, independent of the file system's timestamp resolution
+    assert LinePlot(metrics, base_directory=tmp_path).run() == first  # replaces the image, no LinePlot_1.png
+
+    assert LinePlot(metrics, base_directory=tmp_path, title="Other").run().name == "LinePlot_1.png"
+    assert LinePlot(metrics, base_directory=tmp_path, cache=False).run().name == "LinePlot_2.png"
+    assert sorted(p.name for p in (tmp_path / "outputs" / "plots").iterdir()) == [
+        "LinePlot.png", "LinePlot_1.png", "LinePlot_2.png"
+    ]
+
+
+def test_deleted_image_is_rendered_again(tmp_path, metrics):
+    first = LinePlot(metrics, base_directory=tmp_path, filename="plot.png").run()
+    (tmp_path / first).unlink()
+    assert LinePlot(metrics, base_directory=tmp_path, filename="plot.png").run() == first
+    assert (tmp_path / first).is_file()
+
+
+def test_render_cache_index(tmp_path, metrics):
+    cache = RenderCache(tmp_path / "index.json", tmp_path)
+    params = {"x": "num_simulations"}
+    key = RenderCache.key(params, data_signature([metrics]))
+    assert cache.lookup(key) is None
+
+    image = tmp_path / "plot.png"
+    image.write_bytes(b"png")
+    cache.record(key, params, image)
+    assert cache.lookup(key) == image
+    assert cache.previous_path(params) == image
+    assert cache.previous_path({"x": "tau_m"}) is None
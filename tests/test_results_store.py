@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from src.utils.results_store import ResultsStore
+
+
+def make_rows(task="TaskA", method="NPE", num_simulations=100, metrics=("c2st", "ppc"), num_obs=2, **metadata):
+    return [
+        {
+            "metric": metric,
+            "value": 0.5 + 0.1 * obs_idx,
+            "task": task,
+            "method": method,
+            "num_simulations": num_simulations,
+            "observation_idx": obs_idx,
+            **metadata,
+        }
+        for obs_idx in range(num_obs)
+        for metric in metrics
+    ]
+
+
+def test_write_and_query_filters(tmp_path):
+    with ResultsStore(tmp_path / "results.sqlite") as store:
+        assert store.write(make_rows(method="NPE")) == 4
+        assert store.write(make_rows(method="NLE", num_simulations=1000)) == 4
+
+        assert len(store.query()) == 8
+        df = store.query(method="NLE", metric="c2st")
+        assert len(df) == 2
+        assert set(df["num_simulations"]) == {1000}
+        assert len(store.query(method=["NPE", "NLE"], num_simulations=100)) == 4
+
+
+def test_query_column_projection(tmp_path):
+    with ResultsStore(tmp_path / "results.sqlite") as store:
+        store.write(make_rows())
+        df = store.query(metric="ppc", columns=["value", "observation_idx"])
+        assert list(df.columns) == ["value", "observation_idx"]
+        assert len(df) == 2
+
+
+def test_metadata_columns_are_added(tmp_path):
+    with ResultsStore(tmp_path / "results.sqlite") as store:
+        store.write(make_rows())
+        store.write(make_rows(num_simulations=200, seed=np.int64(3), tau_m=np.float32(2.0)))
+
+        assert store.columns[:6] == ["metric", "value", "task", "method", "num_simulations", "observation_idx"]
+        assert {"seed", "tau_m"} <= set(store.columns)
+        df = store.query(seed=3)
+        assert len(df) == 4
+        assert set(df["tau_m"]) == {2.0}
+
+
+def test_replace_overwrites_matching_rows(tmp_path):
+    path = tmp_path / "results.sqlite"
+    with ResultsStore(path) as store:
+        store.write(make_rows(num_simulations=100))
+        store.write(make_rows(num_simulations=200))
+        store.write(make_rows(num_simulations=100, num_obs=1), replace={"num_simulations": 100})
+
+    # Reopening reads the persisted table
+    with ResultsStore(path) as store:
+        assert len(store.query(num_simulations=100)) == 2
+        assert len(store.query(num_simulations=200)) == 4
+
+
+def test_write_missing_base_column_raises(tmp_path):
+    with ResultsStore(tmp_path / "results.sqlite") as store:
+        with pytest.raises(ValueError) as exc:
+            store.write([{"metric": "c2st", "value": 0.5}])
+        assert "Missing required columns" in str(exc.value)
+
+
+def test_query_unknown_column_raises(tmp_path):
+    with ResultsStore(tmp_path / "results.sqlite") as store:
+        with pytest.raises(ValueError) as exc:
+            store.query(columns=["nope"])
+        assert "Unknown result columns" in str(exc.value)
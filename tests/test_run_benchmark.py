@@ -1,9 +1,11 @@
+import pytest
 import pandas as pd
 from omegaconf import OmegaConf
 
 from src.utils.benchmark_run import run_benchmark, task_registry
 from tests.test_evaluate import DummyTask
 
+
 def test_cfg():
     return OmegaConf.create({
         "task": {"name": "test_task"},
@@ -17,10 +19,11 @@ def test_cfg():
         "random_seed": 42
     })
 
+
 def test_run_creates_expected_outputs(tmp_path, monkeypatch):
     monkeypatch.chdir(tmp_path)
 
-    task_registry["test_task"] = DummyTask
+    monkeypatch.setitem(task_registry, "test_task", DummyTask)
 
     run_benchmark(test_cfg())
 
@@ -30,13 +33,301 @@ def test_run_creates_expected_outputs(tmp_path, monkeypatch):
     metrics_file = base / "metrics.csv"
     assert metrics_file.exists(), "metrics.csv was not created"
 
+
 def test_no_duplicates(tmp_path, monkeypatch):
     monkeypatch.chdir(tmp_path)
 
-    task_registry["test_task"] = DummyTask
+    monkeypatch.setitem(task_registry, "test_task", DummyTask)
 
     run_benchmark(test_cfg())
 
     metrics_file = tmp_path / "outputs/DummyTask_NPE/sims_10/metrics.csv"
     df = pd.read_csv(metrics_file)
-    assert len(df) == 2, "Expected two rows for two observations"
\ No newline at end of file
+    assert len(df) == 2, "Expected two rows for two observations"
+
+
+def test_resume_skips_completed_units(tmp_path, monkeypatch):
+    import src.utils.benchmark_run as benchmark_run_mod
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(task_registry, "test_task", DummyTask)
+
+    run_benchmark(test_cfg())
+    first = pd.read_csv(tmp_path / "outputs/DummyTask_NPE/sims_10/metrics.csv")
+
+    # A second identical run must neither retrain nor re-evaluate
+    def fail(*args, **kwargs):
+        raise AssertionError("completed unit was recomputed")
+
+    monkeypatch.setattr(benchmark_run_mod, "run_inference", fail)
+    monkeypatch.setattr(benchmark_run_mod, "evaluate_inference", fail)
+    run_benchmark(test_cfg())
+
+    second = pd.read_csv(tmp_path / "outputs/DummyTask_NPE/sims_10/metrics.csv")
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_force_recomputes_completed_units(tmp_path, monkeypatch):
+    import src.utils.benchmark_run as benchmark_run_mod
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(task_registry, "test_task", DummyTask)
+
+    run_benchmark(test_cfg())
+
+    calls = []
+    original = benchmark_run_mod.run_inference
+    monkeypatch.setattr(benchmark_run_mod, "run_inference", lambda *a, **kw: calls.append(1) or original(*a, **kw))
+
+    cfg = test_cfg()
+    cfg.force = True
+    run_benchmark(cfg)
+    assert calls == [1]
+
+
+def grid_cfg(**grid):
+    cfg = test_cfg()
+    cfg.grid = {"enabled": True, "methods": [], "num_simulations": [10, 20], "seeds": [],
+                "task_params": {}, "workers": 1, **grid}
+    return cfg
+
+
+def test_expand_grid_cross_product():
+    from src.utils.benchmark_run import expand_grid
+
+    points, varying = expand_grid(grid_cfg(methods=["npe", "nle"], seeds=[1, 2], task_params={"noise_std": [0.5]}))
+    assert len(points) == 2 * 2 * 2
+    assert varying == ["method", "num_simulations", "seed"]
+    assert {(p.inference.method, p.inference.num_simulations, p.random_seed) for p in points} == {
+        (m, n, s) for m in ["npe", "nle"] for n in [10, 20] for s in [1, 2]
+    }
+    assert all(p.task.noise_std == 0.5 and not p.grid.enabled for p in points)
+
+
+def test_grid_writes_same_files_as_single_runs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(task_registry, "test_task", DummyTask)
+
+    run_benchmark(grid_cfg())
+
+    for budget in [10, 20]:
+        base = tmp_path / f"outputs/DummyTask_NPE/sims_{budget}"
+        df = pd.read_csv(base / "metrics.csv")
+        assert list(df.columns) == ["metric", "value", "task", "method", "num_simulations", "observation_idx"]
+        assert len(df) == 2
+        assert set(df["num_simulations"]) == {budget}
+        assert (base / "obs_1" / "posterior_samples.pt").exists()
+
+
+def test_inline_grid_restores_torch_threads(tmp_path, monkeypatch):
+    import torch
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(task_registry, "test_task", DummyTask)
+    previous = torch.get_num_threads()
+    threads = 1 if previous > 1 else 2
+    try:
+        seen = []
+        monkeypatch.setattr("src.utils.benchmark_run._run_lane",
+                            lambda lane: seen.append(torch.get_num_threads()) or ("unused", []))
+        monkeypatch.setattr("src.utils.benchmark_run.save_metrics", lambda outdir, rows: None)
+        run_benchmark(grid_cfg(threads=threads))
+        assert set(seen) == {threads}
+        assert torch.get_num_threads() == previous
+    finally:
+        torch.set_num_threads(previous)
+
+
+def test_grid_adds_columns_for_varying_axes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(task_registry, "test_task", DummyTask)
+
+    # Two budgets form two independent lanes that run on the worker pool
+    run_benchmark(grid_cfg(seeds=[1, 2], task_params={"noise_std": [0.5, 1.0]}, workers=2))
+
+    for budget in [10, 20]:
+        df = pd.read_csv(tmp_path / f"outputs/DummyTask_NPE/sims_{budget}/metrics.csv")
+        assert len(df) == 2 * 2 * 2
+        assert set(df["seed"]) == {1, 2}
+        assert set(df["noise_std"]) == {0.5, 1.0}
+
+
+def test_results_store_receives_metrics(tmp_path, monkeypatch):
+    from src.utils.results_store import ResultsStore
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(task_registry, "test_task", DummyTask)
+
+    cfg = test_cfg()
+    cfg.results_store = "outputs/results.sqlite"
+    run_benchmark(cfg)
+    run_benchmark(cfg)  # a rerun replaces the rows instead of duplicating them
+
+    with ResultsStore(tmp_path / "outputs/results.sqlite") as store:
+        df = store.query(method="NPE", metric="c2st")
+    assert len(df) == 2
+    assert set(df["observation_idx"]) == {0, 1}
+
+
+def test_memory_tracking_writes_stage_peaks(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(task_registry, "test_task", DummyTask)
+
+    cfg = test_cfg()
+    cfg.memory = {"enabled": True, "ceiling_mb": None, "track_tensors": False}
+    run_benchmark(cfg)
+
+    df = pd.read_csv(tmp_path / "outputs/DummyTask_NPE/sims_10/memory.csv")
+    assert df["stage"].tolist() == ["simulation", "training", "sampling", "reference_sampling", "c2st"]
+    assert (df["peak_rss_mb"] > 0).all()
+    assert df.loc[df["stage"] == "sampling", "calls"].item() == 2
+
+
+def test_compact_sample_storage(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(task_registry, "test_task", DummyTask)
+
+    config = test_cfg()
+    config.storage = {"format": "npy", "dtype": "float16", "compress": False}
+    run_benchmark(config)
+
+    base = tmp_path / "outputs/DummyTask_NPE/sims_10"
+    assert (base / "obs_0" / "posterior_samples.npy").exists()
+    assert not (base / "obs_0" / "posterior_samples.pt").exists()
+    assert len(pd.read_csv(base / "metrics.csv")) == 2
+
+
+def test_simulate_in_chunks():
+    import torch
+    from src.utils.benchmark_run import simulate
+
+    def simulator(theta):
+        calls.append(len(theta))
+        return theta * 2
+
+    class Task:
+        def get_simulator(self):
+            return simulator
+
+    calls = []
+    theta = torch.arange(10.0).unsqueeze(1)
+    assert torch.equal(simulate(Task(), theta, batch_size=4), theta * 2)
+    assert calls == [4, 4, 2]
+
+    calls.clear()
+    assert torch.equal(simulate(Task(), theta), theta * 2)
+    assert calls == [10]
+
+
+def test_progress_events_cover_all_stages(tmp_path, monkeypatch):
+    import json
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(task_registry, "test_task", DummyTask)
+    cfg = test_cfg()
+    cfg.progress = {"enabled": True}
+
+    run_benchmark(cfg)
+
+    lines = (tmp_path / "outputs/DummyTask_NPE/sims_10/status.jsonl").read_text().splitlines()
+    events = [json.loads(line) for line in lines]
+    assert [e["stage"] for e in events] == ["start", "simulation", "training", "sampling", "sampling", "sampling",
+                                            "evaluation", "evaluation", "evaluation", "done"]
+    assert events[-1]["state"] == "done" and events[-1]["completed"] == 2
+    assert events[5]["completed"] == 2 and events[5]["throughput"] > 0 and events[5]["eta"] == 0
+    assert all(e["method"] == "NPE" and e["num_simulations"] == 10 for e in events)
+
+
+def test_progress_events_are_mirrored_to_the_hydra_job_dir(tmp_path, monkeypatch):
+    import src.utils.benchmark_run as benchmark_run
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(task_registry, "test_task", DummyTask)
+    monkeypatch.setattr(benchmark_run, "hydra_output_dir", lambda: tmp_path / "multirun" / "0")
+    cfg = test_cfg()
+    cfg.progress = {"enabled": True}
+
+    run_benchmark(cfg)
+
+    status = (tmp_path / "outputs/DummyTask_NPE/sims_10/status.jsonl").read_text()
+    assert (tmp_path / "multirun/0/status.jsonl").read_text() == status
+
+
+def test_task_parameter_grid_is_simulated_in_one_batch(monkeypatch):
+    import torch
+    from src.tasks.misspecified_tasks import LikelihoodMisspecifiedTask
+    from src.utils.benchmark_run import build_task, simulate_points
+    from src.utils.run_manifest import config_hash
+
+    calls = []
+    simulate_grid = LikelihoodMisspecifiedTask.simulate_grid
+    monkeypatch.setattr(LikelihoodMisspecifiedTask, "simulate_grid",
+                        lambda self, *args, **kwargs: calls.append(kwargs) or simulate_grid(self, *args, **kwargs))
+
+    points = [
+        OmegaConf.create({"task": {"name": "misspecified_likelihood", "dim": 2, "tau_m": tau, "lambda_val": 0.1,
+                                   "common_random_numbers": True, "crn_seed": 0}, "random_seed": 3})
+        for tau in [0.5, 1.0, 2.0]
+    ]
+    task_keys = [config_hash(OmegaConf.to_container(p.task)) for p in points]
+    tasks = {key: build_task(point) for key, point in zip(task_keys, points)}
+    budgets = {(key, 3): budget for key, budget in zip(task_keys, [40, 50, 50])}
+
+    simulations = simulate_points(points, task_keys, tasks, budgets, batch_size=16)
+
+    assert len(calls) == 4                                      # 50 rows in chunks of 16, all grid points at once
+    assert torch.equal(calls[0]["tau_m"], torch.tensor([0.5, 1.0, 2.0]))
+    for key, budget in zip(task_keys, [40, 50, 50]):
+        theta, x = simulations[(key, 3)]
+        assert theta.shape == x.shape == (budget, 2)
+        assert torch.allclose(x, tasks[key].simulator(theta))  # same as simulating each configuration on its own
+    assert torch.equal(simulations[(task_keys[0], 3)][0], simulations[(task_keys[1], 3)][0][:40])
+
+
+def test_stopping_decision():
+    from src.utils.benchmark_run import stopping_decision
+
+    def rows(values):
+        return [{"metric": "c2st", "value": v, "observation_idx": i} for i, v in enumerate(values)]
+
+    decision, stats = stopping_decision(rows([0.5, 0.5, 0.5]), ["c2st"], tolerance=0.01, max_observations=10)
+    assert decision == "converged" and stats[0]["se"] == 0 and stats[0]["mean"] == 0.5
+    decision, stats = stopping_decision(rows([0.5, 1.0]), ["c2st"], tolerance=0.01, max_observations=10)
+    assert decision == "continue" and stats[0]["se"] == pytest.approx(0.25)
+    assert stopping_decision(rows([0.5, 1.0]), ["c2st"], tolerance=0.01, max_observations=2)[0] == "max_observations"
+    assert stopping_decision(rows([0.5]), ["c2st"], tolerance=1.0, max_observations=10)[0] == "continue"
+
+
+def test_adaptive_mode_adds_observations_until_max(tmp_path, monkeypatch):
+    import src.utils.benchmark_run as benchmark_run_mod
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(task_registry, "test_task", DummyTask)
+    trainings = []
+    original = benchmark_run_mod.train_posterior
+    monkeypatch.setattr(benchmark_run_mod, "train_posterior", lambda *a, **kw: trainings.append(1) or original(*a, **kw))
+
+    cfg = test_cfg()
+    cfg.adaptive = {"enabled": True, "tolerance": -1.0, "batch_size": 1, "max_observations": 4}
+    run_benchmark(cfg)
+
+    base = tmp_path / "outputs/DummyTask_NPE/sims_10"
+    df = pd.read_csv(base / "metrics.csv")
+    assert sorted(df["observation_idx"]) == [0, 1, 2, 3]
+    assert set(df["stopping"]) == {"max_observations"} and "standard_error" in df
+    assert (base / "obs_3" / "posterior_samples.pt").exists()
+    assert trainings == [1]                           # one posterior serves all rounds
+
+    rounds = pd.read_csv(base / "adaptive.csv")
+    assert rounds["num_observations"].tolist() == [2, 3, 4]
+    assert rounds["decision"].tolist() == ["continue", "continue", "max_observations"]
+
+
+def test_adaptive_mode_stops_when_converged(tmp_path, monkeypatch):
+    import src.utils.benchmark_run as benchmark_run_mod
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(task_registry, "test_task", DummyTask)
+    monkeypatch.setattr(benchmark_run_mod, "evaluate_inference", lambda **kw: 0.5)
+
+    cfg = test_cfg()
+    cfg.adaptive = {"enabled": True, "tolerance": 0.01, "batch_size": 2, "max_observations": 10}
+    run_benchmark(cfg)
+
+    df = pd.read_csv(tmp_path / "outputs/DummyTask_NPE/sims_10/metrics.csv")
+    assert len(df) == 2 and set(df["stopping"]) == {"converged"}
@@ -33,4 +33,25 @@ def test_run_inference():
         )
 
         assert isinstance(samples, torch.Tensor)
-        assert samples.shape == (num_posterior_samples, 2)
\ No newline at end of file
+        assert samples.shape == (num_posterior_samples, 2)
+
+def test_sample_posterior_closes_the_artifact_store_on_error(tmp_path, monkeypatch):
+    import pytest
+    import src.inference.Run_Inference as Run_Inference
+    from src.utils.artifact_store import ArtifactStore
+    monkeypatch.chdir(tmp_path)
+    opened = []
+
+    class TrackedStore(ArtifactStore):
+        def close(self):
+            opened.append(self)
+            super().close()
+
+    class FailingPosterior:
+        def sample(self, shape, x):
+            raise RuntimeError("sampling failed")
+
+    monkeypatch.setattr(Run_Inference, "ArtifactStore", TrackedStore)
+    with pytest.raises(RuntimeError):
+        Run_Inference.sample_posterior(FailingPosterior(), DummyTask(), "NPE", 10, 5, [torch.zeros(2)])
+    assert len(opened) == 1
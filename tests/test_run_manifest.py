@@ -0,0 +1,73 @@
+import pytest
+
+from src.utils.run_manifest import RunManifest, config_hash, file_checksum
+
+
+def test_config_hash_is_order_independent():
+    assert config_hash({"a": 1, "b": 2.0}) == config_hash({"b": 2.0, "a": 1})
+    assert config_hash({"a": 1}) != config_hash({"a": 2})
+
+
+def test_file_checksum_changes_with_content(tmp_path):
+    p = tmp_path / "f.bin"
+    p.write_bytes(b"abc")
+    first = file_checksum(p)
+    p.write_bytes(b"abd")
+    assert file_checksum(p) != first
+
+
+def test_record_and_reload(tmp_path):
+    artifact = tmp_path / "obs_0" / "posterior_samples.pt"
+    artifact.parent.mkdir()
+    artifact.write_bytes(b"samples")
+    key = {"method": "NPE", "observation_idx": 0, "metric": "c2st"}
+
+    manifest = RunManifest(tmp_path)
+    manifest.record(key, artifacts=["obs_0/posterior_samples.pt"], value=0.5)
+
+    # A fresh instance reads the record back from disk
+    reloaded = RunManifest(tmp_path)
+    assert reloaded.is_complete(key)
+    assert reloaded.get(key)["value"] == 0.5
+    assert not reloaded.is_complete({**key, "metric": "ppc"})
+
+
+def test_changed_or_missing_artifact_invalidates_unit(tmp_path):
+    artifact = tmp_path / "x_obs.pt"
+    artifact.write_bytes(b"x")
+    key = {"observation_idx": 0}
+
+    manifest = RunManifest(tmp_path)
+    manifest.record(key, artifacts=["x_obs.pt"])
+    assert manifest.is_complete(key)
+
+    artifact.write_bytes(b"y")
+    assert not manifest.is_complete(key)
+
+    artifact.unlink()
+    assert not manifest.is_complete(key)
+
+
+def test_record_missing_artifact_raises(tmp_path):
+    with pytest.raises(FileNotFoundError) as exc:
+        RunManifest(tmp_path).record({"observation_idx": 0}, artifacts=["missing.pt"])
+    assert "Cannot record missing artifact" in str(exc.value)
+
+
+def test_torn_line_is_ignored_and_reset_clears(tmp_path):
+    manifest = RunManifest(tmp_path)
+    manifest.record({"observation_idx": 0})
+    with manifest.path.open("a") as f:
+        f.write('{"key": {"observation_idx": 1')  # interrupted write
+
+    reloaded = RunManifest(tmp_path)
+    assert reloaded.is_complete({"observation_idx": 0})
+    assert not reloaded.is_complete({"observation_idx": 1})
+
+    # A record after the torn line starts on a new line and survives the next reload
+    reloaded.record({"observation_idx": 1})
+    assert RunManifest(tmp_path).is_complete({"observation_idx": 1})
+
+    reloaded.reset()
+    assert not reloaded.path.exists()
+    assert not reloaded.is_complete({"observation_idx": 0})
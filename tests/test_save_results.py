@@ -230,3 +230,117 @@ def test_save_results_append_header_mismatch(tmp_path):
         )
     msg = str(exc.value)
     assert "CSV header mismatch" in msg
+
+
+def test_result_writer_buffers_and_validates_header_once(tmp_path, monkeypatch):
+    path = tmp_path / "metrics.csv"
+    save_results.save_results({"c2st": 0.5}, task="T", method="M", num_simulations=1, observation_idx=0,
+                              base_directory=tmp_path, filename="existing", file_mode="write", seed=1)
+    existing = save_results.result_path(task="T", method="M", num_simulations=1, observation_idx=0,
+                                        base_directory=tmp_path, filename="existing")
+
+    checks = []
+    original = save_results.assert_csv_header_matches
+    monkeypatch.setattr(save_results, "assert_csv_header_matches",
+                        lambda *args: checks.append(args) or original(*args))
+
+    with save_results.ResultWriter(existing, file_mode="append", batch_size=4) as writer:
+        for idx in range(10):
+            writer.write({"c2st": 0.5, "ppc": 0.1}, task="T", method="M", num_simulations=1,
+                         observation_idx=idx, seed=1)
+            # Rows are buffered until a batch is full
+            assert writer.rows_written + len(writer._buffer) == 2 * (idx + 1)
+        assert writer.rows_written == 20
+
+    assert len(checks) == 1
+    df = pd.read_csv(existing)
+    assert len(df) == 21
+    assert list(df.columns) == ["metric", "value", "task", "method", "num_simulations", "observation_idx", "seed"]
+    assert not path.exists()
+
+
+def test_result_writer_rejects_changing_schema(tmp_path):
+    path = tmp_path / "metrics.csv"
+    with pytest.raises(ValueError, match="don't match"):
+        with save_results.ResultWriter(path) as writer:
+            writer.write({"c2st": 0.5}, task="T", method="M", num_simulations=1, observation_idx=0, seed=1)
+            writer.write({"c2st": 0.5}, task="T", method="M", num_simulations=1, observation_idx=1, tau=2)
+    # Write mode discards the whole file when the block raises
+    assert not path.exists()
+
+
+def test_result_writer_write_mode_keeps_target_on_error(tmp_path):
+    path = tmp_path / "metrics.csv"
+    with save_results.ResultWriter(path) as writer:
+        writer.write({"c2st": 0.5}, task="T", method="M", num_simulations=1, observation_idx=0)
+    original = path.read_bytes()
+
+    with pytest.raises(RuntimeError):
+        with save_results.ResultWriter(path, batch_size=1) as writer:
+            writer.write({"c2st": 0.9}, task="T", method="M", num_simulations=1, observation_idx=0)
+            writer.write({"c2st": 0.8}, task="T", method="M", num_simulations=1, observation_idx=1)
+            raise RuntimeError("interrupted")
+    assert path.read_bytes() == original
+    assert [p.name for p in tmp_path.iterdir()] == ["metrics.csv"]  # no temporary files left behind
+
+
+def test_result_writer_append_mode_drops_buffered_rows_on_error(tmp_path):
+    path = tmp_path / "metrics.csv"
+    with pytest.raises(RuntimeError):
+        with save_results.ResultWriter(path, file_mode="append", batch_size=2) as writer:
+            for idx in range(3):
+                writer.write({"c2st": 0.5}, task="T", method="M", num_simulations=1, observation_idx=idx)
+            raise RuntimeError("interrupted")
+    # The first batch was written before the error; the buffered third row is dropped
+    assert pd.read_csv(path)["observation_idx"].tolist() == [0, 1]
+
+
+def test_result_writer_flushes_on_exit_with_declared_metadata(tmp_path):
+    path = tmp_path / "sub" / "metrics.csv"
+    with save_results.ResultWriter(path, metadata_fields=["seed"]) as writer:
+        writer.write({"c2st": 0.5}, task="T", method="M", num_simulations=1, observation_idx=0, seed=3)
+        assert not path.exists()
+    assert pd.read_csv(path)["seed"].tolist() == [3]
+
+
+def test_result_writer_write_mode_keeps_regular_file_permissions(tmp_path, monkeypatch):
+    import src.utils.file_utils as file_utils
+    monkeypatch.setattr(file_utils, "_UMASK", 0o022)
+    path = tmp_path / "metrics.csv"
+    with save_results.ResultWriter(path) as writer:
+        writer.write({"c2st": 0.5}, task="T", method="M", num_simulations=1, observation_idx=0)
+    assert path.stat().st_mode & 0o777 == 0o644
+
+
+def _append_batches(path, worker, num_batches, batch_size):
+    for batch in range(num_batches):
+        with save_results.ResultWriter(path, file_mode="append", batch_size=batch_size) as writer:
+            for idx in range(batch_size):
+                writer.write({"c2st": 0.123456789, "ppc": 0.987654321}, task="T" * 50, method="NPE",
+                             num_simulations=worker, observation_idx=batch * batch_size + idx, seed=worker)
+
+
+def test_result_writer_concurrent_appends_are_not_torn(tmp_path):
+    import csv
+    import multiprocessing
+
+    path = tmp_path / "shared.csv"
+    workers, num_batches, batch_size = 8, 20, 25
+    ctx = multiprocessing.get_context("fork")
+    processes = [ctx.Process(target=_append_batches, args=(path, w, num_batches, batch_size)) for w in range(workers)]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+        assert p.exitcode == 0
+
+    with path.open(newline="") as f:
+        rows = list(csv.reader(f))
+    header, body = rows[0], rows[1:]
+    assert header == ["metric", "value", "task", "method", "num_simulations", "observation_idx", "seed"]
+    assert len(body) == workers * num_batches * batch_size * 2  # exactly one header, no lost rows
+    for row in body:
+        assert len(row) == len(header)
+        assert row[0] in {"c2st", "ppc"} and row[2] == "T" * 50 and row[4] == row[6]
+    # Every (worker, observation, metric) row arrived exactly once
+    assert len({(r[4], r[5], r[0]) for r in body}) == len(body)
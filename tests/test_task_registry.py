@@ -0,0 +1,73 @@
+import sys
+from importlib.metadata import EntryPoint
+
+import pytest
+
+import src.tasks.registry as registry
+from src.tasks.registry import TaskRegistry, TaskSpec, task_registry
+from tests.test_evaluate import DummyTask
+
+
+def test_builtin_task_metadata_is_available_without_import(monkeypatch):
+    builtin = task_registry.spec("misspecified_likelihood")
+    assert builtin.class_name == "LikelihoodMisspecifiedTask"
+    assert builtin.params == {"dim": int, "tau_m": float, "lambda_val": float, "common_random_numbers": bool,
+                              "crn_seed": int}
+    assert builtin.sizes["num_observations"] == 4
+
+    monkeypatch.delitem(sys.modules, "src.tasks.misspecified_tasks", raising=False)
+    spec = TaskSpec("misspecified_likelihood", builtin.target)
+    assert spec.class_name == "LikelihoodMisspecifiedTask"
+    assert "src.tasks.misspecified_tasks" not in sys.modules
+
+    assert spec.load().__name__ == "LikelihoodMisspecifiedTask"
+    assert "src.tasks.misspecified_tasks" in sys.modules
+
+
+def test_registered_classes_and_paths():
+    tasks = TaskRegistry(group=None)
+    tasks["dummy"] = DummyTask
+    tasks.register("dotted", "tests.test_evaluate.DummyTask")
+
+    assert tasks["dummy"] is DummyTask and tasks["dotted"] is DummyTask
+    assert tasks.class_name("dotted") == "DummyTask"
+    assert list(tasks) == ["dummy", "dotted"] and len(tasks) == 2
+    assert "missing" not in tasks
+    with pytest.raises(KeyError):
+        tasks["missing"]
+
+    del tasks["dummy"]
+    assert "dummy" not in tasks
+
+
+def test_unimportable_task_raises_import_error():
+    spec = TaskSpec("broken", "src.tasks.does_not_exist:Task")
+    assert spec.class_name == "Task"
+    with pytest.raises(ImportError, match="Cannot import task 'broken'"):
+        spec.load()
+
+
+def test_validate_rejects_unknown_parameters():
+    spec = task_registry.spec("misspecified_likelihood")
+    spec.validate({"dim": 2, "tau_m": 1.0})
+    with pytest.raises(ValueError, match="Unknown parameters for task 'misspecified_likelihood': \\['tau'\\]"):
+        spec.validate({"tau": 1.0})
+    TaskSpec("free", DummyTask).validate({"anything": 1})   # no schema: everything passes
+
+
+def test_entry_points_are_discovered_lazily(monkeypatch):
+    calls = []
+
+    def fake_entry_points(group):
+        calls.append(group)
+        return [EntryPoint("plugin_task", "tests.test_evaluate:DummyTask", group),
+                EntryPoint("builtin", "some.other:Task", group)]
+
+    monkeypatch.setattr(registry, "entry_points", fake_entry_points)
+    tasks = TaskRegistry()
+    tasks.register("builtin", DummyTask)
+
+    assert tasks["builtin"] is DummyTask and calls == []   # registered tasks need no discovery
+    assert tasks["plugin_task"] is DummyTask
+    assert tasks.class_name("builtin") == "DummyTask"       # registered tasks take precedence
+    assert list(tasks) == ["builtin", "plugin_task"] and calls == [registry.ENTRY_POINT_GROUP]